@@ -0,0 +1,109 @@
+import io
+import threading
+from dataclasses import dataclass
+from pyhanko import stamp
+from pyhanko.pdf_utils import generic
+from pyhanko.pdf_utils.content import ResourceType
+from pyhanko.pdf_utils.font import SimpleFontEngineFactory
+
+# rendered stamps kept per signer, style, box and timestamp length
+APPEARANCE_CACHE_SIZE = 256
+# stands in for the timestamp while the stamp is rendered for the cache
+PLACEHOLDER_CHAR = "#"
+
+_appearance_cache = {}
+_appearance_cache_lock = threading.Lock()
+
+
+def _escaped_text(text):
+    """
+    Escaped characters of a string as pyhanko writes them into a content stream.
+
+    Returns:
+        bytes or None: Contents of the literal string without parentheses,
+        None if pyhanko would not write `text` as a PDFDocEncoding literal.
+    """
+    stream = io.BytesIO()
+    generic.TextStringObject(text).write_to_stream(stream)
+    data = stream.getvalue()
+    if not data.startswith(b"(") or data.startswith(b"(\376\377"):
+        return None
+    return data[1:-1]
+
+
+def clear_appearance_cache():
+    """
+    Drop every cached stamp rendering.
+    """
+    with _appearance_cache_lock:
+        _appearance_cache.clear()
+
+
+@dataclass(frozen=True)
+class CachedTextStampStyle(stamp.TextStampStyle):
+    """
+    `stamp.TextStampStyle` whose rendering is reused across documents.
+
+    The stamp text is laid out once per style, box size and set of text
+    parameters other than the timestamp, with a placeholder of the same
+    length in place of the timestamp. Every further document only gets the
+    formatted timestamp substituted into the cached content stream.
+
+    Caching only applies to simple (non-embedded, fixed advance) fonts such
+    as pyhanko's default Courier, where the layout depends on the length of
+    the text and not on its characters; other fonts are rendered as usual.
+    """
+
+    def create_stamp(self, writer, box, text_params):
+        return CachedTextStamp(writer=writer, style=self, box=box, text_params=text_params)
+
+
+class CachedTextStamp(stamp.TextStamp):
+    """
+    Text stamp rendered from the cache of `CachedTextStampStyle`.
+    """
+
+    def _cache_key(self, text_params):
+        font = self.style.text_box_style.font
+        box = self.box
+        if not isinstance(font, SimpleFontEngineFactory) or box is None:
+            return None
+        if not (box.width_defined and box.height_defined):
+            return None
+        static_params = tuple(sorted((k, str(v)) for k, v in text_params.items() if k != "ts"))
+        return self.style, box.width, box.height, static_params, len(text_params["ts"])
+
+    def _render_inner_content(self):
+        text_params = self.get_default_text_params()
+        if self.text_params is not None:
+            text_params.update(self.text_params)
+        key = self._cache_key(text_params)
+        if key is None:
+            return super()._render_inner_content()
+
+        ts_text = _escaped_text(text_params["ts"])
+        if ts_text is None:
+            return super()._render_inner_content()
+        with _appearance_cache_lock:
+            cached = _appearance_cache.get(key)
+        if cached is not None:
+            template, placeholder_text = cached
+            font_engine = self.style.text_box_style.font.create_font_engine(self.writer)
+            self.set_resource(
+                category=ResourceType.FONT, name=generic.NameObject("/F1"), value=font_engine.as_resource()
+            )
+            return [template.replace(placeholder_text, ts_text)]
+
+        placeholder = PLACEHOLDER_CHAR * len(text_params["ts"])
+        self.text_params = dict(text_params, ts=placeholder)
+        template = b" ".join(super()._render_inner_content())
+        placeholder_text = _escaped_text(placeholder)
+        if template.count(placeholder_text) != 1:
+            # the placeholder is ambiguous in this text, render without the cache
+            self.text_params = text_params
+            return super()._render_inner_content()
+        with _appearance_cache_lock:
+            if len(_appearance_cache) >= APPEARANCE_CACHE_SIZE:
+                _appearance_cache.clear()
+            _appearance_cache[key] = (template, placeholder_text)
+        return [template.replace(placeholder_text, ts_text)]
@@ -2,8 +2,11 @@ from tkinter import Tk, filedialog, StringVar, Entry, Button, Label
 import logging
 import functionality
 import os
+from key_pool import KeyPool
 logging.basicConfig(level=logging.INFO)
 
+KEY_POOL_SIZE = 2
+
 
 class AuxiliaryApp:
     def __init__(self, root):
@@ -24,13 +27,16 @@ class AuxiliaryApp:
             pin_var (StringVar): Tkinter variable linked to the PIN entry widget.
             pin (str): 4-digit PIN entered by the user.
             file_path (str or None): Path to save the generated private key.               
+            key_pool (KeyPool): Keys generated in the background so that creating keys does not freeze the GUI.
         """
         self.pin = ""
         self.file_path = None
+        self.key_pool = KeyPool(size=KEY_POOL_SIZE)
 
         self.root = root
         self.root.title("RSA Key Generator")
         self.root.geometry("250x200")
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         self.message_key = StringVar()
         self.label_key = Label(root, textvariable=self.message_key)
         self.message_pin = StringVar()
@@ -107,7 +113,7 @@ class AuxiliaryApp:
         updates the GUI message before and after key creation.
 
         Side Effects:
-            - Calls `functionality.create_keys(self.pin, self.file_path)` to generate keys.
+            - Calls `functionality.create_keys(self.pin, self.file_path, self.key_pool)` to generate keys.
             - Updates the status message shown in the GUI via `self.message`.
             - Logs debug messages about key creation.
 
@@ -116,10 +122,21 @@ class AuxiliaryApp:
         """
         logging.debug("Creating keys...")
         self.message_key.set("Creating keys...")
-        functionality.create_keys(self.pin, self.file_path)
+        functionality.create_keys(self.pin, self.file_path, self.key_pool)
         logging.debug("Keys created")
         self.message_key.set("Keys created")    
 
+    def close(self):
+        """
+        Discard pre-generated keys and close the window.
+
+        Side Effects:
+            - Closes `self.key_pool`.
+            - Destroys the root window.
+        """
+        self.key_pool.close()
+        self.root.destroy()
+
     def choose_location(self):
         """
         A file save dialog is shown for the user to select a `.pem` file location.
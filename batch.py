@@ -0,0 +1,384 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from cryptography.hazmat.primitives import serialization
+from cryptography import x509
+import functionality
+from verify_cache import VerificationCache, DEFAULT_CACHE_PATH
+
+logging.basicConfig(level=logging.INFO)
+
+# outcome of signing a single document in a batch
+SignResult = namedtuple("SignResult", ["path", "ok", "error", "elapsed"])
+
+MAX_CRASHES_PER_ITEM = 2
+
+_worker_key = None
+_worker_session = None
+_worker_public_key = None
+_worker_cache = None
+_worker_tier = functionality.VERIFY_TIER_FULL
+_worker_validation_context = None
+
+
+def init_sign_worker(key_der, cert_pem):
+    """
+    Load the signing key and prepare a signing session once per worker process.
+
+    Used as the pool initializer by `sign_many()` and `hot_folder.HotFolder`.
+
+    Args:
+        key_der (bytes): Unencrypted PKCS8 DER encoding of the private key.
+        cert_pem (bytes): PEM encoding of the signing certificate.
+    """
+    global _worker_key, _worker_session
+    _worker_key = serialization.load_der_private_key(key_der, password=None)
+    cert = x509.load_pem_x509_certificate(cert_pem)
+    _worker_session = functionality.SigningSession(cert, _worker_key)
+
+
+def sign_one(pdf_file_path):
+    """
+    Sign one document inside a worker process set up by `init_sign_worker()`.
+
+    Args:
+        pdf_file_path (str): Path to the PDF file to be signed.
+
+    Returns:
+        SignResult: Result of the signing attempt, never raises.
+    """
+    start = time.perf_counter()
+    try:
+        ok = functionality.sign_pdf_full(pdf_file_path, _worker_key, session=_worker_session, raise_errors=True)
+        error = None
+    except Exception as e:
+        ok, error = False, f"{type(e).__name__}: {e}"
+    return SignResult(pdf_file_path, ok, error, time.perf_counter() - start)
+
+
+def _init_verify_worker(public_key_der, cache_path, tier=functionality.VERIFY_TIER_FULL, trust_cert_paths=()):
+    """
+    Load the trusted public key, open the verification cache and build the
+    validation context once per worker process.
+
+    Args:
+        public_key_der (bytes): DER encoding of the public key.
+        cache_path (str or None): Verification cache database, None disables caching.
+        tier (str): Verification tier, see `functionality.verify_pdf_report()`.
+        trust_cert_paths (iterable of str): Signing certificates to trust, see
+            `functionality.create_validation_context()`.
+    """
+    global _worker_public_key, _worker_cache, _worker_tier, _worker_validation_context
+    _worker_public_key = functionality.import_public_key(public_key_der)
+    _worker_cache = VerificationCache(cache_path) if cache_path else None
+    _worker_tier = tier
+    _worker_validation_context = functionality.create_validation_context(trust_cert_paths)
+
+
+def _verify_one(pdf_file_path):
+    """
+    Verify one document inside a worker process.
+
+    Args:
+        pdf_file_path (str): Path to the signed PDF file.
+
+    Returns:
+        dict: Report from `verify_pdf_report()` extended with `elapsed` seconds, never raises.
+    """
+    start = time.perf_counter()
+    try:
+        report = functionality.verify_pdf_report(
+            pdf_file_path, _worker_public_key, cache=_worker_cache, tier=_worker_tier,
+            validation_context=_worker_validation_context,
+        )
+    except Exception as e:
+        report = _failed_report(pdf_file_path, f"{type(e).__name__}: {e}", _worker_tier)
+    report["elapsed"] = time.perf_counter() - start
+    return report
+
+
+def _failed_report(pdf_file_path, error, tier=functionality.VERIFY_TIER_FULL):
+    """
+    Build a verification report for a document that could not be processed.
+
+    Args:
+        pdf_file_path (str): Path to the PDF file.
+        error (str): Reason of failure.
+        tier (str): Requested verification tier.
+
+    Returns:
+        dict: Report with the same keys as `verify_pdf_report()` plus `elapsed`.
+    """
+    report = functionality.new_report(pdf_file_path)
+    report["error"] = error
+    report["tier"] = tier
+    report["elapsed"] = 0.0
+    return report
+
+
+def triage(paths, use_probe=True):
+    """
+    Split an inbox into signed and unsigned documents without signing anything.
+
+    Uses the fast `probe_is_pdf_signed()` and falls back to a full parse only
+    for documents the probe cannot classify.
+
+    Args:
+        paths (iterable of str): Paths to PDF files.
+        use_probe (bool): If False, every document is fully parsed.
+
+    Yields:
+        tuple: (path, signed) for every document, in input order.
+    """
+    for path in paths:
+        yield path, functionality.verify_is_pdf_signed(path, probe=use_probe)
+
+
+def serialize_key(key):
+    """
+    Serialize a private key so it can be handed to worker processes.
+
+    Args:
+        key (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey or ed25519.Ed25519PrivateKey): Private key to serialize.
+
+    Returns:
+        bytes: Unencrypted PKCS8 DER encoding of the key.
+    """
+    return key.private_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+def run_pool(func, items, failed, jobs=None, initializer=None, initargs=(), window=None, mp_context=None):
+    """
+    Run `func` over `items` on a process pool and yield results as they finish.
+
+    At most `window` items are in flight at once, so `items` may be a lazy
+    iterable of any length. If a worker process dies, the pool is restarted
+    and the in-flight items are resubmitted; an item that was in flight
+    during `MAX_CRASHES_PER_ITEM` crashes is reported through `failed`.
+
+    Args:
+        func (callable): Picklable top-level function applied to each item.
+        items (iterable): Items to process.
+        failed (callable): Called as `failed(item, error)` to build the result
+            for an item whose worker crashed.
+        jobs (int or None): Number of worker processes, defaults to the CPU count.
+        initializer (callable or None): Run once in every worker process.
+        initargs (tuple): Arguments for `initializer`.
+        window (int or None): Maximum number of in-flight items, defaults to `4 * jobs`.
+        mp_context (multiprocessing.context.BaseContext or None): Start method context
+            of the workers, defaults to the platform default.
+
+    Yields:
+        Results of `func` in completion order.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    window = window or 4 * jobs
+    items = iter(items)
+    crashes = {}
+    retry = []
+    in_flight = {}
+    executor = ProcessPoolExecutor(
+        max_workers=jobs, initializer=initializer, initargs=initargs, mp_context=mp_context
+    )
+    try:
+        while True:
+            while len(in_flight) < window:
+                if retry:
+                    item = retry.pop()
+                else:
+                    item = next(items, StopIteration)
+                    if item is StopIteration:
+                        break
+                in_flight[executor.submit(func, item)] = item
+            if not in_flight:
+                return
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                item = in_flight.pop(future)
+                try:
+                    yield future.result()
+                except BrokenProcessPool:
+                    broken = True
+                    retry.append(item)
+
+            if broken:
+                logging.error("Worker process died, restarting pool")
+                retry.extend(in_flight.values())
+                in_flight.clear()
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = ProcessPoolExecutor(
+                    max_workers=jobs, initializer=initializer, initargs=initargs, mp_context=mp_context
+                )
+                survivors = []
+                for item in retry:
+                    crashes[item] = crashes.get(item, 0) + 1
+                    if crashes[item] >= MAX_CRASHES_PER_ITEM:
+                        yield failed(item, "Worker process crashed")
+                    else:
+                        survivors.append(item)
+                retry = survivors
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def sign_many(paths, key, jobs=None, cert_path=None):
+    """
+    Sign many PDF files in parallel with `sign_pdf_full()`.
+
+    The certificate is taken once from `get_signing_cert()` and shared by all
+    workers. The key is serialized once and loaded in every worker process,
+    documents are distributed over the pool and results are yielded as soon
+    as each document is done. A failing document never stops the batch.
+
+    Args:
+        paths (iterable of str): Paths to the PDF files to be signed.
+        key (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey or ed25519.Ed25519PrivateKey): The private key used for signing.
+        jobs (int or None): Number of worker processes, defaults to the CPU count.
+        cert_path (str or None): Optional certificate cache file, see `get_signing_cert()`.
+
+    Yields:
+        SignResult: (path, ok, error, elapsed) for every document, in completion order.
+    """
+    cert = functionality.get_signing_cert(key, cert_path)
+    cert_pem = cert.public_bytes(serialization.Encoding.PEM)
+    return run_pool(
+        sign_one,
+        paths,
+        failed=lambda path, error: SignResult(path, False, error, 0.0),
+        jobs=jobs,
+        initializer=init_sign_worker,
+        initargs=(serialize_key(key), cert_pem),
+    )
+
+
+def verify_many(paths, public_key, jobs=None, cache_path=None, tier=functionality.VERIFY_TIER_FULL,
+                trust_cert_paths=()):
+    """
+    Verify many signed PDF files in parallel with `verify_pdf_report()`.
+
+    Args:
+        paths (iterable of str): Paths to the signed PDF files.
+        public_key (Crypto.PublicKey.RSA.RsaKey or Crypto.PublicKey.ECC.EccKey): Public key expected to have signed every document.
+        jobs (int or None): Number of worker processes, defaults to the CPU count.
+        cache_path (str or None): Verification cache database shared by the workers,
+            see `verify_cache.VerificationCache`; None verifies every document.
+        tier (str): Verification tier, see `functionality.verify_pdf_report()`.
+        trust_cert_paths (iterable of str): Signing certificates to trust; each worker
+            builds one validation context from them and reuses it for every document.
+
+    Yields:
+        dict: Verification report with `elapsed` seconds for every document, in completion order.
+    """
+    return run_pool(
+        _verify_one,
+        paths,
+        failed=lambda path, error: _failed_report(path, error, tier),
+        jobs=jobs,
+        initializer=_init_verify_worker,
+        initargs=(public_key.export_key(format="DER"), cache_path, tier, tuple(trust_cert_paths)),
+    )
+
+
+def write_jsonl(results, stream):
+    """
+    Write results as JSON lines, one per document, as soon as each one arrives.
+
+    Args:
+        results (iterable): Reports (dict) or `SignResult` tuples.
+        stream (io.TextIOBase): Output stream, flushed after every line.
+
+    Returns:
+        int: Number of written lines.
+    """
+    count = 0
+    for result in results:
+        if isinstance(result, SignResult):
+            result = result._asdict()
+        stream.write(json.dumps(result) + "\n")
+        stream.flush()
+        count += 1
+    return count
+
+
+def read_paths(args_paths):
+    """
+    Yield paths from the command line, `-` reads one path per line from stdin.
+
+    Shared by the command line tools that take many documents.
+
+    Args:
+        args_paths (iterable of str): Paths given on the command line.
+
+    Yields:
+        str: Document paths.
+    """
+    for path in args_paths:
+        if path == "-":
+            for line in sys.stdin:
+                line = line.strip()
+                if line:
+                    yield line
+        else:
+            yield path
+
+
+def main(argv=None):
+    """
+    Command line entry point: verify documents and stream a JSON line per document to stdout.
+
+    Returns:
+        int: 0 if every document was verified, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Verify signed PDF files in parallel.")
+    parser.add_argument("public_key", help="Path to the PEM public key")
+    parser.add_argument("paths", nargs="+", help="PDF files to verify, '-' reads paths from stdin")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes")
+    parser.add_argument(
+        "--cache", nargs="?", const=DEFAULT_CACHE_PATH, default=None, metavar="PATH",
+        help=f"Reuse verdicts from a verification cache (default path: {DEFAULT_CACHE_PATH})",
+    )
+    parser.add_argument(
+        "--tier", choices=functionality.VERIFY_TIERS, default=functionality.VERIFY_TIER_FULL,
+        help="'integrity' checks only the digest and signature, 'full' also analyses later revisions",
+    )
+    parser.add_argument(
+        "--trust", action="append", default=[], metavar="CERT",
+        help="Signing certificate to trust, e.g. key_cert.pem; may be repeated",
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.public_key, "rb") as f:
+        public_key = functionality.import_public_key(f.read())
+
+    all_verified = True
+
+    def track(results):
+        nonlocal all_verified
+        for report in results:
+            all_verified = all_verified and report["verified"]
+            yield report
+
+    results = verify_many(
+        read_paths(args.paths), public_key, jobs=args.jobs, cache_path=args.cache, tier=args.tier,
+        trust_cert_paths=args.trust,
+    )
+    write_jsonl(track(results), sys.stdout)
+    return 0 if all_verified else 1
+
+
+if __name__ == "__main__":
+    logging.getLogger("pyhanko.sign.validation.generic_cms").setLevel(logging.ERROR)
+    logging.getLogger("pyhanko_certvalidator").setLevel(logging.ERROR)
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Measure `functionality.verify_all_signatures()` on documents with several signatures.
+
+Every document has one page whose content stream is `--size` MB and is
+signed `--signatures` times, each signature in its own incremental update.
+It is verified:
+- with a reader and a full byte range hash per signature, as
+  `verify_all_signatures()` used to do on its threads,
+- with `verify_all_signatures()`, which parses the document once and hashes
+  all byte ranges in one pass.
+
+Usage: python benchmarks/all_signatures.py [--size MB ...] [--signatures N ...] [--repeat N]
+"""
+import os
+import sys
+import shutil
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import functionality
+from pyhanko.sign import signers
+from pyhanko.pdf_utils.incremental_writer import IncrementalPdfFileWriter
+from pyhanko.pdf_utils.reader import PdfFileReader
+from common import quiet_logging, make_pdf, measure, print_table, workdir, file_size_mb
+
+
+def make_signed_pdf(path, size_mb, signature_count, session):
+    """
+    Write a PDF with a `size_mb` MB page and sign it `signature_count` times.
+    """
+    make_pdf(path, page_content=b"0 0 m\n" * (size_mb * 1024 * 1024 // 6))
+    for index in range(signature_count):
+        pdf_signer = signers.PdfSigner(
+            signers.PdfSignatureMetadata(field_name=f"Signature{index}"), signer=session.signer
+        )
+        with open(path, "rb+") as f:
+            pdf_signer.sign_pdf(IncrementalPdfFileWriter(f), in_place=True)
+    return path
+
+
+def verify_per_signature(pdf_file_path, validation_context):
+    """
+    Validate every signature with a reader of its own, the previous `verify_all_signatures()` work.
+    """
+    with functionality.open_pdf_input(pdf_file_path) as f:
+        count = len(PdfFileReader(f).embedded_signatures)
+    signatures = []
+    for index in range(count):
+        with functionality.open_pdf_input(pdf_file_path) as f:
+            embedded_sig = PdfFileReader(f).embedded_signatures[index]
+            signatures.append(functionality._check_signature(embedded_sig, validation_context))
+    return signatures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, nargs="+", default=[1, 50], help="Document sizes in MB")
+    parser.add_argument("--signatures", type=int, nargs="+", default=[2, 4, 8], help="Signatures per document")
+    parser.add_argument("--repeat", type=int, default=3, help="Verifications per configuration")
+    args = parser.parse_args()
+    quiet_logging()
+
+    key = functionality.generate_key(functionality.KEY_ALGORITHM_ECDSA_P256)
+    session = functionality.SigningSession(functionality.get_signing_cert(key), key)
+    validation_context = functionality.get_validation_context()
+    directory = workdir("all_signatures")
+    rows = []
+    try:
+        for size_mb in args.size:
+            for signature_count in args.signatures:
+                path = make_signed_pdf(
+                    os.path.join(directory, f"{size_mb}_{signature_count}.pdf"), size_mb, signature_count, session
+                )
+                shared = functionality.verify_all_signatures(path, key.public_key(), validation_context=validation_context)
+                # `key_match` is added to the shared results by the document verdict
+                shared_signatures = [
+                    {k: v for k, v in signature.items() if k != "key_match"} for signature in shared["signatures"]
+                ]
+                if shared_signatures != verify_per_signature(path, validation_context):
+                    raise AssertionError(f"Results differ for {path}")
+                before = measure(lambda: verify_per_signature(path, validation_context), args.repeat)
+                after = measure(
+                    lambda: functionality.verify_all_signatures(
+                        path, key.public_key(), validation_context=validation_context
+                    ),
+                    args.repeat,
+                )
+                rows.append((
+                    f"{file_size_mb(path):.0f}", signature_count, shared["verified"],
+                    f"{before * 1000:.0f}", f"{after * 1000:.0f}", f"{before / after:.1f}x",
+                ))
+                os.remove(path)
+    finally:
+        shutil.rmtree(directory)
+    print_table(("MB", "signatures", "verified", "per signature ms", "shared ms", "speedup"), rows)
+
+
+if __name__ == "__main__":
+    main()
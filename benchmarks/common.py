@@ -0,0 +1,77 @@
+import os
+import time
+import logging
+from pyhanko.pdf_utils import generic
+from pyhanko.pdf_utils.writer import PdfFileWriter
+
+
+def quiet_logging():
+    """
+    Silence library logging so it does not distort timings.
+    """
+    logging.disable(logging.CRITICAL)
+
+
+def make_pdf(path, pages=1, page_content=b""):
+    """
+    Write a simple PDF with blank (or `page_content`) pages.
+
+    Args:
+        path (str): Output path.
+        pages (int): Number of pages.
+        page_content (bytes): Content stream drawn on every page.
+
+    Returns:
+        str: `path`.
+    """
+    w = PdfFileWriter()
+    for _ in range(pages):
+        content = generic.StreamObject(stream_data=page_content)
+        page = generic.DictionaryObject({
+            generic.NameObject("/Type"): generic.NameObject("/Page"),
+            generic.NameObject("/MediaBox"): generic.ArrayObject(
+                [generic.NumberObject(v) for v in (0, 0, 595, 842)]
+            ),
+            generic.NameObject("/Contents"): w.add_object(content),
+        })
+        w.insert_page(page)
+    with open(path, "wb") as f:
+        w.write(f)
+    return path
+
+
+def measure(func, repeat):
+    """
+    Run `func` `repeat` times.
+
+    Returns:
+        float: Mean wall time of one call in seconds.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def print_table(header, rows):
+    """
+    Print rows as an aligned text table.
+    """
+    widths = [max(len(str(x)) for x in column) for column in zip(header, *rows)]
+    for row in [header, *rows]:
+        print("  ".join(str(x).ljust(w) for x, w in zip(row, widths)))
+
+
+def workdir(name):
+    """
+    Create and return a scratch directory under the system temp dir.
+    """
+    import tempfile
+    return tempfile.mkdtemp(prefix=f"bsk_{name}_")
+
+
+def file_size_mb(path):
+    """
+    Size of a file in megabytes.
+    """
+    return os.path.getsize(path) / (1024 * 1024)
@@ -0,0 +1,65 @@
+"""
+Compare key generation, signing and verification throughput per key algorithm.
+
+Usage: python benchmarks/key_algorithms.py [--keys N] [--docs N]
+"""
+import os
+import sys
+import shutil
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import functionality
+from common import quiet_logging, make_pdf, measure, print_table, workdir
+
+
+def bench(algorithm, keys, docs, directory):
+    """
+    Returns:
+        tuple: (keygen/s, sign/s, verify/s) for one algorithm.
+    """
+    keygen = measure(lambda: functionality.generate_key(algorithm), keys)
+
+    key = functionality.generate_key(algorithm)
+    session = functionality.SigningSession(functionality.get_signing_cert(key), key)
+    public_key = functionality.import_public_key(
+        key.public_key().public_bytes(
+            encoding=functionality.serialization.Encoding.DER,
+            format=functionality.serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    template = make_pdf(os.path.join(directory, "template.pdf"))
+    paths = []
+    for i in range(docs):
+        path = os.path.join(directory, f"{algorithm}_{i}.pdf")
+        shutil.copyfile(template, path)
+        paths.append(path)
+
+    to_sign = iter(paths)
+    sign = measure(lambda: session.sign_file(next(to_sign)), docs)
+    to_verify = iter(paths)
+    verify = measure(lambda: functionality.verify_pdf(next(to_verify), public_key), docs)
+    return 1 / keygen, 1 / sign, 1 / verify
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keys", type=int, default=5, help="Keys generated per algorithm")
+    parser.add_argument("--docs", type=int, default=20, help="Documents signed and verified per algorithm")
+    args = parser.parse_args()
+    quiet_logging()
+
+    directory = workdir("algorithms")
+    rows = []
+    try:
+        for algorithm in functionality.KEY_GENERATORS:
+            keygen, sign, verify = bench(algorithm, args.keys, args.docs, directory)
+            rows.append((algorithm, f"{keygen:.1f}", f"{sign:.1f}", f"{verify:.1f}"))
+    finally:
+        shutil.rmtree(directory)
+    print_table(("algorithm", "keygen/s", "sign/s", "verify/s"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Measure per-signature cost of the signature appearance on small PDFs.
+
+For every key algorithm, one-page documents are signed in memory with:
+- pyhanko's `TextStampStyle` and a signature size estimated per document
+  (what every signature used to do),
+- the cached `appearance.CachedTextStampStyle` with a per-document estimate,
+- the cached stamp with the size estimated once per session, as
+  `functionality.SigningSession` does now.
+The "stamp us" columns time the stamp rendering alone.
+
+Usage: python benchmarks/signature_appearance.py [--docs N] [--algorithms ALG ...]
+"""
+import io
+import os
+import sys
+import shutil
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import functionality
+import appearance
+from pyhanko import stamp
+from pyhanko.pdf_utils import layout
+from pyhanko.pdf_utils.incremental_writer import IncrementalPdfFileWriter
+from common import quiet_logging, make_pdf, measure, print_table, workdir
+
+
+def sign_in_memory(pdf_signer, data):
+    w = functionality.prepare_signature_writer(io.BytesIO(data))
+    pdf_signer.sign_pdf(w, output=io.BytesIO())
+
+
+def render_stamp(style, writer):
+    """
+    Render one stamp the way pyhanko does while signing.
+    """
+    box = layout.BoxConstraints(width=200, height=60)
+    style.create_stamp(writer, box, {"signer": "BSK"}).render()
+
+
+def bench(algorithm, docs, data):
+    """
+    Returns:
+        tuple: Seconds per signature for the three configurations and per
+        stamp rendering without and with the cache.
+    """
+    key = functionality.generate_key(algorithm)
+    session = functionality.SigningSession(functionality.get_signing_cert(key), key)
+    pyhanko_signer = functionality.signers.PdfSigner(
+        session.pdf_signer.signature_meta, signer=session.signer,
+        stamp_style=stamp.TextStampStyle(stamp_text=functionality.STAMP_TEXT),
+    )
+    appearance.clear_appearance_cache()
+
+    before = measure(lambda: sign_in_memory(pyhanko_signer, data), docs)
+    cached_stamp = measure(lambda: sign_in_memory(session.pdf_signer, data), docs)
+    session.sign_bytes(data)
+    current = measure(lambda: session.sign_bytes(data), docs)
+
+    plain_style = stamp.TextStampStyle(stamp_text=functionality.STAMP_TEXT)
+    cached_style = appearance.CachedTextStampStyle(stamp_text=functionality.STAMP_TEXT)
+    writer = IncrementalPdfFileWriter(io.BytesIO(data))
+    plain_render = measure(lambda: render_stamp(plain_style, writer), 20 * docs)
+    cached_render = measure(lambda: render_stamp(cached_style, writer), 20 * docs)
+    return before, cached_stamp, current, plain_render, cached_render
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=50, help="Signatures per configuration")
+    parser.add_argument(
+        "--algorithms", nargs="+", default=list(functionality.KEY_GENERATORS), help="Key algorithms to test"
+    )
+    args = parser.parse_args()
+    quiet_logging()
+
+    directory = workdir("appearance")
+    rows = []
+    try:
+        with open(make_pdf(os.path.join(directory, "small.pdf")), "rb") as f:
+            data = f.read()
+        for algorithm in args.algorithms:
+            before, cached_stamp, current, plain_render, cached_render = bench(algorithm, args.docs, data)
+            rows.append((
+                algorithm, f"{before * 1000:.1f}", f"{cached_stamp * 1000:.1f}", f"{current * 1000:.1f}",
+                f"{before / current:.1f}x", f"{plain_render * 1e6:.0f}", f"{cached_render * 1e6:.0f}",
+            ))
+    finally:
+        shutil.rmtree(directory)
+    print_table(
+        ("algorithm", "before ms", "cached stamp ms", "session ms", "speedup", "stamp us", "cached stamp us"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Compare the integrity and full verification tiers on form-heavy documents.
+
+Every document has `--fields` text fields per page, is signed, and then gets
+one incremental update filling a field, so the full tier has to run the diff
+analysis over the whole form while the integrity tier does not.
+
+Usage: python benchmarks/verification_tiers.py [--pages N ...] [--fields N] [--repeat N]
+"""
+import os
+import sys
+import shutil
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import functionality
+from pyhanko.pdf_utils import generic
+from pyhanko.pdf_utils.writer import PdfFileWriter
+from pyhanko.pdf_utils.incremental_writer import IncrementalPdfFileWriter
+from common import quiet_logging, measure, print_table, workdir, file_size_mb
+
+
+def make_form_pdf(path, pages, fields_per_page):
+    """
+    Write a PDF with a grid of text fields on every page.
+    """
+    w = PdfFileWriter()
+    form_fields = generic.ArrayObject()
+    for page_no in range(pages):
+        annots = generic.ArrayObject()
+        page = generic.DictionaryObject({
+            generic.NameObject("/Type"): generic.NameObject("/Page"),
+            generic.NameObject("/MediaBox"): generic.ArrayObject(
+                [generic.NumberObject(v) for v in (0, 0, 595, 842)]
+            ),
+            generic.NameObject("/Annots"): annots,
+        })
+        page_ref = w.insert_page(page)
+        for field_no in range(fields_per_page):
+            y = 800 - 14 * field_no
+            field = generic.DictionaryObject({
+                generic.NameObject("/Type"): generic.NameObject("/Annot"),
+                generic.NameObject("/Subtype"): generic.NameObject("/Widget"),
+                generic.NameObject("/FT"): generic.NameObject("/Tx"),
+                generic.NameObject("/T"): generic.TextStringObject(f"p{page_no}f{field_no}"),
+                generic.NameObject("/V"): generic.TextStringObject(""),
+                generic.NameObject("/Rect"): generic.ArrayObject(
+                    [generic.NumberObject(v) for v in (50, y, 300, y + 12)]
+                ),
+                generic.NameObject("/P"): page_ref,
+            })
+            field_ref = w.add_object(field)
+            annots.append(field_ref)
+            form_fields.append(field_ref)
+    w.root[generic.NameObject("/AcroForm")] = w.add_object(generic.DictionaryObject({
+        generic.NameObject("/Fields"): form_fields,
+    }))
+    with open(path, "wb") as f:
+        w.write(f)
+    return path
+
+
+def fill_first_field(path):
+    """
+    Append an incremental update that fills in the first text field.
+    """
+    with open(path, "rb+") as f:
+        w = IncrementalPdfFileWriter(f)
+        field_ref = w.root["/AcroForm"]["/Fields"][0]
+        field = field_ref.get_object()
+        field[generic.NameObject("/V")] = generic.TextStringObject("filled after signing")
+        w.update_container(field)
+        w.write_in_place()
+
+
+def bench(pages, fields, repeat, session, public_key, directory):
+    """
+    Returns:
+        tuple: (size in MB, integrity seconds, full seconds, full tier modification level).
+    """
+    path = make_form_pdf(os.path.join(directory, f"form_{pages}.pdf"), pages, fields)
+    session.sign_file(path)
+    fill_first_field(path)
+
+    integrity = measure(
+        lambda: functionality.verify_pdf_report(path, public_key, tier=functionality.VERIFY_TIER_INTEGRITY), repeat
+    )
+    full = measure(
+        lambda: functionality.verify_pdf_report(path, public_key, tier=functionality.VERIFY_TIER_FULL), repeat
+    )
+    level = functionality.verify_pdf_report(path, public_key)["modification_level"]
+    return file_size_mb(path), integrity, full, level
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 400], help="Page counts to test")
+    parser.add_argument("--fields", type=int, default=40, help="Text fields per page")
+    parser.add_argument("--repeat", type=int, default=3, help="Verifications per tier and document")
+    args = parser.parse_args()
+    quiet_logging()
+
+    key = functionality.generate_key(functionality.KEY_ALGORITHM_ECDSA_P256)
+    session = functionality.SigningSession(functionality.create_cert(key), key)
+    public_key = functionality.import_public_key(
+        key.public_key().public_bytes(
+            encoding=functionality.serialization.Encoding.DER,
+            format=functionality.serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+
+    directory = workdir("tiers")
+    rows = []
+    try:
+        for pages in args.pages:
+            size, integrity, full, level = bench(pages, args.fields, args.repeat, session, public_key, directory)
+            rows.append((
+                pages, pages * args.fields, f"{size:.1f}", f"{integrity * 1000:.0f}",
+                f"{full * 1000:.0f}", f"{full / integrity:.1f}x", level,
+            ))
+    finally:
+        shutil.rmtree(directory)
+    print_table(("pages", "fields", "MB", "integrity ms", "full ms", "speedup", "full tier level"), rows)
+
+
+if __name__ == "__main__":
+    main()
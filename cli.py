@@ -0,0 +1,147 @@
+import sys
+import json
+import logging
+import argparse
+import functionality
+from provision import resolve_pin
+
+logging.basicConfig(level=logging.INFO)
+
+STDIO = "-"
+
+
+def _read_input(path):
+    """
+    Read a whole document from a file, or from stdin if `path` is `-`.
+
+    Returns:
+        bytes: The document.
+    """
+    if path == STDIO:
+        return sys.stdin.buffer.read()
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _write_output(path, data):
+    """
+    Write a document to a file, or to stdout if `path` is `-`.
+    """
+    if path == STDIO:
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+        return
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def sign(args):
+    """
+    Sign one document, stdin to stdout by default.
+
+    The document is read and signed in memory, no temporary file is created.
+    The signing certificate is kept in memory only, unless `--cache-cert`
+    asks for it to be stored next to the key.
+
+    Returns:
+        int: 0 if the document was signed, 1 otherwise.
+    """
+    try:
+        pin = resolve_pin(args.pin)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read PIN: {e}", file=sys.stderr)
+        return 1
+    try:
+        key = functionality.load_and_decrypt_private_key(args.private_key, pin)
+    except (OSError, ValueError) as e:
+        print(f"Cannot unlock the private key: {e}", file=sys.stderr)
+        return 1
+    if key is None:
+        print("Cannot unlock the private key", file=sys.stderr)
+        return 1
+    cert_path = functionality.cert_path_for_key(args.private_key) if args.cache_cert else None
+    try:
+        session = functionality.SigningSession(functionality.get_signing_cert(key, cert_path), key)
+        signed = session.sign_bytes(_read_input(args.input), require_unsigned=args.require_unsigned)
+    except Exception as e:
+        logging.error(f"Failed to sign PDF: {e}", exc_info=True)
+        return 1
+    if signed is None:
+        return 1
+    _write_output(args.output, signed)
+    return 0
+
+
+def verify(args):
+    """
+    Verify one document, read from stdin by default, and print the report as JSON.
+
+    Returns:
+        int: 0 if the document was verified, 1 otherwise.
+    """
+    with open(args.public_key, "rb") as f:
+        public_key = functionality.import_public_key(f.read())
+    validation_context = functionality.create_validation_context(args.trust) if args.trust else None
+    if args.input == STDIO:
+        report = functionality.verify_pdf_bytes_report(
+            sys.stdin.buffer.read(), public_key, args.tier, validation_context
+        )
+    else:
+        report = functionality.verify_pdf_report(
+            args.input, public_key, tier=args.tier, validation_context=validation_context
+        )
+    print(json.dumps(report))
+    return 0 if report["verified"] else 1
+
+
+def main(argv=None):
+    """
+    Headless command line entry point for signing and verifying single documents.
+
+    Examples:
+        python cli.py sign key.pem --pin env:PIN < in.pdf > out.pdf
+        python cli.py verify key_pub.pem < out.pdf
+
+    Returns:
+        int: Exit status of the subcommand.
+    """
+    parser = argparse.ArgumentParser(description="Sign or verify a PDF without the GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sign_parser = commands.add_parser("sign", help="Sign a PDF, stdin to stdout by default")
+    sign_parser.add_argument("private_key", help="Path to the encrypted private key")
+    sign_parser.add_argument(
+        "--pin", required=True, help="PIN source: env:NAME, file:PATH, fd:N or literal:PIN"
+    )
+    sign_parser.add_argument("-i", "--input", default=STDIO, help="PDF to sign, '-' for stdin")
+    sign_parser.add_argument("-o", "--output", default=STDIO, help="Signed PDF, '-' for stdout")
+    sign_parser.add_argument(
+        "--require-unsigned", action="store_true", help="Fail instead of adding a signature to a signed PDF"
+    )
+    sign_parser.add_argument(
+        "--cache-cert", action="store_true",
+        help="Store the signing certificate next to the key and reuse it in later runs",
+    )
+    sign_parser.set_defaults(func=sign)
+
+    verify_parser = commands.add_parser("verify", help="Verify a PDF and print a JSON report")
+    verify_parser.add_argument("public_key", help="Path to the PEM public key")
+    verify_parser.add_argument("-i", "--input", default=STDIO, help="PDF to verify, '-' for stdin")
+    verify_parser.add_argument(
+        "--tier", choices=functionality.VERIFY_TIERS, default=functionality.VERIFY_TIER_FULL,
+        help="'integrity' checks only the digest and signature, 'full' also analyses later revisions",
+    )
+    verify_parser.add_argument(
+        "--trust", action="append", default=[], metavar="CERT",
+        help="Signing certificate to trust, e.g. key_cert.pem; may be repeated",
+    )
+    verify_parser.set_defaults(func=verify)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    logging.getLogger("pyhanko.sign.validation.generic_cms").setLevel(logging.ERROR)
+    logging.getLogger("pyhanko_certvalidator").setLevel(logging.ERROR)
+    sys.exit(main())
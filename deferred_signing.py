@@ -0,0 +1,314 @@
+import os
+import sys
+import time
+import shutil
+import asyncio
+import logging
+import argparse
+import tempfile
+import multiprocessing
+from collections import namedtuple
+from asn1crypto import cms, x509 as asn1x509
+from cryptography import x509
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa, ec
+from pyhanko.sign import signers
+from pyhanko.sign.signers.pdf_byterange import PreparedByteRangeDigest
+from pyhanko_certvalidator.registry import SimpleCertificateStore
+import functionality
+from batch import SignResult, run_pool, write_jsonl, read_paths
+from provision import resolve_pin
+
+logging.basicConfig(level=logging.INFO)
+
+# signatures requested from the key holder at once
+DEFAULT_BATCH_SIZE = 16
+
+# state of a document between hashing and embedding its signature
+PreparedDocument = namedtuple(
+    "PreparedDocument",
+    ["path", "output_path", "tbs_path", "md_algorithm", "document_digest", "signed_attrs",
+     "reserved_region", "error", "elapsed"],
+)
+
+_worker_cert = None
+_worker_pdf_signer = None
+_worker_external_signer = None
+_worker_bytes_reserved = None
+
+
+def _signature_size(public_key):
+    """
+    Upper bound of the raw signature size for a public key, used to reserve space in the document.
+    """
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return (public_key.key_size + 7) // 8
+    if isinstance(public_key, ec.EllipticCurvePublicKey):
+        # DER encoded (r, s) pair
+        return 2 * ((public_key.curve.key_size + 7) // 8) + 9
+    return 64
+
+
+def _init_worker(cert_pem):
+    """
+    Prepare a key-less PDF signer once per worker process.
+
+    Args:
+        cert_pem (bytes): PEM encoding of the signing certificate.
+    """
+    global _worker_cert, _worker_pdf_signer, _worker_external_signer, _worker_bytes_reserved
+    cert = x509.load_pem_x509_certificate(cert_pem)
+    _worker_cert = asn1x509.Certificate.load(cert.public_bytes(serialization.Encoding.DER))
+    _worker_external_signer = signers.ExternalSigner(
+        _worker_cert, SimpleCertificateStore(), signature_value=_signature_size(cert.public_key())
+    )
+    _worker_pdf_signer = functionality.create_pdf_signer(_worker_external_signer)
+    _worker_bytes_reserved = functionality.estimate_signature_size(_worker_pdf_signer)
+
+
+def _output_path(pdf_file_path, change_name):
+    base, ext = os.path.splitext(pdf_file_path)
+    return f"{base}_signed{ext}" if change_name else pdf_file_path
+
+
+async def _digest_document(w, output):
+    prep_digest, tbs_document, _ = await _worker_pdf_signer.async_digest_doc_for_signing(
+        w, bytes_reserved=_worker_bytes_reserved, output=output
+    )
+    signed_attrs = await _worker_external_signer.signed_attrs(
+        prep_digest.document_digest, tbs_document.md_algorithm, use_pades=tbs_document.use_pades
+    )
+    return prep_digest, tbs_document.md_algorithm, signed_attrs
+
+
+def _prepare_one(job):
+    """
+    Phase one: write a document with a reserved signature region and compute its digest.
+
+    Runs in a worker process without access to the private key. The
+    prepared document is written to a temporary file next to the output.
+
+    Args:
+        job (tuple): (pdf_file_path, change_name).
+
+    Returns:
+        PreparedDocument: Digest and signed attributes to sign, or `error` set; never raises.
+    """
+    pdf_file_path, change_name = job
+    output_path = _output_path(pdf_file_path, change_name)
+    start = time.perf_counter()
+    tmp_path = None
+    try:
+        if functionality.probe_is_pdf_signed(pdf_file_path):
+            raise ValueError("PDF is signed")
+        fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(output_path)))
+        with os.fdopen(fd, "w+b") as out_f, functionality.open_pdf_input(pdf_file_path) as f:
+            w = functionality.prepare_signature_writer(f, require_unsigned=True)
+            if w is None:
+                raise ValueError("PDF is signed")
+            prep_digest, md_algorithm, signed_attrs = asyncio.run(_digest_document(w, out_f))
+    except Exception as e:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return PreparedDocument(
+            pdf_file_path, output_path, None, None, None, None, None,
+            f"{type(e).__name__}: {e}", time.perf_counter() - start,
+        )
+    return PreparedDocument(
+        pdf_file_path, output_path, tmp_path, md_algorithm, prep_digest.document_digest, signed_attrs.dump(),
+        (prep_digest.reserved_region_start, prep_digest.reserved_region_end), None, time.perf_counter() - start,
+    )
+
+
+def sign_attributes(signer, requests):
+    """
+    Phase two: sign a batch of CMS signed attributes with the private key.
+
+    This is the only step that needs the key. Each request costs one private
+    key operation over a few hundred bytes, independent of the document size.
+    Only signed attributes carrying a message digest are accepted, so the key
+    holder cannot be used to sign arbitrary data.
+
+    Args:
+        signer (signers.Signer): Signer holding the key, e.g. `functionality.SigningSession.signer`.
+        requests (iterable of tuple): (md_algorithm, signed_attrs) pairs, `signed_attrs`
+            being the DER encoding of the CMS signed attributes.
+
+    Returns:
+        list of bytes: Raw signature values, in request order.
+
+    Raises:
+        ValueError: If a request does not contain CMS signed attributes.
+    """
+    signatures = []
+    for md_algorithm, signed_attrs in requests:
+        attrs = cms.CMSAttributes.load(signed_attrs)
+        types = {attr["type"].native for attr in attrs}
+        if not {"content_type", "message_digest"} <= types:
+            raise ValueError("Not a set of CMS signed attributes")
+        signatures.append(signer.sign_raw(signed_attrs, md_algorithm))
+    return signatures
+
+
+def _embed_one(job):
+    """
+    Phase three: wrap a signature value in a CMS object and write it into the prepared document.
+
+    Args:
+        job (tuple): (PreparedDocument, signature value).
+
+    Returns:
+        SignResult: Result for the document, never raises.
+    """
+    prepared, signature = job
+    start = time.perf_counter()
+    try:
+        external_signer = signers.ExternalSigner(_worker_cert, SimpleCertificateStore(), signature_value=signature)
+        signature_cms = asyncio.run(external_signer.async_sign_prescribed_attributes(
+            prepared.md_algorithm, cms.CMSAttributes.load(prepared.signed_attrs)
+        ))
+        prep_digest = PreparedByteRangeDigest(prepared.document_digest, *prepared.reserved_region)
+        with open(prepared.tbs_path, "r+b") as f:
+            prep_digest.fill_with_cms(f, signature_cms)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(prepared.path, prepared.tbs_path)
+        os.replace(prepared.tbs_path, prepared.output_path)
+    except Exception as e:
+        _discard(prepared)
+        return SignResult(prepared.path, False, f"{type(e).__name__}: {e}", prepared.elapsed)
+    return SignResult(prepared.path, True, None, prepared.elapsed + time.perf_counter() - start)
+
+
+def _discard(prepared):
+    if prepared.tbs_path and os.path.exists(prepared.tbs_path):
+        os.remove(prepared.tbs_path)
+
+
+def sign_deferred(paths, key, jobs=None, cert_path=None, change_name=False, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Sign many PDF files in three phases, keeping the private key in this process.
+
+    1. Worker processes write each document with a reserved signature region
+       and compute its byte range digest and CMS signed attributes.
+    2. This process signs batches of `batch_size` signed attributes with
+       `sign_attributes()`, one small private key operation per document.
+    3. Worker processes build the CMS objects, embed them and rename the
+       documents into place.
+
+    Phases run as a pipeline, so the number of prepared documents waiting on
+    disk is bounded by the pool windows. Unlike `batch.sign_many()`, the key
+    is never handed to the workers: they are started with `spawn`, so they do
+    not inherit a copy of this process's memory holding the key either.
+
+    Args:
+        paths (iterable of str): Paths to the PDF files to be signed.
+        key (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey or ed25519.Ed25519PrivateKey): The private key used for signing.
+        jobs (int or None): Number of worker processes per phase, defaults to the CPU count.
+        cert_path (str or None): Optional certificate cache file, see `functionality.get_signing_cert()`.
+        change_name (bool): If True, output files are named with a '_signed.pdf' suffix.
+        batch_size (int): Number of signatures requested from the key at once.
+
+    Yields:
+        SignResult: (path, ok, error, elapsed) for every document, in completion order;
+        `elapsed` is the worker time of phases one and three.
+    """
+    cert = functionality.get_signing_cert(key, cert_path)
+    cert_pem = cert.public_bytes(serialization.Encoding.PEM)
+    signer = functionality.SigningSession(cert, key).signer
+    # spawn keeps the key material of this process out of the workers
+    mp_context = multiprocessing.get_context("spawn")
+    failures = []
+
+    def prepare_failed(job, error):
+        pdf_file_path = job[0]
+        return PreparedDocument(pdf_file_path, None, None, None, None, None, None, error, 0.0)
+
+    def sign_batch(batch):
+        try:
+            signatures = sign_attributes(signer, [(p.md_algorithm, p.signed_attrs) for p in batch])
+        except Exception as e:
+            logging.error(f"Failed to sign digests: {e}", exc_info=True)
+            for prepared in batch:
+                _discard(prepared)
+                failures.append(SignResult(prepared.path, False, f"{type(e).__name__}: {e}", prepared.elapsed))
+            return []
+        return list(zip(batch, signatures))
+
+    def signed_documents():
+        batch = []
+        prepared_documents = run_pool(
+            _prepare_one, ((path, change_name) for path in paths), prepare_failed,
+            jobs=jobs, initializer=_init_worker, initargs=(cert_pem,), mp_context=mp_context,
+        )
+        for prepared in prepared_documents:
+            if prepared.error:
+                failures.append(SignResult(prepared.path, False, prepared.error, prepared.elapsed))
+                continue
+            batch.append(prepared)
+            if len(batch) >= batch_size:
+                yield from sign_batch(batch)
+                batch = []
+        yield from sign_batch(batch)
+
+    def embed_failed(job, error):
+        prepared = job[0]
+        _discard(prepared)
+        return SignResult(prepared.path, False, error, prepared.elapsed)
+
+    results = run_pool(
+        _embed_one, signed_documents(), embed_failed,
+        jobs=jobs, initializer=_init_worker, initargs=(cert_pem,), mp_context=mp_context,
+    )
+    for result in results:
+        while failures:
+            yield failures.pop()
+        yield result
+    while failures:
+        yield failures.pop()
+
+
+def main(argv=None):
+    """
+    Command line entry point: sign documents in deferred mode and stream a JSON line per document to stdout.
+
+    Returns:
+        int: 0 if every document was signed, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Sign PDF files, hashing on workers and signing digests here.")
+    parser.add_argument("private_key", help="Path to the encrypted private key")
+    parser.add_argument("paths", nargs="+", help="PDF files to sign, '-' reads paths from stdin")
+    parser.add_argument("--pin", required=True, help="PIN source: env:NAME, file:PATH, fd:N or literal:PIN")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH_SIZE, help="Digests signed at once")
+    parser.add_argument("--rename", action="store_true", help="Write '_signed.pdf' files next to the inputs")
+    args = parser.parse_args(argv)
+
+    try:
+        pin = resolve_pin(args.pin)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read PIN: {e}", file=sys.stderr)
+        return 1
+    key = functionality.load_and_decrypt_private_key(args.private_key, pin)
+    if key is None:
+        print("Cannot unlock the private key", file=sys.stderr)
+        return 1
+
+    all_signed = True
+
+    def track(results):
+        nonlocal all_signed
+        for result in results:
+            all_signed = all_signed and result.ok
+            yield result
+
+    results = sign_deferred(
+        read_paths(args.paths), key, jobs=args.jobs, cert_path=functionality.cert_path_for_key(args.private_key),
+        change_name=args.rename, batch_size=args.batch,
+    )
+    write_jsonl(track(results), sys.stdout)
+    return 0 if all_signed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
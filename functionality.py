@@ -1,31 +1,70 @@
 from Crypto.Hash import SHA256
 from Crypto.Cipher import AES
+from Crypto.PublicKey import RSA, ECC
 import os
 import logging
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import rsa, ec, ed25519
 from pyhanko.pdf_utils.incremental_writer import IncrementalPdfFileWriter
 from cryptography.hazmat.primitives import serialization, hashes
 from cryptography.hazmat.backends import default_backend
 from cryptography import x509
 from cryptography.x509.oid import NameOID
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pyhanko_certvalidator.registry import SimpleCertificateStore
+from pyhanko_certvalidator import ValidationContext
 from asn1crypto import pem
 from asn1crypto import x509 as asn1x509
 from pyhanko.keys import load_private_key_from_pemder_data
 from pyhanko.pdf_utils.reader import PdfFileReader
-from pyhanko.sign.validation import validate_pdf_signature
+from pyhanko.sign.validation import validate_pdf_signature, async_validate_pdf_signature
 from pyhanko.sign import fields, signers
+from pyhanko.sign.general import get_pyca_cryptography_hash
+from cryptography.hazmat.primitives.asymmetric.padding import PKCS1v15
 from pyhanko import stamp
 from pyhanko.pdf_utils.incremental_writer import IncrementalPdfFileWriter
+import hashlib
 from hashlib import sha256
 import io
+import mmap
+import shutil
+import tempfile
+import contextlib
+import sqlite3
+import threading
+import asyncio
+import weakref
 from cryptography.exceptions import UnsupportedAlgorithm
 from pyhanko.sign.diff_analysis.policy_api import SuspiciousModification
 from pyhanko.sign.diff_analysis.policy_api import ModificationLevel
+from pyhanko.sign.diff_analysis import DEFAULT_DIFF_POLICY
+from pyhanko.sign.signers.pdf_cms import PdfCMSSignedAttributes, select_suitable_signing_md
+from pyhanko.sign.fields import SigSeedSubFilter
+from pdf_probe import probe_is_pdf_signed
+from appearance import CachedTextStampStyle
 
 logging.basicConfig(level=logging.INFO)
 
+CERT_VALIDITY_DAYS = 365
+CERT_RENEW_BEFORE = timedelta(days=30)
+
+KEY_ALGORITHM_RSA = "rsa4096"
+KEY_ALGORITHM_ECDSA_P256 = "ecdsa-p256"
+KEY_ALGORITHM_ED25519 = "ed25519"
+NO_SIGNATURES_ERROR = "No signatures found"
+HASH_CHUNK_SIZE = 1024 * 1024
+# verification tiers: digest and signature only, or also pyhanko's diff analysis of later revisions
+VERIFY_TIER_INTEGRITY = "integrity"
+VERIFY_TIER_FULL = "full"
+VERIFY_TIERS = (VERIFY_TIER_INTEGRITY, VERIFY_TIER_FULL)
+PRIVATE_KEY_TYPES = (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey, ed25519.Ed25519PrivateKey)
+
+# signing certificates by public key fingerprint
+_cert_cache = {}
+# (context, created, signing certificate fingerprints) of get_validation_context()
+_validation_context = None
+_validation_context_lock = threading.Lock()
+VALIDATION_CONTEXT_MAX_AGE = timedelta(hours=1)
+
 
 def generate_rsa_key():
     """
@@ -41,6 +80,51 @@ def generate_rsa_key():
     )
 
 
+def generate_ecdsa_key():
+    """
+    Generate an ECDSA private key on the NIST P-256 curve.
+
+    Returns:
+        ec.EllipticCurvePrivateKey: A newly generated EC private key object.
+    """
+    return ec.generate_private_key(ec.SECP256R1())
+
+
+def generate_ed25519_key():
+    """
+    Generate an Ed25519 private key.
+
+    Returns:
+        ed25519.Ed25519PrivateKey: A newly generated Ed25519 private key object.
+    """
+    return ed25519.Ed25519PrivateKey.generate()
+
+
+KEY_GENERATORS = {
+    KEY_ALGORITHM_RSA: generate_rsa_key,
+    KEY_ALGORITHM_ECDSA_P256: generate_ecdsa_key,
+    KEY_ALGORITHM_ED25519: generate_ed25519_key,
+}
+
+
+def generate_key(algorithm=KEY_ALGORITHM_RSA):
+    """
+    Generate a private key of the selected algorithm.
+
+    Args:
+        algorithm (str): One of `KEY_GENERATORS`, RSA-4096 by default.
+
+    Returns:
+        A new private key object, see `PRIVATE_KEY_TYPES`.
+
+    Raises:
+        ValueError: If the algorithm is not supported.
+    """
+    if algorithm not in KEY_GENERATORS:
+        raise ValueError(f"Unsupported key algorithm: {algorithm}")
+    return KEY_GENERATORS[algorithm]()
+
+
 def derive_aes_key(pin):
     """
     Derive a 256-bit SHA key.
@@ -56,18 +140,25 @@ def derive_aes_key(pin):
 
 def encrypt_private_key(private_key, aes_key):
     """
-    Encrypt private RSA key using AES key.
+    Encrypt private key using AES key.
+
+    RSA keys are stored in the traditional OpenSSL format, EC and Ed25519
+    keys in PKCS8, which is the only PEM format available for Ed25519.
 
     Args:
-        private_key (rsa.RSAPrivateKey): The RSA private key object to encrypt.
+        private_key (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey or ed25519.Ed25519PrivateKey): The private key object to encrypt.
         aes_key (bytes): AES bytes.
 
     Returns:
-        bytes: A byte string with initialization vector and encrypted RSA private key
+        bytes: A byte string with initialization vector and encrypted private key
     """
+    if isinstance(private_key, rsa.RSAPrivateKey):
+        key_format = serialization.PrivateFormat.TraditionalOpenSSL
+    else:
+        key_format = serialization.PrivateFormat.PKCS8
     key = private_key.private_bytes(
         encoding=serialization.Encoding.PEM,
-        format=serialization.PrivateFormat.TraditionalOpenSSL,
+        format=key_format,
         encryption_algorithm=serialization.NoEncryption(),
     )
     iv = os.urandom(16)
@@ -79,14 +170,14 @@ def encrypt_private_key(private_key, aes_key):
 
 def decrypt_private_key(encrypted_data, aes_key):
     """
-    Decrypt private RSA key using AES key.
+    Decrypt private key using AES key.
 
     Args:
-        encrypted_data (bytes): byte string consisting of a 16-byte iv and AES-encrypted RSA key
+        encrypted_data (bytes): byte string consisting of a 16-byte iv and AES-encrypted private key
         aes_key (bytes): The AES key (32 bytes) used for decryption.
 
     Returns:
-        rsa.RSAPrivateKey: RSA private key object.
+        rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey or ed25519.Ed25519PrivateKey: Private key object.
     """
     try:
         iv = encrypted_data[:16]
@@ -107,13 +198,16 @@ def decrypt_private_key(encrypted_data, aes_key):
         logging.error(f"Failed to decrypt private key: {e}", exc_info=True)
         return None
 
-def create_keys(pin, file_path):
+def create_keys(pin, file_path, key_pool=None, algorithm=KEY_ALGORITHM_RSA):
     """
-    Generate RSA key pair, derive AES key from PIN, encrypt the private key, and save both keys to files.
+    Generate key pair, derive AES key from PIN, encrypt the private key, and save both keys to files.
     
     Args:
         pin (str): User-provided PIN used to derive the AES key.
         file_path (str): Path where the encrypted private key will be saved (PEM format).
+        key_pool (key_pool.KeyPool or None): Pool of pre-generated keys, the key is
+            generated on the spot if not given.
+        algorithm (str): Key algorithm used when no pool is given, see `generate_key()`.
 
     Side Effects:
         - Saves the encrypted private key to `file_path`.
@@ -128,7 +222,7 @@ def create_keys(pin, file_path):
         Logs exceptions internally but does not propagate them.
     """
     try:
-        key = generate_rsa_key()
+        key = key_pool.get() if key_pool is not None else generate_key(algorithm)
         aes_key = derive_aes_key(pin)
         encrypted_data = encrypt_private_key(key, aes_key)
         save_encrypted_private_key(encrypted_data, file_path)
@@ -141,10 +235,12 @@ def create_keys(pin, file_path):
 
 def save_public_key(public_key, output_file):
     """
-    Save an RSA public key to a PEM-formatted file.
+    Save a public key to a PEM-formatted file.
+
+    RSA keys are written in PKCS1 format, other keys as SubjectPublicKeyInfo.
 
     Args:
-        public_key (rsa.RSAPublicKey): The RSA public key to save.
+        public_key (rsa.RSAPublicKey, ec.EllipticCurvePublicKey or ed25519.Ed25519PublicKey): The public key to save.
         output_file (str): Path to the output file.
 
     Side Effects:
@@ -154,9 +250,11 @@ def save_public_key(public_key, output_file):
     Returns:
         None   
     """
-    key = public_key.public_bytes(
-        encoding=serialization.Encoding.PEM, format=serialization.PublicFormat.PKCS1
-    )
+    if isinstance(public_key, rsa.RSAPublicKey):
+        key_format = serialization.PublicFormat.PKCS1
+    else:
+        key_format = serialization.PublicFormat.SubjectPublicKeyInfo
+    key = public_key.public_bytes(encoding=serialization.Encoding.PEM, format=key_format)
     with open(output_file, "wb") as f:
         f.write(key)
     logging.debug(f"Public key saved to {output_file}")
@@ -215,7 +313,7 @@ def load_and_decrypt_private_key(file_path, pin):
         file_path (str): Path to the PEM-formatted public key file.
 
     Returns:
-        rsa.RSAPrivateKey: RSA private key object.
+        rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey or ed25519.Ed25519PrivateKey: Private key object.
         
     Side Effects:
         - Logs debug messages about the operation.
@@ -234,13 +332,423 @@ def load_and_decrypt_private_key(file_path, pin):
     return private_key
 
 
-def verify_pdf(pdf_file_path, public_key):
+class MappedPdfStream(io.RawIOBase):
+    """
+    Read-only, seekable stream over a memory-mapped file.
+
+    Pages of the mapping come from the shared page cache, so many workers
+    reading the same documents do not each hold a private copy of them.
+    Several streams can share one mapping, each with its own position.
+
+    Args:
+        mapping (mmap.mmap): Read-only mapping of the whole file.
+    """
+
+    def __init__(self, mapping):
+        super().__init__()
+        self._map = mapping
+        self._view = memoryview(mapping)
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._map) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("Negative seek position")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer):
+        end = min(self._pos + len(buffer), len(self._map))
+        n = max(end - self._pos, 0)
+        buffer[:n] = self._view[self._pos:end]
+        self._pos += n
+        return n
+
+    def read(self, size=-1):
+        # called for every token by pyhanko's parser, so kept as short as possible;
+        # slicing past the end of the mapping is safe
+        pos = self._pos
+        data = self._map[pos:] if size is None or size < 0 else self._map[pos:pos + size]
+        self._pos = pos + len(data)
+        return data
+
+    def readline(self, size=-1):
+        end = self._map.find(b"\n", self._pos)
+        end = len(self._map) if end == -1 else end + 1
+        if size is not None and size >= 0:
+            end = min(end, self._pos + size)
+        return self.read(end - self._pos)
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+@contextlib.contextmanager
+def open_pdf_input(pdf_file_path, use_mmap=True):
+    """
+    Open a PDF for reading, memory-mapped if possible.
+
+    Args:
+        pdf_file_path (str): Path to the PDF file.
+        use_mmap (bool): If False, or the file cannot be mapped (e.g. it is empty),
+            a regular file object is used.
+
+    Yields:
+        io.IOBase: Seekable binary stream for `PdfFileReader`.
+    """
+    with open(pdf_file_path, "rb") as f:
+        mapping = None
+        if use_mmap:
+            try:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError) as e:
+                logging.debug(f"Cannot map {pdf_file_path}: {e}")
+        if mapping is None:
+            yield f
+            return
+        stream = MappedPdfStream(mapping)
+        try:
+            yield stream
+        finally:
+            stream.close()
+            mapping.close()
+
+
+def import_public_key(key_data):
+    """
+    Import a PEM or DER public key with PyCryptodome.
+
+    Args:
+        key_data (bytes): Encoded RSA, ECDSA P-256 or Ed25519 public key.
+
+    Returns:
+        Crypto.PublicKey.RSA.RsaKey or Crypto.PublicKey.ECC.EccKey: Imported key.
+
+    Raises:
+        ValueError: If the key format is not supported.
+    """
+    try:
+        return RSA.import_key(key_data)
+    except (ValueError, IndexError, TypeError):
+        return ECC.import_key(key_data)
+
+
+def public_key_fingerprint(public_key):
+    """
+    Compute the SHA-256 fingerprint of a public key's SubjectPublicKeyInfo.
+
+    Args:
+        public_key: PyCryptodome key, `cryptography` public key or asn1crypto `PublicKeyInfo`.
+
+    Returns:
+        str: Hex encoded SHA-256 of the DER encoded SubjectPublicKeyInfo.
+    """
+    if hasattr(public_key, "export_key"):
+        der = public_key.export_key(format="DER")
+    elif hasattr(public_key, "public_bytes"):
+        der = public_key.public_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    else:
+        der = public_key.dump()
+    return sha256(der).hexdigest()
+
+
+def verify_pdf_report(pdf_file_path, public_key, use_mmap=True, cache=None, tier=VERIFY_TIER_FULL,
+                      validation_context=None):
+    """
+    Verify the digital signature of a signed PDF and describe the outcome.
+
+    Args:
+        pdf_file_path (str): Path to the signed PDF file.
+        public_key (Crypto.PublicKey.RSA.RsaKey or Crypto.PublicKey.ECC.EccKey): Public key to compare with the signer's certificate.
+        use_mmap (bool): Read the PDF through a memory mapping, see `open_pdf_input()`.
+        cache (verify_cache.VerificationCache or None): Cache of earlier verdicts for
+            the same content and key; None bypasses caching.
+        tier (str): `VERIFY_TIER_FULL` also runs the diff analysis of revisions
+            appended after the signature, `VERIFY_TIER_INTEGRITY` only checks the
+            signed digest and the signature itself.
+        validation_context (pyhanko_certvalidator.ValidationContext or None): Context reused
+            across verifications, defaults to `get_validation_context()`.
+
+    Returns:
+        dict: Verification report with keys:
+            - path (str): Verified file.
+            - signed (bool): The PDF contains at least one signature.
+            - intact (bool or None): Signed byte range digest matches.
+            - valid (bool or None): Signature is cryptographically valid.
+            - modification_level (str or None): Name of pyhanko's `ModificationLevel`;
+              in the integrity tier only set if the signature covers the whole file.
+            - signer_fingerprint (str or None): SHA-256 of the signer's public key.
+            - key_match (bool): Signer's key equals `public_key`.
+            - verified (bool): All checks of the tier passed, same as `verify_pdf()`.
+            - error (str or None): Reason of failure, if any.
+            - cached (bool): The report comes from `cache`.
+            - tier (str): Verification tier that produced the verdict.
+
+    Notes:
+        - Only the first embedded signature is checked, see `verify_all_signatures()`
+          for documents with several signatures.
+        - The signer's key is compared first; signatures by another key are
+          rejected without validation, leaving `intact` and `valid` as None.
+        - Only verdicts that depend on the file content alone are cached, not I/O errors.
+        - An integrity tier verdict does not look at incremental updates made after
+          signing, which may change what the document displays.
+    """
+    key_fingerprint = public_key_fingerprint(public_key)
+    return verify_pdf_trusted(
+        pdf_file_path, {key_fingerprint}, key_fingerprint, use_mmap, cache, tier, validation_context
+    )
+
+
+def verify_pdf_trusted(pdf_file_path, trusted_fingerprints, trusted_id, use_mmap=True, cache=None,
+                       tier=VERIFY_TIER_FULL, validation_context=None):
+    """
+    Verify the digital signature of a signed PDF against a set of trusted keys.
+
+    Args:
+        pdf_file_path (str): Path to the signed PDF file.
+        trusted_fingerprints: Container of trusted SPKI fingerprints supporting `in`,
+            e.g. a set or a `key_ring.Keyring`.
+        trusted_id (str): Identifies the trusted set in `cache`, must change when the set does.
+        use_mmap (bool): Read the PDF through a memory mapping, see `open_pdf_input()`.
+        cache (verify_cache.VerificationCache or None): Cache of earlier verdicts; None bypasses caching.
+        tier (str): Verification tier, see `verify_pdf_report()`.
+        validation_context (pyhanko_certvalidator.ValidationContext or None): Context reused
+            across verifications, defaults to `get_validation_context()`.
+
+    Returns:
+        dict: Verification report as from `verify_pdf_report()`, `key_match`
+        meaning the signer is one of the trusted keys.
+
+    Raises:
+        ValueError: If the tier is unknown.
+    """
+    if tier not in VERIFY_TIERS:
+        raise ValueError(f"Unknown verification tier: {tier}")
+    if cache is None:
+        return _check_pdf_signature(pdf_file_path, trusted_fingerprints, use_mmap, tier, validation_context)
+
+    # full verdicts keep the plain key id so caches written before tiers existed stay valid
+    if tier != VERIFY_TIER_FULL:
+        trusted_id = f"{trusted_id}:{tier}"
+    try:
+        cached = cache.get(pdf_file_path, trusted_id)
+    except (OSError, sqlite3.Error) as e:
+        logging.error(f"Verification cache lookup failed: {e}")
+        cached = None
+    if cached is not None:
+        cached["cached"] = True
+        return cached
+
+    report = _check_pdf_signature(pdf_file_path, trusted_fingerprints, use_mmap, tier, validation_context)
+    if report["signed"] or report["error"] == NO_SIGNATURES_ERROR:
+        try:
+            cache.put(pdf_file_path, trusted_id, report)
+        except (OSError, sqlite3.Error) as e:
+            logging.error(f"Verification cache update failed: {e}")
+    return report
+
+
+def new_report(pdf_file_path):
+    """
+    Empty verification report, see `verify_pdf_report()`.
+
+    Args:
+        pdf_file_path (str): Path reported for the document.
+
+    Returns:
+        dict: Report of an unsigned, unverified document with every key of `verify_pdf_report()`.
+    """
+    return {
+        "path": pdf_file_path,
+        "signed": False,
+        "intact": None,
+        "valid": None,
+        "modification_level": None,
+        "signer_fingerprint": None,
+        "key_match": False,
+        "verified": False,
+        "error": None,
+        "cached": False,
+        "tier": VERIFY_TIER_FULL,
+    }
+
+
+def _first_trusted_signature(reader, trusted_fingerprints, report):
+    """
+    Pick the first embedded signature and check its signer against the trusted keys.
+
+    The signer's key is compared before any expensive validation.
+
+    Args:
+        reader (PdfFileReader): Reader of the document.
+        trusted_fingerprints: Container of trusted SPKI fingerprints.
+        report (dict): Report to fill in, see `verify_pdf_report()`.
+
+    Returns:
+        EmbeddedPdfSignature or None: Signature to validate, None if `report` is already final.
+    """
+    if len(reader.embedded_signatures) == 0:
+        logging.debug("No signatures found.")
+        report["error"] = NO_SIGNATURES_ERROR
+        return None
+    report["signed"] = True
+    embedded_sig = reader.embedded_signatures[0]
+
+    try:
+        signer_fingerprint = public_key_fingerprint(embedded_sig.signer_cert.public_key)
+    except Exception as e:
+        logging.debug("Signer certificate could not be read.")
+        report["error"] = f"Signature failed cryptographic validation: {e}"
+        return None
+    report["signer_fingerprint"] = signer_fingerprint
+    report["key_match"] = signer_fingerprint in trusted_fingerprints
+    if not report["key_match"]:
+        logging.debug("Public key does not match, signature not validated.")
+        report["error"] = "Public key does not match"
+        return None
+    return embedded_sig
+
+
+def _validation_kwargs(tier, validation_context):
+    """
+    Keyword arguments of pyhanko's `validate_pdf_signature()` for a verification tier.
+    """
+    return {
+        "signer_validation_context": validation_context or get_validation_context(),
+        "skip_diff": tier == VERIFY_TIER_INTEGRITY,
+    }
+
+
+def _apply_validation_result(report, validation_result, tier):
+    """
+    Fill in a report from pyhanko's validation status of a trusted signature.
+
+    Raises:
+        SuspiciousModification: If the full tier found modifications after signing.
+    """
+    report["intact"] = validation_result.intact
+    report["valid"] = validation_result.valid
+    if validation_result.modification_level is not None:
+        report["modification_level"] = validation_result.modification_level.name
+    if not (validation_result.intact and validation_result.valid):
+        logging.debug("Signature failed cryptographic validation.")
+        report["error"] = "Signature failed cryptographic validation"
+        return report
+
+    if tier == VERIFY_TIER_FULL and validation_result.modification_level != ModificationLevel.NONE:
+        raise SuspiciousModification(
+            f"Suspicious modifications found: {validation_result.modification_level.name}"
+        )
+
+    logging.debug("Signature is valid and public key matches.")
+    report["verified"] = True
+    return report
+
+
+def _check_pdf_signature(pdf_file_path, trusted_fingerprints, use_mmap, tier=VERIFY_TIER_FULL,
+                         validation_context=None):
+    """
+    Verification behind `verify_pdf_trusted()`, without caching.
+    """
+    report = new_report(pdf_file_path)
+    report["tier"] = tier
+    try:
+        with open_pdf_input(pdf_file_path, use_mmap) as f:
+            return _check_pdf_stream(f, trusted_fingerprints, report, tier, validation_context)
+    except Exception as e:
+        logging.error(f"Verification failed: {e}", exc_info=True)
+        report["error"] = str(e)
+        return report
+
+
+def _check_pdf_stream(pdf_stream, trusted_fingerprints, report, tier, validation_context):
+    """
+    Validate the first signature of an open document and fill in `report`.
+
+    Raises:
+        SuspiciousModification: If the full tier found modifications after signing.
+    """
+    embedded_sig = _first_trusted_signature(PdfFileReader(pdf_stream), trusted_fingerprints, report)
+    if embedded_sig is None:
+        return report
+    try:
+        _prime_signature_digest(embedded_sig)
+        validation_result = validate_pdf_signature(
+            embedded_sig, **_validation_kwargs(tier, validation_context)
+        )
+    except Exception as e:
+        logging.debug("Signature failed cryptographic validation.")
+        report["error"] = f"Signature failed cryptographic validation: {e}"
+        return report
+    return _apply_validation_result(report, validation_result, tier)
+
+
+def verify_pdf_bytes_report(data, public_key, tier=VERIFY_TIER_FULL, validation_context=None, name="-"):
+    """
+    Verify the digital signature of an in-memory PDF, e.g. one read from a pipe.
+
+    Args:
+        data (bytes): The signed PDF document.
+        public_key (Crypto.PublicKey.RSA.RsaKey or Crypto.PublicKey.ECC.EccKey): Public key to compare with the signer's certificate.
+        tier (str): Verification tier, see `verify_pdf_report()`.
+        validation_context (pyhanko_certvalidator.ValidationContext or None): Context reused
+            across verifications, defaults to `get_validation_context()`.
+        name (str): Value of the report's `path` key.
+
+    Returns:
+        dict: Verification report as from `verify_pdf_report()`.
+
+    Raises:
+        ValueError: If the tier is unknown.
+    """
+    if tier not in VERIFY_TIERS:
+        raise ValueError(f"Unknown verification tier: {tier}")
+    report = new_report(name)
+    report["tier"] = tier
+    try:
+        return _check_pdf_stream(
+            io.BytesIO(data), {public_key_fingerprint(public_key)}, report, tier, validation_context
+        )
+    except Exception as e:
+        logging.error(f"Verification failed: {e}", exc_info=True)
+        report["error"] = str(e)
+        return report
+
+
+def verify_pdf(pdf_file_path, public_key, use_mmap=True, cache=None, tier=VERIFY_TIER_FULL,
+               validation_context=None):
     """
     Verify the digital signature of a signed PDF against a provided public key.
 
     Args:
         pdf_file_path (str): Path to the signed PDF file.
-        public_key (Crypto.PublicKey.RSA.RsaKey): RSA public key to compare with the signer's certificate.
+        public_key (Crypto.PublicKey.RSA.RsaKey or Crypto.PublicKey.ECC.EccKey): Public key to compare with the signer's certificate.
+        use_mmap (bool): Read the PDF through a memory mapping, see `open_pdf_input()`.
+        cache (verify_cache.VerificationCache or None): Cache of earlier verdicts, see `verify_pdf_report()`.
+        tier (str): Verification tier, see `verify_pdf_report()`.
+        validation_context (pyhanko_certvalidator.ValidationContext or None): Context reused
+            across verifications, defaults to `get_validation_context()`.
 
     Returns:
         bool: True if the signature is cryptographically valid and matches the provided public key, False otherwise.
@@ -251,63 +759,389 @@ def verify_pdf(pdf_file_path, public_key):
 
     Notes:
         - The function compares SHA-256 hashes of the provided public key to hash from the certificate.
-        - Requires the PDF to have exactly one embedded signature.
+        - Details of the verification are available from `verify_pdf_report()`.
     """
 
     logging.debug("verify_pdf")
+    return verify_pdf_report(pdf_file_path, public_key, use_mmap, cache, tier, validation_context)["verified"]
+
+def _prime_signature_digest(embedded_sig):
+    """
+    Hash the signed byte range with hashlib in large chunks and hand the digest to pyhanko.
+
+    pyhanko hashes in 4 KiB chunks from Python, which holds the GIL for most of
+    the time; hashlib releases it for large buffers, so signatures checked on
+    several threads are hashed in parallel. Algorithms hashlib does not know
+    are left to pyhanko.
+
+    Args:
+        embedded_sig (pyhanko.sign.validation.EmbeddedPdfSignature): Signature about to be validated.
+    """
+    md_algorithm = embedded_sig.external_md_algorithm
+    if md_algorithm in embedded_sig.external_digests:
+        return
     try:
-        with open(pdf_file_path, "rb") as f:
-            reader = PdfFileReader(f)
-            if len(reader.embedded_signatures) == 0:
-                logging.debug("No signatures found.")
-                return False
-            
-            # validate signature
-            try:
-                embedded_sig = reader.embedded_signatures[0]
-                validation_result = validate_pdf_signature(embedded_sig)
-                if not (validation_result.intact and validation_result.valid):
-                    logging.debug("Signature failed cryptographic validation.")
-                    return False
-            except Exception as e:
-                    logging.debug("Signature failed cryptographic validation.")
-                    return False
+        digest = hashlib.new(md_algorithm)
+    except ValueError:
+        return
+    stream = embedded_sig.reader.stream
+    byte_range = [int(x) for x in embedded_sig.byte_range]
+    for offset, length in zip(byte_range[::2], byte_range[1::2]):
+        _hash_range(stream, digest, offset, length)
+    embedded_sig.external_digests[md_algorithm] = digest.digest()
+
+
+def _hash_range(stream, digest, offset, length):
+    """
+    Feed `length` bytes of `stream` from `offset` on into `digest`.
+    """
+    stream.seek(offset)
+    while length > 0:
+        chunk = stream.read(min(HASH_CHUNK_SIZE, length))
+        if not chunk:
+            break
+        digest.update(chunk)
+        length -= len(chunk)
+
 
-            if validation_result.modification_level != ModificationLevel.NONE:
-                raise SuspiciousModification(
-                    f"Suspicious modifications found: {validation_result.modification_level.name}"
+def _prime_signature_digests(embedded_signatures):
+    """
+    Hash the signed byte ranges of all signatures of a document in one pass.
+
+    Signatures made by incremental updates cover nested prefixes of the file:
+    each byte range is `[0, a)` and `[b, c)` around the signature's own
+    `/Contents`. One running hash is taken over the file and forked with
+    `copy()` at every `a`, so the shared prefix is read and hashed once; only
+    the short `[b, c)` ranges are hashed per signature. Other byte ranges are
+    hashed as in `_prime_signature_digest()`.
+
+    Args:
+        embedded_signatures (list of EmbeddedPdfSignature): Signatures of one reader.
+    """
+    nested = {}
+    for embedded_sig in embedded_signatures:
+        md_algorithm = embedded_sig.external_md_algorithm
+        byte_range = [int(x) for x in embedded_sig.byte_range]
+        if md_algorithm in embedded_sig.external_digests or md_algorithm not in hashlib.algorithms_available:
+            continue
+        if len(byte_range) != 4 or byte_range[0] != 0:
+            _prime_signature_digest(embedded_sig)
+            continue
+        nested.setdefault(md_algorithm, []).append((byte_range, embedded_sig))
+
+    for md_algorithm, items in nested.items():
+        running = hashlib.new(md_algorithm)
+        position = 0
+        for (_, prefix_length, offset, length), embedded_sig in sorted(items, key=lambda item: item[0][1]):
+            stream = embedded_sig.reader.stream
+            _hash_range(stream, running, position, prefix_length - position)
+            position = prefix_length
+            digest = running.copy()
+            _hash_range(stream, digest, offset, length)
+            embedded_sig.external_digests[md_algorithm] = digest.digest()
+
+
+def _check_signature(embedded_sig, validation_context=None):
+    """
+    Validate one embedded signature, including the diff analysis of later revisions.
+
+    Args:
+        embedded_sig (pyhanko.sign.validation.EmbeddedPdfSignature): Signature to check.
+        validation_context (pyhanko_certvalidator.ValidationContext or None): Context reused
+            across verifications, defaults to `get_validation_context()`.
+
+    Returns:
+        dict: Per-signature result with keys:
+            - field (str): Name of the signature field.
+            - revision (int): Index of the signed revision.
+            - byte_range (list of int): Signed `/ByteRange`.
+            - digest (str or None): Hex digest of the signed byte range.
+            - intact, valid, modification_level, signer_fingerprint, error:
+              as in `verify_pdf_report()`.
+    """
+    entry = {
+        "field": embedded_sig.field_name,
+        "revision": embedded_sig.signed_revision,
+        "byte_range": [int(x) for x in embedded_sig.byte_range],
+        "digest": None,
+        "intact": None,
+        "valid": None,
+        "modification_level": None,
+        "signer_fingerprint": None,
+        "error": None,
+    }
+    try:
+        _prime_signature_digest(embedded_sig)
+        validation_result = validate_pdf_signature(
+            embedded_sig, signer_validation_context=validation_context or get_validation_context()
+        )
+    except Exception as e:
+        logging.debug(f"Signature {entry['field']} failed cryptographic validation.")
+        entry["error"] = f"Signature failed cryptographic validation: {e}"
+        return entry
+
+    entry["digest"] = embedded_sig.compute_digest().hex()
+    entry["intact"] = validation_result.intact
+    entry["valid"] = validation_result.valid
+    if validation_result.modification_level is not None:
+        entry["modification_level"] = validation_result.modification_level.name
+    if not (validation_result.intact and validation_result.valid):
+        logging.debug(f"Signature {entry['field']} failed cryptographic validation.")
+        entry["error"] = "Signature failed cryptographic validation"
+        return entry
+    entry["signer_fingerprint"] = public_key_fingerprint(embedded_sig.signer_cert.public_key)
+    return entry
+
+
+def _review_revisions(reader, embedded_sig, first_revision):
+    """
+    Run the diff analysis of a signature over the revisions from `first_revision` on.
+
+    Args:
+        reader (PdfFileReader): Reader of the whole document.
+        embedded_sig (pyhanko.sign.validation.EmbeddedPdfSignature): Already validated signature.
+        first_revision (int): Index of the first revision not reviewed yet.
+
+    Returns:
+        ModificationLevel: Highest modification level of the reviewed revisions,
+        `ModificationLevel.OTHER` if a revision is suspicious.
+    """
+    signed_revision = reader.get_historical_resolver(embedded_sig.signed_revision)
+    level = ModificationLevel.NONE
+    for revision in range(first_revision, reader.xrefs.total_revisions):
+        try:
+            diff_result = DEFAULT_DIFF_POLICY.apply(
+                old=signed_revision,
+                new=reader.get_historical_resolver(revision),
+                field_mdp_spec=embedded_sig.fieldmdp,
+                doc_mdp=embedded_sig.docmdp_level,
             )
+        except SuspiciousModification as e:
+            logging.debug(f"Suspicious modification in revision {revision}: {e}")
+            return ModificationLevel.OTHER
+        level = max(level, diff_result.modification_level)
+    return level
 
-            # get key from certificate
-            signer_cert = embedded_sig.signer_cert
-            document_key = signer_cert.public_key
-            cert_der = document_key.dump()
 
-            # validate signature
-            provided_pubkey_der = public_key.export_key(format="DER")  # PyCryptodome key
+def _summarize_signatures(report, signatures, key_fingerprint):
+    """
+    Fill in a document report from per-signature results.
 
-            # Hash
-            cert_pubkey_hash = sha256(cert_der).digest()
-            public_key_hash = sha256(provided_pubkey_der).digest()
+    The document is verified if every signature is intact and valid, nothing but
+    form filling (e.g. adding the next signature) happened after each of them,
+    nothing at all was appended after the most recent one, and at least one
+    signature was made with the trusted key. For a document with one signature
+    this is the same as `verify_pdf_report()`.
 
-            res = cert_pubkey_hash  == public_key_hash
+    Args:
+        report (dict): Report to fill in, see `verify_pdf_report()`.
+        signatures (list of dict): Per-signature results, see `_check_signature()`.
+        key_fingerprint (str): Fingerprint of the trusted public key.
 
-            if res:
-                logging.debug("Signature is valid and public key matches.")
-                return True
-            else:
-                logging.debug(f"Signature valid, but public key does not match. Reason: {validation_result.summary()}")
-                return False
+    Returns:
+        dict: `report` with a `signatures` list added; each signature gets a `key_match` flag.
+    """
+    report["signatures"] = signatures
+    if not signatures:
+        report["error"] = NO_SIGNATURES_ERROR
+        return report
+    report["signed"] = True
+    for signature in signatures:
+        signature["key_match"] = signature["signer_fingerprint"] == key_fingerprint
+    latest = max(signatures, key=lambda signature: signature["revision"])
+    matching = [signature for signature in signatures if signature["key_match"]]
+    report["intact"] = all(signature["intact"] for signature in signatures)
+    report["valid"] = all(signature["valid"] for signature in signatures)
+    report["modification_level"] = latest["modification_level"]
+    report["signer_fingerprint"] = (matching[0] if matching else latest)["signer_fingerprint"]
+    report["key_match"] = bool(matching)
+
+    failed = next((signature for signature in signatures if signature["error"]), None)
+    if failed is not None:
+        report["error"] = failed["error"]
+    elif latest["modification_level"] != ModificationLevel.NONE.name or any(
+        ModificationLevel[signature["modification_level"]] > ModificationLevel.FORM_FILLING
+        for signature in signatures
+    ):
+        report["error"] = f"Suspicious modifications found: {latest['modification_level']}"
+    elif not matching:
+        report["error"] = "Public key does not match"
+    else:
+        report["verified"] = True
+    return report
+
+
+def verify_all_signatures(pdf_file_path, public_key, use_mmap=True, validation_context=None):
+    """
+    Verify every embedded signature of a PDF.
+
+    The document is parsed once and all signatures are validated on the same
+    reader, sharing its parsed objects. Their byte range digests are computed
+    in a single pass over the file, see `_prime_signature_digests()`, so a
+    document with several signatures is read and hashed about once instead
+    of once per signature.
+
+    Args:
+        pdf_file_path (str): Path to the signed PDF file.
+        public_key (Crypto.PublicKey.RSA.RsaKey or Crypto.PublicKey.ECC.EccKey): Trusted public key.
+        use_mmap (bool): Read the PDF through a memory mapping, see `open_pdf_input()`.
+        validation_context (pyhanko_certvalidator.ValidationContext or None): Context reused
+            across verifications, defaults to `get_validation_context()`.
+
+    Returns:
+        dict: Report as from `verify_pdf_report()` with the document verdict from
+        `_summarize_signatures()` and a `signatures` list of per-signature
+        results, see `_check_signature()`, in field order.
+    """
+    report = new_report(pdf_file_path)
+    report["signatures"] = []
+    validation_context = validation_context or get_validation_context()
+    try:
+        with open_pdf_input(pdf_file_path, use_mmap) as f:
+            embedded_signatures = PdfFileReader(f).embedded_signatures
+            _prime_signature_digests(embedded_signatures)
+            signatures = [
+                _check_signature(embedded_sig, validation_context) for embedded_sig in embedded_signatures
+            ]
     except Exception as e:
         logging.error(f"Verification failed: {e}", exc_info=True)
-        return False
+        report["error"] = str(e)
+        return report
+    return _summarize_signatures(report, signatures, public_key_fingerprint(public_key))
+
+
+def _prefix_digests(stream, offsets):
+    """
+    Hash a stream once, returning the SHA-256 of each requested prefix.
+
+    Args:
+        stream: Seekable binary stream.
+        offsets (iterable of int): Prefix lengths.
+
+    Returns:
+        dict: Hex digest by prefix length.
+    """
+    digests = {}
+    digest = sha256()
+    position = 0
+    stream.seek(0)
+    for offset in sorted(set(offsets)):
+        while position < offset:
+            chunk = stream.read(min(HASH_CHUNK_SIZE, offset - position))
+            if not chunk:
+                break
+            digest.update(chunk)
+            position += len(chunk)
+        digests[offset] = digest.hexdigest()
+    return digests
+
+
+def verify_pdf_incremental(pdf_file_path, public_key, cache, use_mmap=True, validation_context=None):
+    """
+    Verify every signature of a PDF, re-validating only what was appended since the last check.
+
+    The cache keeps the size, revision count and SHA-256 of the file together
+    with a result per signature (revision, byte range, digest, verdict). If the
+    file still starts with the bytes that were checked last time, signatures
+    from then are not validated again: only the revisions appended since are
+    run through the diff analysis against them, and only new signatures get a
+    full cryptographic validation. Otherwise the whole document is verified.
+
+    Args:
+        pdf_file_path (str): Path to the signed PDF file.
+        public_key (Crypto.PublicKey.RSA.RsaKey or Crypto.PublicKey.ECC.EccKey): Trusted public key.
+        cache (verify_cache.VerificationCache): Store of per-revision results.
+        use_mmap (bool): Read the PDF through a memory mapping, see `open_pdf_input()`.
+        validation_context (pyhanko_certvalidator.ValidationContext or None): Context reused
+            across verifications, defaults to `get_validation_context()`.
+
+    Returns:
+        dict: Report as from `verify_pdf_report()`, with the document verdict from
+        `_summarize_signatures()` and additional keys:
+            - signatures (list of dict): Per-signature results, see `_check_signature()`.
+            - revisions (int): Number of revisions in the document.
+            - validated_signatures (int): Signatures validated by this call, the rest were reused.
+
+    Side Effects:
+        - Updates the per-revision results in `cache`.
+    """
+    key_fingerprint = public_key_fingerprint(public_key)
+    report = new_report(pdf_file_path)
+    report["signatures"] = []
+    report["revisions"] = 0
+    report["validated_signatures"] = 0
+    try:
+        state = cache.get_revisions(pdf_file_path, key_fingerprint)
+    except (OSError, sqlite3.Error) as e:
+        logging.error(f"Verification cache lookup failed: {e}")
+        state = None
+
+    try:
+        with open_pdf_input(pdf_file_path, use_mmap) as f:
+            length = f.seek(0, io.SEEK_END)
+            checked_length = state["length"] if state and state["length"] <= length else 0
+            digests = _prefix_digests(f, (checked_length, length))
+            if state is not None and digests[checked_length] != state["digest"]:
+                logging.debug("File changed before the last checked revision, verifying from scratch.")
+                state = None
+            f.seek(0)
+
+            reader = PdfFileReader(f)
+            report["revisions"] = reader.xrefs.total_revisions
+            known = {}
+            first_new_revision = 0
+            if state is not None:
+                first_new_revision = state["revisions"]
+                for signature in state["signatures"]:
+                    known[(signature["revision"], tuple(signature["byte_range"]))] = signature
+
+            signatures = []
+            for embedded_sig in reader.embedded_signatures:
+                key = (embedded_sig.signed_revision, tuple(int(x) for x in embedded_sig.byte_range))
+                signature = known.get(key)
+                if signature is None:
+                    signature = _check_signature(embedded_sig, validation_context)
+                    report["validated_signatures"] += 1
+                elif (
+                    signature["error"] is None
+                    and signature["modification_level"] != ModificationLevel.OTHER.name
+                    and first_new_revision < report["revisions"]
+                ):
+                    level = max(
+                        ModificationLevel[signature["modification_level"]],
+                        _review_revisions(reader, embedded_sig, first_new_revision),
+                    )
+                    signature["modification_level"] = level.name
+                signatures.append(signature)
+    except Exception as e:
+        logging.error(f"Verification failed: {e}", exc_info=True)
+        report["error"] = str(e)
+        return report
+
+    try:
+        cache.put_revisions(
+            pdf_file_path, key_fingerprint, length, report["revisions"], digests[length], signatures
+        )
+    except (OSError, sqlite3.Error) as e:
+        logging.error(f"Verification cache update failed: {e}")
+    return _summarize_signatures(report, signatures, key_fingerprint)
+
+
+def _cert_hash_algorithm(private_key):
+    """
+    Hash algorithm for signing a certificate, Ed25519 does not take one.
+    """
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return None
+    return hashes.SHA256()
+
 
 def create_cert(private_key, save=False):
     """
-    Generate a self-signed X.509 certificate using the provided RSA private key.
+    Generate a self-signed X.509 certificate using the provided private key.
 
     Args:
-        private_key (rsa.RSAPrivateKey): The private key to sign the certificate.
+        private_key (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey or ed25519.Ed25519PrivateKey): The private key to sign the certificate.
         save (bool): If True, saves the certificate to a file named 'rsa_cert.pem'.
 
     Returns:
@@ -341,7 +1175,7 @@ def create_cert(private_key, save=False):
         .public_key(public_key)
         .serial_number(x509.random_serial_number())
         .not_valid_before(datetime.now())
-        .not_valid_after(datetime.now() + timedelta(days=365))
+        .not_valid_after(datetime.now() + timedelta(days=CERT_VALIDITY_DAYS))
         .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
         .add_extension(
             x509.KeyUsage(
@@ -356,7 +1190,7 @@ def create_cert(private_key, save=False):
                 decipher_only=False,
             ),
             critical=True,
-        ).sign(private_key, hashes.SHA256())
+        ).sign(private_key, _cert_hash_algorithm(private_key))
     )
     if save:
         with open("rsa_cert.pem", "wb") as f:
@@ -364,118 +1198,867 @@ def create_cert(private_key, save=False):
     return cert
 
 
+def cert_path_for_key(private_key_path):
+    """
+    Path of the cached signing certificate stored next to a private key file.
+
+    Args:
+        private_key_path (str): Path to the encrypted private key file.
+
+    Returns:
+        str: Path with `_cert.pem` suffix, e.g. `key.pem` -> `key_cert.pem`.
+    """
+    return os.path.splitext(private_key_path)[0] + "_cert.pem"
+
+
+def _cert_needs_renewal(cert):
+    """
+    Check if a certificate is expired or close to its expiry date.
+
+    Args:
+        cert (x509.Certificate): Certificate to check.
+
+    Returns:
+        bool: True if the certificate expires within `CERT_RENEW_BEFORE`.
+    """
+    not_after = cert.not_valid_after_utc
+    return not_after - CERT_RENEW_BEFORE <= datetime.now(timezone.utc)
+
+
+def _load_cached_cert(cert_path, fingerprint):
+    """
+    Load a signing certificate from disk if it belongs to the given key.
+
+    Args:
+        cert_path (str): Path to the PEM certificate.
+        fingerprint (str): Expected public key fingerprint.
+
+    Returns:
+        x509.Certificate or None: Certificate, None if missing, unreadable or issued for another key.
+    """
+    try:
+        with open(cert_path, "rb") as f:
+            cert = x509.load_pem_x509_certificate(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logging.error(f"Failed to load cached certificate: {e}")
+        return None
+    if public_key_fingerprint(cert.public_key()) != fingerprint:
+        logging.debug(f"Cached certificate {cert_path} belongs to another key")
+        return None
+    return cert
+
+
+def _save_cert(cert, cert_path):
+    """
+    Atomically write a certificate in PEM format.
+
+    Args:
+        cert (x509.Certificate): Certificate to save.
+        cert_path (str): Output path.
+    """
+    tmp_path = f"{cert_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(cert.public_bytes(serialization.Encoding.PEM))
+        os.replace(tmp_path, cert_path)
+    except OSError as e:
+        logging.error(f"Failed to save certificate: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def get_signing_cert(private_key, cert_path=None):
+    """
+    Return the signing certificate for a key, creating it only when needed.
+
+    Certificates are cached in memory by public key fingerprint and, if
+    `cert_path` is given, in a PEM file. A new certificate is issued with
+    `create_cert()` only if none is cached or the cached one expires within
+    `CERT_RENEW_BEFORE`, so signing usually costs a single private key operation.
+
+    Args:
+        private_key (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey or ed25519.Ed25519PrivateKey): The private key the certificate is issued for.
+        cert_path (str or None): Optional PEM file used as a persistent cache,
+            see `cert_path_for_key()`.
+
+    Returns:
+        x509.Certificate: A valid self-signed X.509 certificate for `private_key`.
+
+    Side Effects:
+        - May write the certificate to `cert_path`.
+    """
+    fingerprint = public_key_fingerprint(private_key.public_key())
+    cert = _cert_cache.get(fingerprint)
+    if cert is None and cert_path:
+        cert = _load_cached_cert(cert_path, fingerprint)
+    if cert is None or _cert_needs_renewal(cert):
+        logging.debug("Issuing new signing certificate")
+        cert = create_cert(private_key)
+        if cert_path:
+            _save_cert(cert, cert_path)
+    _cert_cache[fingerprint] = cert
+    return cert
+
+
+def load_trust_roots(cert_paths=()):
+    """
+    Collect the self-signed signing certificates to trust when validating signatures.
+
+    Args:
+        cert_paths (iterable of str): PEM or DER certificate files, e.g. from
+            `cert_path_for_key()`; unreadable files are logged and skipped.
+
+    Returns:
+        list of asn1crypto.x509.Certificate: Certificates from the files and every
+        certificate issued or loaded by `get_signing_cert()` in this process.
+    """
+    roots = [
+        asn1x509.Certificate.load(cert.public_bytes(serialization.Encoding.DER))
+        for cert in _cert_cache.values()
+    ]
+    for cert_path in cert_paths:
+        try:
+            with open(cert_path, "rb") as f:
+                data = f.read()
+            if pem.detect(data):
+                roots.extend(asn1x509.Certificate.load(der) for _, _, der in pem.unarmor(data, multiple=True))
+            else:
+                roots.append(asn1x509.Certificate.load(data))
+        except (OSError, ValueError) as e:
+            logging.error(f"Failed to load trusted certificate {cert_path}: {e}")
+    return roots
+
+
+def create_validation_context(cert_paths=()):
+    """
+    Build a validation context trusting our signing certificates.
+
+    The context only knows the given trust roots, so building it does not
+    load the operating system's trust store, and it never fetches revocation
+    information over the network. It remembers validated certificate paths,
+    so reusing it across documents signed by the same keys skips path
+    building after the first one.
+
+    Args:
+        cert_paths (iterable of str): Extra certificate files, see `load_trust_roots()`.
+
+    Returns:
+        pyhanko_certvalidator.ValidationContext: New context, validating at the current time.
+    """
+    return ValidationContext(
+        trust_roots=load_trust_roots(cert_paths), allow_fetching=False, revocation_mode="soft-fail"
+    )
+
+
+def get_validation_context():
+    """
+    Return the validation context shared by all verifications in this process.
+
+    The context is built on first use with `create_validation_context()` and
+    rebuilt when it is older than `VALIDATION_CONTEXT_MAX_AGE` (it validates
+    at the time it was built) or when `get_signing_cert()` has issued or
+    loaded certificates since.
+
+    Returns:
+        pyhanko_certvalidator.ValidationContext: Shared context.
+    """
+    global _validation_context
+    certs = frozenset(cert.fingerprint(hashes.SHA256()) for cert in _cert_cache.values())
+    now = datetime.now(timezone.utc)
+    with _validation_context_lock:
+        if _validation_context is not None:
+            context, created, known_certs = _validation_context
+            if now - created < VALIDATION_CONTEXT_MAX_AGE and known_certs == certs:
+                return context
+        context = create_validation_context()
+        _validation_context = (context, now, certs)
+        return context
+
+
+SIGN_MODE_APPEND = "append"
+SIGN_MODE_ATOMIC = "atomic"
+STAMP_TEXT = "PDF was signed by user A\nSigned by: %(signer)s\nTime: %(ts)s"
+SIGNATURE_FIELD = fields.SigFieldSpec("Signature", box=(200, 600, 400, 660))
+
+
+class _LoadedKeySigner(signers.SimpleSigner):
+    """
+    `SimpleSigner` that signs with an already loaded `cryptography` key.
+
+    pyhanko's `SimpleSigner` reloads the key from DER for every signature,
+    which for RSA includes a full key consistency check.
+
+    Args:
+        private_key: Loaded private key, see `PRIVATE_KEY_TYPES`.
+        **kwargs: Passed to `signers.SimpleSigner`.
+    """
+
+    def __init__(self, private_key, **kwargs):
+        super().__init__(**kwargs)
+        self.private_key = private_key
+
+    def sign_raw(self, data, digest_algorithm):
+        signature_mechanism = self.get_signature_mechanism_for_digest(digest_algorithm)
+        try:
+            mechanism = signature_mechanism.signature_algo
+        except ValueError:
+            mechanism = signature_mechanism["algorithm"].native
+        if mechanism == "rsassa_pkcs1v15":
+            return self.private_key.sign(data, PKCS1v15(), get_pyca_cryptography_hash(digest_algorithm))
+        if mechanism == "ecdsa":
+            return self.private_key.sign(data, ec.ECDSA(get_pyca_cryptography_hash(digest_algorithm)))
+        if mechanism == "ed25519":
+            return self.private_key.sign(data)
+        return super().sign_raw(data, digest_algorithm)
+
+
+def create_pdf_signer(signer):
+    """
+    Build the pyhanko PDF signer with this application's signature field and stamp.
+
+    Args:
+        signer (signers.Signer): CMS signer, e.g. one holding the key or a
+            `signers.ExternalSigner` for deferred signing.
+
+    Returns:
+        signers.PdfSigner: PDF signer for `SIGNATURE_FIELD`.
+    """
+    meta = signers.PdfSignatureMetadata(field_name=SIGNATURE_FIELD.sig_field_name)
+    return signers.PdfSigner(meta, signer=signer, stamp_style=CachedTextStampStyle(stamp_text=STAMP_TEXT))
+
+
+async def async_estimate_signature_size(pdf_signer):
+    """
+    Number of bytes to reserve for the signature container of documents signed by `pdf_signer`.
+
+    Without an explicit size pyhanko estimates it before every signature by
+    building a dummy CMS object, which for key-holding signers includes a
+    real private key operation. The estimate only depends on the signer,
+    so it is computed once here the same way, with pyhanko's error margin.
+
+    Args:
+        pdf_signer (signers.PdfSigner): PDF signer, see `create_pdf_signer()`.
+
+    Returns:
+        int or None: `bytes_reserved` for pyhanko, None if no digest algorithm can
+        be chosen without a document and pyhanko has to estimate per document.
+    """
+    md_algorithm = pdf_signer.default_md_for_signer
+    if md_algorithm is None and pdf_signer.signer.signing_cert is not None:
+        # same fallback as pyhanko's digest selection for a new signature field
+        md_algorithm = select_suitable_signing_md(pdf_signer.signer.signing_cert.public_key)
+    if md_algorithm is None:
+        return None
+    signature_meta = pdf_signer.signature_meta
+    test_signature_cms = await pdf_signer.signer.async_sign(
+        hashes.Hash(get_pyca_cryptography_hash(md_algorithm)).finalize(),
+        md_algorithm,
+        use_pades=(signature_meta.subfilter or SigSeedSubFilter.PADES) == SigSeedSubFilter.PADES,
+        dry_run=True,
+        signed_attr_settings=PdfCMSSignedAttributes(
+            signing_time=datetime.now(timezone.utc), cades_signed_attrs=signature_meta.cades_signed_attr_spec,
+        ),
+    )
+    # hex encoded in the PDF, plus pyhanko's 50% margin
+    test_len = len(test_signature_cms.dump()) * 2
+    return test_len + 2 * (test_len // 4)
+
+
+def estimate_signature_size(pdf_signer):
+    """
+    Synchronous variant of `async_estimate_signature_size()`.
+    """
+    return asyncio.run(async_estimate_signature_size(pdf_signer))
+
+
+def prepare_signature_writer(pdf_stream, require_unsigned=False):
+    """
+    Parse a PDF and add the signature field to a new incremental update.
+
+    Args:
+        pdf_stream (io.IOBase): Seekable stream with the PDF document.
+        require_unsigned (bool): If True, PDFs that already contain a signature are rejected.
+
+    Returns:
+        IncrementalPdfFileWriter or None: Writer ready for signing, None if the PDF is already signed.
+    """
+    w = IncrementalPdfFileWriter(pdf_stream)
+    if require_unsigned and has_signatures(w.prev):
+        logging.error("PDF is signed")
+        return None
+    fields.append_signature_field(w, sig_field_spec=SIGNATURE_FIELD)
+    return w
+
+
+def _signing_failed(message, raise_errors, error_type=ValueError):
+    """
+    Report why a document cannot be signed.
+
+    Args:
+        message (str): Reason of failure.
+        raise_errors (bool): Raise `error_type` with `message` instead of logging it.
+        error_type (type): Exception class raised if `raise_errors` is True.
+
+    Returns:
+        bool: False
+    """
+    if raise_errors:
+        raise error_type(message)
+    logging.error(message)
+    return False
+
+
+class SigningSession:
+    """
+    Signing state prepared once for a certificate and key pair.
+
+    Converting the `cryptography` certificate and key to their asn1crypto
+    counterparts and building the pyhanko signer, metadata and stamp style is
+    done in the constructor, so any number of documents can then be signed
+    without repeating that work.
+
+    Args:
+        cert (x509.Certificate): The X.509 certificate used for signing.
+        key (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey or ed25519.Ed25519PrivateKey): The private key corresponding to the certificate.
+
+    Attributes:
+        signer (signers.SimpleSigner): pyhanko signer holding the converted certificate and key.
+        pdf_signer (signers.PdfSigner): pyhanko PDF signer reused for every document.
+        bytes_reserved (int or None): Signature container size, estimated on the first
+            signature and reused, see `estimate_signature_size()`.
+
+    Raises:
+        TypeError: If `cert` or `key` has an unsupported type.
+        ValueError: If the certificate or key cannot be converted.
+    """
+
+    def __init__(self, cert, key):
+        if not isinstance(cert, x509.Certificate):
+            raise TypeError(f"Invalid certificate type: {type(cert)}. Must be x509.Certificate.")
+        if not isinstance(key, PRIVATE_KEY_TYPES):
+            raise TypeError(
+                f"Invalid key type: {type(key)}. Must be RSAPrivateKey, EllipticCurvePrivateKey or Ed25519PrivateKey."
+            )
+        try:
+            cert_pem = cert.public_bytes(encoding=serialization.Encoding.PEM)
+            _, _, der_bytes = pem.unarmor(cert_pem)
+            asn1_crt = asn1x509.Certificate.load(der_bytes)
+        except Exception as e:
+            raise ValueError(f"Failed to convert certificate: {e}") from e
+        try:
+            key_pem = key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption(),
+            )
+            asn1_key = load_private_key_from_pemder_data(key_pem, None)
+        except Exception as e:
+            raise ValueError(f"Failed to convert private key: {e}") from e
+
+        self.signer = _LoadedKeySigner(
+            key,
+            signing_cert=asn1_crt,
+            signing_key=asn1_key,
+            cert_registry=SimpleCertificateStore(),
+        )
+        self.pdf_signer = create_pdf_signer(self.signer)
+        self.bytes_reserved = None
+
+    def sign_file(self, pdf_file_path, change_name=False, require_unsigned=False, mode=None, use_mmap=True,
+                  raise_errors=False):
+        """
+        Digitally sign a PDF file.
+
+        The file is parsed once; the optional "already signed" check runs on
+        the same parsed document that is then signed. Two output modes exist:
+
+        - `SIGN_MODE_APPEND`: only the incremental update is appended to the
+          end of the input file, the original bytes are never rewritten and
+          the file is truncated back to its original size if signing fails.
+        - `SIGN_MODE_ATOMIC`: the signed document is written to a temporary
+          file in the destination directory and renamed over the destination.
+          The input is read through a memory mapping unless `use_mmap` is False.
+
+        Args:
+            pdf_file_path (str): Path to the PDF file to be signed.
+            change_name (bool): If True, output file will be named with '_signed.pdf' suffix.
+            require_unsigned (bool): If True, PDFs that already contain a signature are not signed.
+            mode (str or None): `SIGN_MODE_APPEND` or `SIGN_MODE_ATOMIC`. Defaults to
+                `SIGN_MODE_ATOMIC` if `change_name` is True, `SIGN_MODE_APPEND` otherwise.
+            use_mmap (bool): Read the input through a memory mapping in `SIGN_MODE_ATOMIC`,
+                see `open_pdf_input()`.
+            raise_errors (bool): Raise the reason instead of logging it and returning False.
+
+        Side Effects:
+            - Writes a new signed PDF file to disk (updates input if `change_name` is False).
+            - Logs and suppresses exceptions during signing unless `raise_errors` is True.
+
+        Returns:
+            bool: information if PDF was signed
+
+        Raises:
+            ValueError: If `raise_errors` is True and the mode is invalid or the PDF is already signed.
+            Exception: If `raise_errors` is True, any error from reading, parsing or signing the PDF.
+        """
+        base, ext = os.path.splitext(pdf_file_path)
+        signed_pdf_path = f"{base}_signed{ext}" if change_name else pdf_file_path
+        if mode is None:
+            mode = SIGN_MODE_ATOMIC if change_name else SIGN_MODE_APPEND
+        if mode not in (SIGN_MODE_APPEND, SIGN_MODE_ATOMIC):
+            return _signing_failed(f"Invalid signing mode: {mode}", raise_errors)
+        if mode == SIGN_MODE_APPEND and change_name:
+            return _signing_failed("Append mode cannot write to a new file", raise_errors)
+        try:
+            if mode == SIGN_MODE_APPEND:
+                signed = self._sign_append(pdf_file_path, require_unsigned)
+            else:
+                signed = self._sign_atomic(pdf_file_path, signed_pdf_path, require_unsigned, use_mmap)
+        except Exception as e:
+            if raise_errors:
+                raise
+            logging.error(f"Failed to sign PDF: {e}", exc_info=True)
+            return False
+        if not signed and raise_errors:
+            raise ValueError("PDF is signed")
+        if signed:
+            logging.debug(f"Signed PDF written to {signed_pdf_path}")
+        return signed
+
+    def _bytes_reserved(self):
+        if self.bytes_reserved is None:
+            self.bytes_reserved = estimate_signature_size(self.pdf_signer)
+        return self.bytes_reserved
+
+    def sign_bytes(self, data, require_unsigned=False):
+        """
+        Sign an in-memory PDF without touching the filesystem.
+
+        Args:
+            data (bytes): The PDF document.
+            require_unsigned (bool): If True, PDFs that already contain a signature are not signed.
+
+        Returns:
+            bytes or None: The signed document, `data` followed by the incremental
+            update, or None if the PDF is already signed.
+        """
+        w = prepare_signature_writer(io.BytesIO(data), require_unsigned)
+        if w is None:
+            return None
+        output = io.BytesIO()
+        self.pdf_signer.sign_pdf(w, output=output, bytes_reserved=self._bytes_reserved())
+        return output.getvalue()
+
+    async def async_sign_bytes(self, data, require_unsigned=False):
+        """
+        Sign an in-memory PDF with pyhanko's asynchronous signing path.
+
+        Args:
+            data (bytes): The PDF document.
+            require_unsigned (bool): If True, PDFs that already contain a signature are not signed.
+
+        Returns:
+            bytes or None: The signed document, `data` followed by the incremental
+            update, or None if the PDF is already signed.
+        """
+        w = prepare_signature_writer(io.BytesIO(data), require_unsigned)
+        if w is None:
+            return None
+        output = io.BytesIO()
+        if self.bytes_reserved is None:
+            self.bytes_reserved = await async_estimate_signature_size(self.pdf_signer)
+        await self.pdf_signer.async_sign_pdf(w, output=output, bytes_reserved=self.bytes_reserved)
+        return output.getvalue()
+
+    def _sign_append(self, pdf_file_path, require_unsigned):
+        """
+        Sign a PDF by appending the incremental update to the file itself.
+
+        Returns:
+            bool: information if PDF was signed
+        """
+        with open(pdf_file_path, "r+b") as f:
+            w = prepare_signature_writer(f, require_unsigned)
+            if w is None:
+                return False
+            original_size = os.fstat(f.fileno()).st_size
+            try:
+                self.pdf_signer.sign_pdf(w, in_place=True, bytes_reserved=self._bytes_reserved())
+            except BaseException:
+                f.truncate(original_size)
+                raise
+        return True
+
+    def _sign_atomic(self, pdf_file_path, signed_pdf_path, require_unsigned, use_mmap):
+        """
+        Sign a PDF into a temporary file and rename it to `signed_pdf_path`.
+
+        Returns:
+            bool: information if PDF was signed
+        """
+        out_dir = os.path.dirname(os.path.abspath(signed_pdf_path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=out_dir)
+        try:
+            with os.fdopen(fd, "w+b") as out_f, open_pdf_input(pdf_file_path, use_mmap) as f:
+                w = prepare_signature_writer(f, require_unsigned)
+                if w is None:
+                    os.remove(tmp_path)
+                    return False
+                self.pdf_signer.sign_pdf(w, output=out_f, bytes_reserved=self._bytes_reserved())
+                out_f.flush()
+                os.fsync(out_f.fileno())
+            shutil.copymode(pdf_file_path, tmp_path)
+            os.replace(tmp_path, signed_pdf_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return True
+
+
 def sign_pdf(pdf_file_path, cert, key, change_name=False):
     """
-    Digitally sign a PDF using an X.509 certificate and RSA private key.
+    Digitally sign a PDF using an X.509 certificate and private key.
+
+    This is a one-off wrapper around `SigningSession`; create a session
+    directly to sign many documents with the same certificate and key.
 
     Args:
         pdf_file_path (str): Path to the PDF file to be signed.
         cert (x509.Certificate): The X.509 certificate used for signing.
-        key (rsa.RSAPrivateKey): The RSA private key corresponding to the certificate.
+        key (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey or ed25519.Ed25519PrivateKey): The private key corresponding to the certificate.
         change_name (bool): If True, output file will be named with '_signed.pdf' suffix.
 
     Side Effects:
-        - Writes a new signed PDF file to disk (overwrites input if `change_name` is False).
+        - Writes a new signed PDF file to disk (appends to input if `change_name` is False).
         - Logs and suppresses exceptions during signing.
 
     Returns:
         bool: information if PDF was signed
     """
     logging.debug("sign_pdf")
-    if not isinstance(cert, x509.Certificate):
-        logging.error(f"Invalid certificate type: {type(cert)}. Must be x509.Certificate.")
-        return False
-    if not isinstance(key, rsa.RSAPrivateKey):
-        logging.error(f"Invalid key type: {type(key)}. Must be RSAPrivateKey.")
-        return False
-    try:
-        cert_pem = cert.public_bytes(encoding=serialization.Encoding.PEM)
-        _, _, der_bytes = pem.unarmor(cert_pem)
-        asn1_crt = asn1x509.Certificate.load(der_bytes)
-    except Exception as e:
-        logging.error(f"Failed to convert certificate: {e}", exc_info=True)
-        return False
     try:
-        key_pem = key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption(),
-        )
-        asn1_key = load_private_key_from_pemder_data(key_pem, None)
-    except Exception as e:
-        logging.error(f"Failed to convert private key: {e}", exc_info=True)
+        session = SigningSession(cert, key)
+    except (TypeError, ValueError) as e:
+        logging.error(str(e), exc_info=isinstance(e, ValueError))
         return False
-    try:    
-        signer = signers.SimpleSigner(
-            signing_cert=asn1_crt,
-            signing_key=asn1_key,
-            cert_registry=SimpleCertificateStore(),
-        )
+    return session.sign_file(pdf_file_path, change_name)
 
-        base, ext = os.path.splitext(pdf_file_path)
-        signed_pdf_path = f"{base}_signed{ext}" if change_name else pdf_file_path
 
-        with open(pdf_file_path, "rb") as f:
-            pdf_bytes = f.read() 
+def has_signatures(reader):
+    """
+    Check if an already parsed PDF contains any signature.
+
+    Args:
+        reader (PdfFileReader): Parsed PDF document.
+
+    Returns:
+        bool: True if the PDF contains any signature.
+    """
+    return len(reader.embedded_signatures) > 0
 
-        pdf_stream = io.BytesIO(pdf_bytes)
-        w = IncrementalPdfFileWriter(pdf_stream)
-        fields.append_signature_field(
-            w, sig_field_spec=fields.SigFieldSpec("Signature", box=(200, 600, 400, 660))
-        )
-        meta = signers.PdfSignatureMetadata(field_name="Signature")
-        pdf_signer = signers.PdfSigner(meta, signer=signer, stamp_style=stamp.TextStampStyle(stamp_text="PDF was signed by user A\nSigned by: %(signer)s\nTime: %(ts)s",),)
 
-        with open(signed_pdf_path, "wb") as out_f:
-            pdf_signer.sign_pdf(w, output=out_f)
-        logging.debug(f"Signed PDF written to {signed_pdf_path}")
+def _probe_signed(pdf_file_path):
+    """
+    Run `probe_is_pdf_signed()`, treating any unexpected failure as an inconclusive probe.
+
+    Returns:
+        bool or None: Result of the probe, None if it is inconclusive or failed.
+    """
+    try:
+        return probe_is_pdf_signed(pdf_file_path)
     except Exception as e:
-        logging.error(f"Failed to sign PDF: {e}", exc_info=True)
-        return False
-    return True
+        logging.debug(f"Signature probe failed for {pdf_file_path}: {e}")
+        return None
 
 
-def verify_is_pdf_signed(pdf_file_path):
+def verify_is_pdf_signed(pdf_file_path, use_mmap=True, probe=True):
     """
     Check if chosen PDF is signed.
 
     Args:
         pdf_file_path (str): Path to the signed PDF file.
+        use_mmap (bool): Read the PDF through a memory mapping, see `open_pdf_input()`.
+        probe (bool): Try `pdf_probe.probe_is_pdf_signed()` first and parse the
+            whole document only if the probe is inconclusive.
 
     Returns:
         bool: True if the PDF contains any signature.
     """
+    if probe:
+        probed = _probe_signed(pdf_file_path)
+        if probed is not None:
+            return probed
     try:
-    
-        with open(pdf_file_path, "rb") as f:
+        with open_pdf_input(pdf_file_path, use_mmap) as f:
             reader = PdfFileReader(f)
-            logging.error(reader.embedded_signatures)
-            return len(reader.embedded_signatures) > 0
+            logging.debug(reader.embedded_signatures)
+            return has_signatures(reader)
     except Exception as e:
         logging.error(f"Failed to verify PDF signature: {e}", exc_info=True)
         return False
 
-def sign_pdf_full(pdf_file_path, key):
+def sign_pdf_full(pdf_file_path, key, session=None, cert_path=None, raise_errors=False):
     """
-    Create a certificate and use it to sign a PDF.
+    Get a certificate and use it to sign a PDF.
 
-    This function generates a self-signed certificate from the given RSA private key
-    and uses it to apply a digital signature to the specified PDF file.
+    This function takes the self-signed certificate for the given private key
+    from `get_signing_cert()` and uses it to apply a digital signature to the specified PDF file.
+    Already signed PDFs are rejected, usually by the cheap `probe_is_pdf_signed()`;
+    otherwise the document is read and parsed only once.
 
     Args:
         pdf_file_path (str): Path to the PDF file to be signed.
-        key (rsa.RSAPrivateKey): The RSA private key used for signing.
+        key (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey or ed25519.Ed25519PrivateKey): The private key used for signing.
+        session (SigningSession or None): Prepared session for `key`, reused instead
+            of getting a certificate and building a new signer.
+        cert_path (str or None): Optional certificate cache file, see `get_signing_cert()`.
+        raise_errors (bool): Raise the reason a document cannot be signed instead of
+            logging it and returning False, see `SigningSession.sign_file()`.
+
+    Returns:
+        bool: information if PDF was signed
 
     Side Effects:
         - Modifies the PDF file at `pdf_file_path` by adding a digital signature.
-        - Logs errors with PDF
+        - Logs errors with PDF unless `raise_errors` is True.
     """
     if not isinstance(pdf_file_path, str):
-        logging.error("pdf_file_path must be a string.")
+        return _signing_failed("pdf_file_path must be a string.", raise_errors, TypeError)
+    if _probe_signed(pdf_file_path):
+        return _signing_failed("PDF is signed", raise_errors)
+    if session is None:
+        cert = get_signing_cert(key, cert_path)
+        try:
+            session = SigningSession(cert, key)
+        except (TypeError, ValueError) as e:
+            if raise_errors:
+                raise
+            logging.error(str(e), exc_info=isinstance(e, ValueError))
+            return False
+    return session.sign_file(pdf_file_path, require_unsigned=True, raise_errors=raise_errors)
+
+
+# upper bound of in-flight async operations per event loop, see `_async_limit()`
+ASYNC_MAX_CONCURRENCY = 64
+_async_limits = weakref.WeakKeyDictionary()
+
+
+def _async_limit(limit=None):
+    """
+    Semaphore bounding concurrent async operations on the running event loop.
+
+    Args:
+        limit (asyncio.Semaphore or None): Caller's own semaphore, returned as is.
+
+    Returns:
+        asyncio.Semaphore: `limit`, or a shared one allowing `ASYNC_MAX_CONCURRENCY` operations.
+    """
+    if limit is not None:
+        return limit
+    loop = asyncio.get_running_loop()
+    shared = _async_limits.get(loop)
+    if shared is None:
+        shared = _async_limits[loop] = asyncio.Semaphore(ASYNC_MAX_CONCURRENCY)
+    return shared
+
+
+def _read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _append_update(pdf_file_path, original_size, update):
+    """
+    Append an incremental update to a file that must still have its original size.
+    """
+    with open(pdf_file_path, "r+b") as f:
+        if os.fstat(f.fileno()).st_size != original_size:
+            raise OSError(f"{pdf_file_path} changed while it was being signed")
+        f.seek(original_size)
+        f.write(update)
+
+
+def _write_file_atomic(path, data, mode_source):
+    """
+    Write `data` to a temporary file next to `path`, then rename it over `path`.
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(mode_source, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+async def _async_sign_file(session, pdf_file_path, change_name, require_unsigned):
+    """
+    Asynchronous counterpart of `SigningSession.sign_file()`.
+
+    File reads and writes run on the default executor, pyhanko signs in the
+    event loop. Signing in place appends the incremental update, signing into a
+    `_signed.pdf` file writes it atomically.
+    """
+    try:
+        data = await asyncio.to_thread(_read_file, pdf_file_path)
+        signed = await session.async_sign_bytes(data, require_unsigned)
+        if signed is None:
+            return False
+        if change_name:
+            base, ext = os.path.splitext(pdf_file_path)
+            await asyncio.to_thread(_write_file_atomic, f"{base}_signed{ext}", signed, pdf_file_path)
+        else:
+            await asyncio.to_thread(_append_update, pdf_file_path, len(data), signed[len(data):])
+    except Exception as e:
+        logging.error(f"Failed to sign PDF: {e}", exc_info=True)
         return False
-    if verify_is_pdf_signed(pdf_file_path):
-        logging.error("PDF is signed")
+    return True
+
+
+async def async_sign_pdf(pdf_file_path, cert, key, change_name=False, session=None, limit=None):
+    """
+    Asynchronous variant of `sign_pdf()`.
+
+    Args:
+        pdf_file_path (str): Path to the PDF file to be signed.
+        cert (x509.Certificate): The X.509 certificate used for signing.
+        key (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey or ed25519.Ed25519PrivateKey): The private key corresponding to the certificate.
+        change_name (bool): If True, output file will be named with '_signed.pdf' suffix.
+        session (SigningSession or None): Prepared session reused instead of building one from `cert` and `key`.
+        limit (asyncio.Semaphore or None): Bound on concurrent operations, see `_async_limit()`.
+
+    Side Effects:
+        - Writes a new signed PDF file to disk (appends to input if `change_name` is False).
+        - Logs and suppresses exceptions during signing.
+
+    Returns:
+        bool: information if PDF was signed
+    """
+    if session is None:
+        try:
+            session = SigningSession(cert, key)
+        except (TypeError, ValueError) as e:
+            logging.error(str(e), exc_info=isinstance(e, ValueError))
+            return False
+    async with _async_limit(limit):
+        return await _async_sign_file(session, pdf_file_path, change_name, require_unsigned=False)
+
+
+async def async_sign_pdf_full(pdf_file_path, key, session=None, cert_path=None, limit=None):
+    """
+    Asynchronous variant of `sign_pdf_full()`.
+
+    Args:
+        pdf_file_path (str): Path to the PDF file to be signed.
+        key (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey or ed25519.Ed25519PrivateKey): The private key used for signing.
+        session (SigningSession or None): Prepared session for `key`.
+        cert_path (str or None): Optional certificate cache file, see `get_signing_cert()`.
+        limit (asyncio.Semaphore or None): Bound on concurrent operations, see `_async_limit()`.
+
+    Returns:
+        bool: information if PDF was signed
+    """
+    if not isinstance(pdf_file_path, str):
+        logging.error("pdf_file_path must be a string.")
         return False
-    cert = create_cert(key)
-    is_signed = sign_pdf(pdf_file_path, cert, key)
-    return is_signed
+    async with _async_limit(limit):
+        if await asyncio.to_thread(_probe_signed, pdf_file_path):
+            logging.error("PDF is signed")
+            return False
+        if session is None:
+            cert = await asyncio.to_thread(get_signing_cert, key, cert_path)
+            try:
+                session = SigningSession(cert, key)
+            except (TypeError, ValueError) as e:
+                logging.error(str(e), exc_info=isinstance(e, ValueError))
+                return False
+        return await _async_sign_file(session, pdf_file_path, change_name=False, require_unsigned=True)
+
+
+async def async_verify_pdf_report(pdf_file_path, public_key, tier=VERIFY_TIER_FULL, validation_context=None,
+                                  limit=None):
+    """
+    Asynchronous variant of `verify_pdf_report()`, without caching.
+
+    The file is read on the default executor and validated with pyhanko's
+    `async_validate_pdf_signature()`.
+
+    Args:
+        pdf_file_path (str): Path to the signed PDF file.
+        public_key (Crypto.PublicKey.RSA.RsaKey or Crypto.PublicKey.ECC.EccKey): Public key to compare with the signer's certificate.
+        tier (str): Verification tier, see `verify_pdf_report()`.
+        validation_context (pyhanko_certvalidator.ValidationContext or None): Context reused
+            across verifications, defaults to `get_validation_context()`.
+        limit (asyncio.Semaphore or None): Bound on concurrent operations, see `_async_limit()`.
+
+    Returns:
+        dict: Verification report, see `verify_pdf_report()`.
+    """
+    if tier not in VERIFY_TIERS:
+        raise ValueError(f"Unknown verification tier: {tier}")
+    report = new_report(pdf_file_path)
+    report["tier"] = tier
+    async with _async_limit(limit):
+        try:
+            data = await asyncio.to_thread(_read_file, pdf_file_path)
+            embedded_sig = _first_trusted_signature(
+                PdfFileReader(io.BytesIO(data)), {public_key_fingerprint(public_key)}, report
+            )
+            if embedded_sig is None:
+                return report
+            try:
+                validation_result = await async_validate_pdf_signature(
+                    embedded_sig, **_validation_kwargs(tier, validation_context)
+                )
+            except Exception as e:
+                logging.debug("Signature failed cryptographic validation.")
+                report["error"] = f"Signature failed cryptographic validation: {e}"
+                return report
+            return _apply_validation_result(report, validation_result, tier)
+        except Exception as e:
+            logging.error(f"Verification failed: {e}", exc_info=True)
+            report["error"] = str(e)
+            return report
+
+
+async def async_verify_pdf(pdf_file_path, public_key, tier=VERIFY_TIER_FULL, validation_context=None, limit=None):
+    """
+    Asynchronous variant of `verify_pdf()`.
+
+    Returns:
+        bool: True if the signature is cryptographically valid and matches the provided public key, False otherwise.
+    """
+    report = await async_verify_pdf_report(pdf_file_path, public_key, tier, validation_context, limit)
+    return report["verified"]
+
+
+async def async_verify_is_pdf_signed(pdf_file_path, probe=True, limit=None):
+    """
+    Asynchronous variant of `verify_is_pdf_signed()`.
+
+    Args:
+        pdf_file_path (str): Path to the PDF file.
+        probe (bool): Try `pdf_probe.probe_is_pdf_signed()` first, on the default executor.
+        limit (asyncio.Semaphore or None): Bound on concurrent operations, see `_async_limit()`.
+
+    Returns:
+        bool: True if the PDF contains any signature.
+    """
+    async with _async_limit(limit):
+        if probe:
+            probed = await asyncio.to_thread(_probe_signed, pdf_file_path)
+            if probed is not None:
+                return probed
+        try:
+            data = await asyncio.to_thread(_read_file, pdf_file_path)
+            return has_signatures(PdfFileReader(io.BytesIO(data)))
+        except Exception as e:
+            logging.error(f"Failed to verify PDF signature: {e}", exc_info=True)
+            return False
@@ -0,0 +1,483 @@
+import os
+import sys
+import time
+import select
+import shutil
+import signal
+import struct
+import ctypes
+import ctypes.util
+import sqlite3
+import logging
+import argparse
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from cryptography.hazmat.primitives import serialization
+import functionality
+from batch import SignResult, MAX_CRASHES_PER_ITEM, serialize_key, init_sign_worker, sign_one
+from provision import resolve_pin
+
+logging.basicConfig(level=logging.INFO)
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+EVENT_BUFFER_SIZE = 64 * 1024
+# seconds without changes before a file is signed
+DEFAULT_SETTLE = 2.0
+# files tracked at once: waiting to settle, queued or being signed
+DEFAULT_QUEUE_SIZE = 256
+LEDGER_FILE_NAME = ".hot_folder.sqlite3"
+
+STATUS_SIGNED = "signed"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+_EVENT = struct.Struct("iIII")
+
+_LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    destination TEXT,
+    error TEXT,
+    updated REAL NOT NULL
+);
+"""
+
+
+class Inotify:
+    """
+    Minimal ctypes binding of Linux inotify(7).
+
+    Raises:
+        OSError: If inotify is not available.
+    """
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+        self._watches = {}
+
+    def fileno(self):
+        return self.fd
+
+    def add_watch(self, path, mask=WATCH_MASK):
+        """
+        Watch a directory.
+
+        Args:
+            path (str): Directory to watch.
+            mask (int): inotify event mask.
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        self._watches[wd] = path
+
+    def read_events(self):
+        """
+        Read the events available without blocking.
+
+        Returns:
+            list of tuple: (directory, mask, name) per event; `directory` is None
+            for queue overflow events.
+        """
+        try:
+            data = os.read(self.fd, EVENT_BUFFER_SIZE)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((self._watches.get(wd), mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class Ledger:
+    """
+    SQLite record of the files a hot folder has processed, kept across restarts.
+
+    A file is recorded as `STATUS_SIGNED` right after signing and as
+    `STATUS_DONE` or `STATUS_FAILED` once it was moved out of the input
+    folder, so a file signed just before a crash is moved on restart
+    instead of being signed again.
+
+    Args:
+        path (str): SQLite database file, created if missing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # used by the thread running `HotFolder.run()`, which may not be the one creating it
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_LEDGER_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def lookup(self, pdf_file_path, st):
+        """
+        Status of a file, if it is recorded with the same size and mtime.
+
+        Returns:
+            str or None: Recorded status, None if the file is unknown or changed since.
+        """
+        row = self._db.execute(
+            "SELECT status FROM files WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (os.path.abspath(pdf_file_path), st.st_size, st.st_mtime_ns),
+        ).fetchone()
+        return row[0] if row else None
+
+    def record(self, pdf_file_path, st, status, destination=None, error=None):
+        """
+        Record the status of a file as it was when `st` was taken.
+        """
+        self._db.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, status, destination, error, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (os.path.abspath(pdf_file_path), st.st_size, st.st_mtime_ns, status, destination, error, time.time()),
+        )
+
+
+def _unique_destination(directory, name):
+    """
+    Path for `name` in `directory` that does not overwrite an existing file.
+    """
+    base, ext = os.path.splitext(name)
+    destination = os.path.join(directory, name)
+    counter = 1
+    while os.path.exists(destination):
+        destination = os.path.join(directory, f"{base}_{counter}{ext}")
+        counter += 1
+    return destination
+
+
+def _is_candidate(name):
+    return name.lower().endswith(".pdf") and not name.startswith(".")
+
+
+class HotFolder:
+    """
+    Sign PDFs dropped into watched directories.
+
+    Input directories are watched with inotify. A file is queued once it has
+    not changed for `settle` seconds, signed on a process pool with
+    `functionality.sign_pdf_full()` and moved to `output_dir`, or to
+    `failed_dir` if it could not be signed.
+
+    At most `queue_size` files are tracked at once. Files beyond that, and
+    files that arrived while the kernel event queue overflowed, are picked
+    up by rescanning the input directories once there is room again, so
+    memory use does not depend on the size of the backlog. Files already
+    present at startup are found by the same scan.
+
+    Args:
+        input_dirs (iterable of str): Directories to watch.
+        output_dir (str): Directory receiving signed PDFs.
+        failed_dir (str): Directory receiving PDFs that could not be signed.
+        key (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey or ed25519.Ed25519PrivateKey): The private key used for signing.
+        jobs (int or None): Number of worker processes, defaults to the CPU count.
+        settle (float): Seconds a file must stay unchanged before it is signed.
+        queue_size (int): Maximum number of tracked files.
+        ledger_path (str or None): Ledger database, defaults to `LEDGER_FILE_NAME` in `output_dir`.
+        cert_path (str or None): Optional certificate cache file, see `functionality.get_signing_cert()`.
+    """
+
+    def __init__(self, input_dirs, output_dir, failed_dir, key, jobs=None, settle=DEFAULT_SETTLE,
+                 queue_size=DEFAULT_QUEUE_SIZE, ledger_path=None, cert_path=None):
+        self.input_dirs = [os.path.abspath(d) for d in input_dirs]
+        self.output_dir = output_dir
+        self.failed_dir = failed_dir
+        self.jobs = jobs or os.cpu_count() or 1
+        self.settle = settle
+        self.queue_size = queue_size
+        os.makedirs(output_dir, exist_ok=True)
+        os.makedirs(failed_dir, exist_ok=True)
+        self.ledger = Ledger(ledger_path or os.path.join(output_dir, LEDGER_FILE_NAME))
+        cert = functionality.get_signing_cert(key, cert_path)
+        self._initargs = (serialize_key(key), cert.public_bytes(serialization.Encoding.PEM))
+        self._window = min(2 * self.jobs, queue_size)
+
+        # path -> monotonic time at which to check it again
+        self._pending = OrderedDict()
+        self._ready = deque()
+        self._in_flight = {}
+        self._tracked = set()
+        self._crashes = {}
+        self._rescan = True
+        self._stopping = False
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+
+    def stop(self):
+        """
+        Ask `run()` to return once the files being signed are finished; safe to call from a signal handler.
+        """
+        self._stopping = True
+        self._wake()
+
+    def _wake(self, *_):
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass
+
+    def _free(self):
+        return self.queue_size - len(self._tracked)
+
+    def _track(self, path, delay):
+        """
+        Start or restart the settle timer of a file.
+        """
+        if path in self._pending:
+            self._pending[path] = time.monotonic() + delay
+            self._pending.move_to_end(path)
+        elif path not in self._tracked:
+            if self._free() <= 0:
+                self._rescan = True
+                return
+            self._pending[path] = time.monotonic() + delay
+            self._tracked.add(path)
+
+    def _on_event(self, directory, mask, name):
+        if mask & IN_Q_OVERFLOW:
+            logging.error("inotify queue overflowed, rescanning input directories")
+            self._rescan = True
+            return
+        if directory is None or mask & (IN_ISDIR | IN_IGNORED) or not _is_candidate(name):
+            return
+        self._track(os.path.join(directory, name), self.settle)
+
+    def _scan(self):
+        """
+        Track unknown files in the input directories, as many as there is room for.
+        """
+        for directory in self.input_dirs:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if not _is_candidate(entry.name) or entry.path in self._tracked:
+                        continue
+                    if self._free() <= 0:
+                        return
+                    if entry.is_file():
+                        self._track(entry.path, 0)
+        self._rescan = False
+
+    def _promote_settled(self):
+        """
+        Queue pending files that have not been modified for `settle` seconds.
+        """
+        now = time.monotonic()
+        while self._pending:
+            path, deadline = next(iter(self._pending.items()))
+            if deadline > now:
+                return
+            del self._pending[path]
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                self._tracked.discard(path)
+                continue
+            age = time.time() - st.st_mtime
+            if age < self.settle:
+                self._pending[path] = now + self.settle - age
+                continue
+            if self.ledger.lookup(path, st) in (STATUS_SIGNED, STATUS_DONE):
+                # signed before a restart, only the move is missing
+                self._finish(SignResult(path, True, None, 0.0))
+            else:
+                self._ready.append(path)
+
+    def _submit(self, executor):
+        while self._ready and len(self._in_flight) < self._window:
+            path = self._ready.popleft()
+            future = executor.submit(sign_one, path)
+            self._in_flight[future] = path
+            future.add_done_callback(self._wake)
+
+    def _collect(self):
+        """
+        Handle finished signing jobs.
+
+        Returns:
+            bool: True if the worker pool died and has to be restarted.
+        """
+        broken = False
+        for future in [f for f in self._in_flight if f.done()]:
+            path = self._in_flight.pop(future)
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                broken = True
+                self._crashes[path] = self._crashes.get(path, 0) + 1
+                if self._crashes[path] < MAX_CRASHES_PER_ITEM:
+                    self._ready.appendleft(path)
+                    continue
+                result = SignResult(path, False, "Worker process crashed", 0.0)
+            except Exception as e:
+                result = SignResult(path, False, f"{type(e).__name__}: {e}", 0.0)
+            self._finish(result)
+        return broken
+
+    def _finish(self, result):
+        """
+        Record a signing result and move the file out of the input directory.
+        """
+        path = result.path
+        self._tracked.discard(path)
+        self._crashes.pop(path, None)
+        try:
+            st = os.stat(path)
+            if result.ok:
+                self.ledger.record(path, st, STATUS_SIGNED)
+                destination = _unique_destination(self.output_dir, os.path.basename(path))
+                shutil.move(path, destination)
+                self.ledger.record(path, st, STATUS_DONE, destination)
+                logging.info(f"Signed {path} -> {destination}")
+            else:
+                destination = _unique_destination(self.failed_dir, os.path.basename(path))
+                shutil.move(path, destination)
+                self.ledger.record(path, st, STATUS_FAILED, destination, result.error)
+                logging.error(f"Failed to sign {path}: {result.error}")
+        except (OSError, sqlite3.Error) as e:
+            logging.error(f"Cannot move {path}: {e}")
+
+    def _timeout(self):
+        """
+        Milliseconds until the next pending file has to be checked, None to wait for events.
+        """
+        if not self._pending:
+            return None
+        deadline = next(iter(self._pending.values()))
+        return max(0, int((deadline - time.monotonic()) * 1000) + 1)
+
+    def run(self):
+        """
+        Watch the input directories and sign files until `stop()` is called.
+
+        Raises:
+            OSError: If inotify is unavailable or an input directory cannot be watched.
+        """
+        inotify = Inotify()
+        executor = ProcessPoolExecutor(
+            max_workers=self.jobs, initializer=init_sign_worker, initargs=self._initargs
+        )
+        poller = select.poll()
+        poller.register(inotify, select.POLLIN)
+        poller.register(self._wake_r, select.POLLIN)
+        try:
+            # watch first, so files created during the initial scan are not missed
+            for directory in self.input_dirs:
+                inotify.add_watch(directory)
+            while not self._stopping:
+                if self._rescan and self._free() >= self.queue_size // 2:
+                    self._scan()
+                self._promote_settled()
+                self._submit(executor)
+                try:
+                    ready = poller.poll(self._timeout())
+                except InterruptedError:
+                    continue
+                for fd, _ in ready:
+                    if fd == inotify.fileno():
+                        for directory, mask, name in inotify.read_events():
+                            self._on_event(directory, mask, name)
+                    else:
+                        try:
+                            os.read(self._wake_r, 4096)
+                        except BlockingIOError:
+                            pass
+                if self._collect():
+                    logging.error("Worker process died, restarting pool")
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = ProcessPoolExecutor(
+                        max_workers=self.jobs, initializer=init_sign_worker, initargs=self._initargs
+                    )
+        finally:
+            executor.shutdown(wait=True)
+            self._collect()
+            inotify.close()
+
+    def close(self):
+        """
+        Close the ledger and the wake-up pipe.
+        """
+        self.ledger.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+
+def main(argv=None):
+    """
+    Command line entry point: sign PDFs dropped into the input directories until interrupted.
+
+    Returns:
+        int: 0 on a clean shutdown, 1 if the key could not be unlocked or a directory cannot be watched.
+    """
+    parser = argparse.ArgumentParser(description="Sign PDFs dropped into watched directories.")
+    parser.add_argument("private_key", help="Path to the encrypted private key")
+    parser.add_argument("--pin", required=True, help="PIN source: env:NAME, file:PATH, fd:N or literal:PIN")
+    parser.add_argument("--input", action="append", required=True, metavar="DIR", help="Directory to watch; may be repeated")
+    parser.add_argument("--output", required=True, metavar="DIR", help="Directory for signed PDFs")
+    parser.add_argument("--failed", required=True, metavar="DIR", help="Directory for PDFs that could not be signed")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE, help="Seconds a file must stay unchanged")
+    parser.add_argument("--queue", type=int, default=DEFAULT_QUEUE_SIZE, help="Maximum number of tracked files")
+    parser.add_argument("--ledger", default=None, help=f"Ledger database (default: OUTPUT/{LEDGER_FILE_NAME})")
+    args = parser.parse_args(argv)
+
+    try:
+        pin = resolve_pin(args.pin)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read PIN: {e}", file=sys.stderr)
+        return 1
+    key = functionality.load_and_decrypt_private_key(args.private_key, pin)
+    if key is None:
+        print("Cannot unlock the private key", file=sys.stderr)
+        return 1
+
+    hot_folder = HotFolder(
+        args.input, args.output, args.failed, key, jobs=args.jobs, settle=args.settle, queue_size=args.queue,
+        ledger_path=args.ledger, cert_path=functionality.cert_path_for_key(args.private_key),
+    )
+    del key
+    signal.signal(signal.SIGTERM, lambda *_: hot_folder.stop())
+    try:
+        hot_folder.run()
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Cannot watch input directories: {e}", file=sys.stderr)
+        return 1
+    finally:
+        hot_folder.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
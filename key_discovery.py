@@ -0,0 +1,239 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict, deque, namedtuple
+
+logging.basicConfig(level=logging.INFO)
+
+KEY_FILE_EXTENSION = ".pem"
+PUBLIC_KEY_SUFFIX = "_pub.pem"
+# directories below the drive root that are searched
+DEFAULT_MAX_DEPTH = 3
+# seconds a scan may take before it stops with the keys found so far
+DEFAULT_TIME_BUDGET = 2.0
+# volumes whose keys are remembered
+DISCOVERY_CACHE_SIZE = 32
+DISK_BY_UUID = "/dev/disk/by-uuid"
+
+# an encrypted key is a 16 byte IV followed by an AES-CBC encrypted PEM key,
+# from 144 bytes for Ed25519 to 3264 bytes for RSA 4096
+ENCRYPTED_KEY_MIN_SIZE = 144
+ENCRYPTED_KEY_MAX_SIZE = 16 * 1024
+SNIFF_SIZE = 64
+PEM_PREFIX = b"-----BEGIN "
+
+KIND_PRIVATE = "private"
+KIND_PUBLIC = "public"
+KIND_CERTIFICATE = "certificate"
+
+KeyCandidate = namedtuple("KeyCandidate", ["path", "kind", "depth"])
+DiscoveryResult = namedtuple("DiscoveryResult", ["mount_point", "candidates", "complete", "cached"])
+
+
+def sniff_key_file(path, size):
+    """
+    Tell key files apart by their first bytes.
+
+    Public keys and certificates are PEM text. Private keys saved by
+    `functionality.save_encrypted_private_key()` are binary, a multiple of
+    the AES block size long.
+
+    Args:
+        path (str): File to check.
+        size (int): File size in bytes.
+
+    Returns:
+        str or None: `KIND_PRIVATE`, `KIND_PUBLIC`, `KIND_CERTIFICATE`, or None
+        for anything else, including unreadable files and unencrypted private keys.
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(SNIFF_SIZE)
+    except OSError:
+        return None
+    if head.startswith(PEM_PREFIX):
+        label = head[len(PEM_PREFIX):].split(b"-----", 1)[0]
+        if label.endswith(b"PUBLIC KEY"):
+            return KIND_PUBLIC
+        if label == b"CERTIFICATE":
+            return KIND_CERTIFICATE
+        return None
+    if size % 16 or not ENCRYPTED_KEY_MIN_SIZE <= size <= ENCRYPTED_KEY_MAX_SIZE:
+        return None
+    # ciphertext is random, text files with a leading comment are not
+    if all(0x09 <= b < 0x80 for b in head):
+        return None
+    return KIND_PRIVATE
+
+
+def volume_id(mount_point):
+    """
+    Identify a mounted volume by its filesystem UUID and the mtime of its root directory.
+
+    The root mtime changes when files are added to or removed from the root
+    of the drive, not when they change deeper down.
+
+    Args:
+        mount_point (str): Mount point of the volume.
+
+    Returns:
+        tuple or None: (uuid, root mtime_ns), None if the filesystem has no UUID.
+    """
+    try:
+        st = os.stat(mount_point)
+        with os.scandir(DISK_BY_UUID) as it:
+            for entry in it:
+                try:
+                    if os.stat(entry.path).st_rdev == st.st_dev:
+                        return entry.name, st.st_mtime_ns
+                except OSError:
+                    continue
+    except OSError:
+        return None
+    return None
+
+
+def _rank(candidates):
+    """
+    Order candidates best first: private keys with a matching `_pub.pem` file, then by depth and path.
+    """
+    public_keys = {c.path for c in candidates if c.kind == KIND_PUBLIC}
+
+    def key(candidate):
+        paired = os.path.splitext(candidate.path)[0] + PUBLIC_KEY_SUFFIX in public_keys
+        return candidate.kind != KIND_PRIVATE, not paired, candidate.depth, candidate.path
+
+    return sorted(candidates, key=key)
+
+
+def scan_for_keys(mount_point, max_depth=DEFAULT_MAX_DEPTH, time_budget=DEFAULT_TIME_BUDGET):
+    """
+    Find key files on a drive, shallowest directories first.
+
+    Only `.pem` files are opened. Hidden and system directories (names
+    starting with '.' or '$') and symbolic links are skipped.
+
+    Args:
+        mount_point (str): Root directory of the drive.
+        max_depth (int): Deepest directory level searched, 0 for the root only.
+        time_budget (float): Seconds after which the scan stops.
+
+    Returns:
+        tuple: (list of KeyCandidate best first, bool complete); `complete` is
+        False if the time budget ran out or a directory could not be read.
+    """
+    deadline = time.monotonic() + time_budget
+    candidates = []
+    complete = True
+    directories = deque([(mount_point, 0)])
+    while directories:
+        directory, depth = directories.popleft()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if time.monotonic() > deadline:
+                        logging.debug(f"Key scan of {mount_point} stopped after {time_budget} s")
+                        return _rank(candidates), False
+                    if entry.name.startswith((".", "$")):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if depth < max_depth:
+                            directories.append((entry.path, depth + 1))
+                        continue
+                    if not entry.name.lower().endswith(KEY_FILE_EXTENSION) or not entry.is_file(follow_symlinks=False):
+                        continue
+                    kind = sniff_key_file(entry.path, entry.stat(follow_symlinks=False).st_size)
+                    if kind is not None:
+                        candidates.append(KeyCandidate(entry.path, kind, depth))
+        except OSError as e:
+            logging.debug(f"Cannot scan {directory}: {e}")
+            complete = False
+    return _rank(candidates), complete
+
+
+class KeyDiscovery:
+    """
+    Key discovery on inserted drives with a per-volume cache.
+
+    Scan results are remembered by filesystem UUID and root directory mtime,
+    with paths relative to the mount point, so re-inserting the same drive
+    finds its keys without scanning, even if it is mounted elsewhere. Cached
+    files that no longer exist are dropped from the result.
+
+    Args:
+        max_depth (int): Deepest directory level searched, see `scan_for_keys()`.
+        time_budget (float): Seconds a scan may take.
+        cache_size (int): Number of volumes remembered.
+    """
+
+    def __init__(self, max_depth=DEFAULT_MAX_DEPTH, time_budget=DEFAULT_TIME_BUDGET,
+                 cache_size=DISCOVERY_CACHE_SIZE):
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def discover(self, mount_point):
+        """
+        Find the key files on a drive, from the cache if the volume is known.
+
+        Args:
+            mount_point (str): Mount point of the drive.
+
+        Returns:
+            DiscoveryResult: (mount_point, candidates best first, complete, cached).
+        """
+        volume = volume_id(mount_point)
+        if volume is not None:
+            with self._lock:
+                cached = self._cache.get(volume)
+                if cached is not None:
+                    self._cache.move_to_end(volume)
+            if cached is not None:
+                relative_candidates, complete = cached
+                candidates = [
+                    KeyCandidate(os.path.join(mount_point, c.path), c.kind, c.depth) for c in relative_candidates
+                ]
+                return DiscoveryResult(
+                    mount_point, [c for c in candidates if os.path.isfile(c.path)], complete, True
+                )
+
+        candidates, complete = scan_for_keys(mount_point, self.max_depth, self.time_budget)
+        if volume is not None:
+            relative_candidates = [
+                KeyCandidate(os.path.relpath(c.path, mount_point), c.kind, c.depth) for c in candidates
+            ]
+            with self._lock:
+                self._cache[volume] = (relative_candidates, complete)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return DiscoveryResult(mount_point, candidates, complete, False)
+
+    def discover_in_background(self, mount_point, callback, dispatch=None):
+        """
+        Run `discover()` in a daemon thread and pass the result to `callback`.
+
+        Args:
+            mount_point (str): Mount point of the drive.
+            callback (callable): Called with the `DiscoveryResult`.
+            dispatch (callable or None): Runs the callback with its arguments, e.g. on the
+                Tk main thread; defaults to calling it in the discovery thread.
+
+        Returns:
+            threading.Thread: The started thread.
+        """
+        dispatch = dispatch or (lambda f, *args: f(*args))
+
+        def run():
+            try:
+                result = self.discover(mount_point)
+            except Exception as e:
+                logging.error(f"Key discovery on {mount_point} failed: {e}", exc_info=True)
+                result = DiscoveryResult(mount_point, [], False, False)
+            dispatch(callback, result)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
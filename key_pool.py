@@ -0,0 +1,148 @@
+import atexit
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from cryptography.hazmat.primitives import serialization
+import functionality
+
+logging.basicConfig(level=logging.INFO)
+
+MAX_POOL_SIZE = 32
+
+
+def _generate_key_der(generator):
+    """
+    Generate a key in a worker process and return it in a picklable form.
+
+    Args:
+        generator (callable): Picklable function returning a new private key.
+
+    Returns:
+        bytes: Unencrypted PKCS8 DER encoding of the new key.
+    """
+    key = generator()
+    return key.private_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+class KeyPool:
+    """
+    Pool of private keys pre-generated by background worker processes.
+
+    The pool keeps up to `size` keys ready (counting keys still being
+    generated) and starts refilling as soon as a key is taken, so `get()`
+    normally returns immediately. Keys only live in memory and are dropped
+    by `close()`, which is also registered to run at interpreter exit.
+
+    Args:
+        size (int): Number of keys kept ready, at most `MAX_POOL_SIZE`.
+        workers (int): Number of background processes generating keys.
+        generator (callable): Picklable top-level function returning a new
+            private key, defaults to `functionality.generate_rsa_key`.
+
+    Attributes:
+        size (int): Number of keys kept ready.
+        generator (callable): Function used to create keys.
+    """
+
+    def __init__(self, size=2, workers=1, generator=functionality.generate_rsa_key):
+        if not 0 < size <= MAX_POOL_SIZE:
+            raise ValueError(f"Pool size must be between 1 and {MAX_POOL_SIZE}")
+        self.size = size
+        self.generator = generator
+        self._keys = deque()
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._closed = False
+        # spawn keeps GUI threads and key material of the parent out of the workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        atexit.register(self.close)
+        self._refill()
+
+    def __len__(self):
+        """Number of keys ready to be taken."""
+        return len(self._keys)
+
+    def _refill(self):
+        """
+        Start generating keys until the pool is full again.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            while len(self._keys) + len(self._pending) < self.size:
+                future = self._executor.submit(_generate_key_der, self.generator)
+                self._pending.append(future)
+                future.add_done_callback(self._on_generated)
+
+    def _on_generated(self, future):
+        """
+        Move a finished key from the pending list to the ready list.
+        """
+        with self._lock:
+            # futures claimed by get() or dropped by close() are not pending anymore
+            if future not in self._pending:
+                return
+            self._pending.remove(future)
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                logging.error(f"Key generation failed: {future.exception()}")
+                return
+            self._keys.append(future.result())
+
+    def get(self):
+        """
+        Take a key from the pool.
+
+        If no key is ready, waits for the oldest key being generated, or
+        generates one on the calling thread if the pool is closed.
+
+        Returns:
+            Private key object, e.g. rsa.RSAPrivateKey.
+        """
+        key_der = None
+        waiting = None
+        with self._lock:
+            if self._keys:
+                key_der = self._keys.popleft()
+            elif self._pending:
+                waiting = self._pending.popleft()
+        if waiting is not None:
+            try:
+                key_der = waiting.result()
+            except Exception as e:
+                logging.error(f"Key generation failed: {e}")
+                key_der = None
+        self._refill()
+        if key_der is None:
+            logging.debug("Key pool empty, generating key synchronously")
+            return self.generator()
+        # the key was generated by our own worker, re-validating it would cost as much as an RSA operation
+        return serialization.load_der_private_key(
+            key_der, password=None, unsafe_skip_rsa_key_validation=True
+        )
+
+    def close(self):
+        """
+        Discard all cached keys and stop the background workers.
+
+        Side Effects:
+            - Drops references to every pre-generated key.
+            - Cancels pending key generation.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._keys.clear()
+            self._pending.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        atexit.unregister(self.close)
@@ -0,0 +1,199 @@
+import os
+import sys
+import json
+import logging
+import argparse
+import tempfile
+from hashlib import sha256
+import functionality
+from batch import write_jsonl, read_paths
+
+logging.basicConfig(level=logging.INFO)
+
+PUBLIC_KEY_SUFFIX = "_pub.pem"
+INDEX_FILE_NAME = ".keyring_index.json"
+INDEX_VERSION = 1
+
+
+class Keyring:
+    """
+    Directory of trusted `_pub.pem` files indexed by SPKI SHA-256 fingerprint.
+
+    The index of fingerprints is persisted next to the keys, together with
+    each file's size and mtime. Loading the keyring only stats the files and
+    parses the ones that were added or changed since the index was written,
+    so thousands of keys are ready after one directory scan. Looking up the
+    signer of a document is then a single dictionary access.
+
+    Args:
+        directory (str): Directory holding the public keys.
+        index_path (str or None): Persisted index file, defaults to
+            `INDEX_FILE_NAME` inside `directory`.
+
+    Attributes:
+        directory (str): Directory holding the public keys.
+        index_path (str): Persisted index file.
+        id (str): Fingerprint of the whole key set, changes whenever a key is
+            added, removed or replaced; used as the verification cache key.
+    """
+
+    def __init__(self, directory, index_path=None):
+        self.directory = directory
+        self.index_path = index_path or os.path.join(directory, INDEX_FILE_NAME)
+        self.id = None
+        self._entries = {}
+        self._by_fingerprint = {}
+        self._load_index()
+        self.refresh()
+
+    def __len__(self):
+        """Number of indexed keys."""
+        return len(self._by_fingerprint)
+
+    def __contains__(self, fingerprint):
+        """Whether a key with this SPKI fingerprint is trusted."""
+        return fingerprint in self._by_fingerprint
+
+    def lookup(self, fingerprint):
+        """
+        Find the key file with a given fingerprint.
+
+        Args:
+            fingerprint (str): Hex SHA-256 of the SPKI DER, see `functionality.public_key_fingerprint()`.
+
+        Returns:
+            str or None: Path of the `_pub.pem` file, None if the key is not trusted.
+        """
+        return self._by_fingerprint.get(fingerprint)
+
+    def _load_index(self):
+        """
+        Read the persisted index, ignoring it if it is missing or unreadable.
+        """
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.error(f"Cannot read keyring index {self.index_path}: {e}")
+            return
+        if index.get("version") == INDEX_VERSION:
+            self._entries = index.get("keys", {})
+
+    def _save_index(self):
+        """
+        Write the index atomically, logging instead of failing if the directory is read-only.
+        """
+        index = {"version": INDEX_VERSION, "keys": self._entries}
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.index_path)), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(index, f)
+                os.replace(tmp_path, self.index_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logging.error(f"Cannot write keyring index {self.index_path}: {e}")
+
+    def refresh(self):
+        """
+        Re-scan the directory and parse keys that were added or changed.
+
+        Returns:
+            bool: True if the set of keys changed.
+
+        Side Effects:
+            - Rewrites the persisted index if any entry changed.
+        """
+        entries = {}
+        parsed = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(PUBLIC_KEY_SUFFIX) or not entry.is_file():
+                    continue
+                st = entry.stat()
+                known = self._entries.get(entry.name)
+                if known and known["size"] == st.st_size and known["mtime_ns"] == st.st_mtime_ns:
+                    entries[entry.name] = known
+                    continue
+                try:
+                    with open(entry.path, "rb") as f:
+                        fingerprint = functionality.public_key_fingerprint(
+                            functionality.import_public_key(f.read())
+                        )
+                except (OSError, ValueError, IndexError, TypeError) as e:
+                    logging.error(f"Skipping unreadable public key {entry.path}: {e}")
+                    continue
+                parsed += 1
+                entries[entry.name] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "fingerprint": fingerprint}
+
+        changed = parsed > 0 or entries.keys() != self._entries.keys()
+        self._entries = entries
+        self._by_fingerprint = {
+            entry["fingerprint"]: os.path.join(self.directory, name) for name, entry in sorted(entries.items())
+        }
+        self.id = sha256("\n".join(sorted(self._by_fingerprint)).encode()).hexdigest()
+        if changed:
+            logging.debug(f"Keyring {self.directory}: parsed {parsed} keys, {len(entries)} indexed")
+            self._save_index()
+        return changed
+
+    def verify(self, pdf_file_path, use_mmap=True, cache=None, validation_context=None):
+        """
+        Verify a signed PDF and identify which trusted key signed it.
+
+        Documents signed by an unknown key are rejected after one lookup,
+        before any CMS or diff validation.
+
+        Args:
+            pdf_file_path (str): Path to the signed PDF file.
+            use_mmap (bool): Read the PDF through a memory mapping, see `functionality.open_pdf_input()`.
+            cache (verify_cache.VerificationCache or None): Cache of earlier verdicts; None bypasses caching.
+            validation_context (pyhanko_certvalidator.ValidationContext or None): Context reused
+                across verifications, see `functionality.get_validation_context()`.
+
+        Returns:
+            dict: Report as from `functionality.verify_pdf_report()` with an additional
+            `signer_key` key, the path of the matching `_pub.pem` file or None.
+        """
+        report = functionality.verify_pdf_trusted(
+            pdf_file_path, self, self.id, use_mmap, cache, validation_context=validation_context
+        )
+        report["signer_key"] = self.lookup(report["signer_fingerprint"]) if report["key_match"] else None
+        return report
+
+
+def main(argv=None):
+    """
+    Command line entry point: verify PDFs against a keyring directory.
+
+    Reports are written as JSON lines to stdout.
+
+    Returns:
+        int: 0 if every document was verified, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Verify signed PDFs and identify the signer from a keyring.")
+    parser.add_argument("directory", help="Directory of trusted _pub.pem files")
+    parser.add_argument("paths", nargs="+", help="PDF files, '-' reads paths from stdin")
+    args = parser.parse_args(argv)
+
+    keyring = Keyring(args.directory)
+    failed = 0
+
+    def reports():
+        nonlocal failed
+        for path in read_paths(args.paths):
+            report = keyring.verify(path)
+            if not report["verified"]:
+                failed += 1
+            yield report
+
+    write_jsonl(reports(), sys.stdout)
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
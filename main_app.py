@@ -1,10 +1,8 @@
 import os
-import psutil
 import logging
-import threading
-import time
-from Crypto.PublicKey import RSA
 import functionality
+import mount_watch
+import key_discovery
 from tkinter import Tk, filedialog, StringVar, Entry, Button, Label
 
 logging.basicConfig(level=logging.INFO)
@@ -52,8 +50,9 @@ class EncryptionApp:
             label_public_key (Label): Displays key detection status.
             label_general (Label): Displays general messages to the user.
 
-            detected_drives (set): Set of USB drives detected on launch.
-            monitor_thread (Thread): Background thread to monitor USB drive changes.
+            detected_drives (set): Set of USB drives currently mounted, updated on the main thread.
+            mount_watcher (MountWatcher): Background watcher reporting USB drives being mounted and unmounted.
+            key_discovery (KeyDiscovery): Searches inserted drives for keys, caching results per volume.
         """
         self.root = root
         self.message_pdf = StringVar()
@@ -105,96 +104,104 @@ class EncryptionApp:
         self.label_public_key.grid(row=11, column=1)
 
         # USB port
-        self.detected_drives = set(self.get_usb_drives())
-        self.monitor_thread = threading.Thread(target=self.monitor_usb, daemon=True)
-        self.monitor_thread.start()
+        self.key_discovery = key_discovery.KeyDiscovery()
+        self.mount_watcher = mount_watch.MountWatcher(
+            self.on_usb_inserted, self.on_usb_removed, dispatch=self.dispatch_to_ui
+        )
+        self.detected_drives = set(self.mount_watcher.mounts)
+        self.mount_watcher.start()
 
-    def get_usb_drives(self):
+    def dispatch_to_ui(self, callback, *args):
         """
-        Detect currently mounted USB drives.
+        Schedule a callback on the main Tkinter thread, used by the mount watcher thread.
 
-        Uses `psutil.disk_partitions()` to scan for removable drives by checking
-        the 'opts' field of each partition.
+        Args:
+            callback (callable): Function to call.
+            *args: Arguments passed to `callback`.
 
         Returns:
-            list: A list of mount points for all detected USB drives.
+            None
         """
-        usb_drives = []
-        for partition in psutil.disk_partitions():
-            if "removable" in partition.opts:
-                usb_drives.append(partition.mountpoint)
-        return usb_drives
+        self.root.after(0, callback, *args)
 
-    def monitor_usb(self):
+    def on_usb_inserted(self, drive_path):
         """
-        Continuously monitor USB drives for new insertions.
+        Handle insertion of a USB drive.
 
-        This method runs in a background thread and checks
-        the currently mounted USB drives by calling `get_usb_drives()` every 2 seconds.
-
-        When a new USB drive is detected, it schedules a call to `on_usb_inserted` on the main
-        Tkinter thread using `root.after` to safely handle UI updates.
+        Args:
+            drive_path (str): Mount point of the detected USB drive.
 
-        Runs indefinitely as a daemon thread.
+        If no private key is selected yet, the drive is searched for keys in the background
+        with `KeyDiscovery.discover_in_background()`, the result is handled by `on_keys_found()`.
 
         Returns:
-            None           
+            None
         """
-        while True:
-            time.sleep(2)
-            current_drives = set(self.get_usb_drives())
-
-            new_drives = current_drives - self.detected_drives
-            if new_drives:
-                for drive in new_drives:
-                    self.root.after(0, self.on_usb_inserted, drive)
-
-            self.detected_drives = current_drives
+        logging.debug("Pendrive detected")
+        self.detected_drives.add(drive_path)
+        if self.private_key_path:
+            return
+        self.message_private_key.set("Searching for private key...")
+        self.key_discovery.discover_in_background(drive_path, self.on_keys_found, dispatch=self.dispatch_to_ui)
 
-    def on_usb_inserted(self, drive_path):
+    def on_keys_found(self, result):
         """
-        Continuously monitor USB drives for new insertions.
+        Select the best private key found on an inserted drive.
 
         Args:
-            drive_path (str): path to detectedd USB.
+            result (DiscoveryResult): Keys found on the drive, best first.
+
+        Results for drives removed in the meantime are ignored. Public keys and certificates
+        are never selected as the private key.
 
-        This method calls 'find_pem_files()' to check if there are any .pem files on inserted USB drive and logs the operatin.
-        If there is a .pem file its path is saved to self.private_key_path.
+        Side Effects:
+        - Path of the private key is saved to self.private_key_path.
+        - Appropriate message is shown.
 
         Returns:
-            None           
+            None
         """
-        logging.debug("Pendrive detected")
-        pem_files = self.find_pem_files(drive_path)
-
-        if self.private_key_path:
+        if result.mount_point not in self.detected_drives or self.private_key_path:
             return
-        if not pem_files:
+        private_keys = [c.path for c in result.candidates if c.kind == key_discovery.KIND_PRIVATE]
+        if not private_keys:
             logging.debug("No key detected on pendrive")
+            self.message_private_key.set("No private key detected")
             return
-        
-        self.private_key_path = pem_files[0]
+
+        self.private_key_path = private_keys[0]
         self.message_private_key.set(f"Private key selected: {os.path.basename(self.private_key_path)}, submit PIN")
 
-    def find_pem_files(self, directory):
+    def on_usb_removed(self, drive_path):
         """
-        Checks all files in given directory and returns ones with .pem extension.
+        Handle removal of a USB drive.
 
         Args:
-            directory (str): path to directory with private key.
-        
-        Returns:
-            list: A list of files with .pem extension.
+            drive_path (str): Mount point of the removed USB drive.
+
+        If the private key was loaded from this drive it is dropped together with the PIN,
+        so signing requires the drive again.
+
+        Side Effects:
+        - Private key, its path and the PIN are cleared.
+        - Appropriate message is shown.
 
         Returns:
-            None   
+            None
         """
-        pem_files = []
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file.endswith(".pem"):
-                    pem_files.append(os.path.join(root, file))
-        return pem_files
+        logging.debug("Pendrive removed")
+        self.detected_drives.discard(drive_path)
+        if self.private_key_path is None:
+            return
+        key_path = os.path.abspath(self.private_key_path)
+        if os.path.commonpath([key_path, os.path.abspath(drive_path)]) != os.path.abspath(drive_path):
+            return
+
+        self.private_key_path = None
+        self.private_key = None
+        self.cert = None
+        self.pin = ""
+        self.message_private_key.set("Private key removed with the drive")
 
     def submit_pin(self):
         """
@@ -327,7 +334,7 @@ class EncryptionApp:
         try:
             with open(file_path, "rb") as f:
                 key_data = f.read()
-                self.public_key = RSA.import_key(key_data)
+                self.public_key = functionality.import_public_key(key_data)
                 logging.debug(f"Public key imported successfully: {self.public_key}")
                 self.message_public_key.set(f"Public key: {file_path.split('/')[-1]}")
         except (ValueError, IndexError, TypeError) as e:
@@ -339,6 +346,8 @@ class EncryptionApp:
         """
         Sign pdf with `sign_pdf_full()` function.
 
+        The signing certificate is cached next to the private key file.
+
         Side Effects:
         - PDF is signed.
         - Logs debug messages about the operation.
@@ -359,7 +368,8 @@ class EncryptionApp:
             return
         
         else:
-            if functionality.sign_pdf_full(self.pdf_file_path, self.private_key ):        
+            cert_path = functionality.cert_path_for_key(self.private_key_path)
+            if functionality.sign_pdf_full(self.pdf_file_path, self.private_key, cert_path=cert_path):        
                 self.message_general.set(f"PDF was succesfully signed")
                 logging.debug(f"PDF was succesfully signed")
             else:
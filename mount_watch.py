@@ -0,0 +1,237 @@
+import os
+import re
+import select
+import logging
+import threading
+from collections import namedtuple
+
+logging.basicConfig(level=logging.INFO)
+
+MOUNTINFO_PATH = "/proc/self/mountinfo"
+SYS_ROOT = "/sys"
+# seconds between checks where mount changes cannot be waited for
+POLL_INTERVAL = 2.0
+
+# one line of /proc/self/mountinfo, see proc(5)
+MountEntry = namedtuple("MountEntry", ["mount_id", "device", "root", "mountpoint", "options", "fstype", "source"])
+
+_OCTAL_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+def _unescape(field):
+    return _OCTAL_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), field)
+
+
+def parse_mountinfo(text):
+    """
+    Parse the contents of /proc/self/mountinfo.
+
+    Args:
+        text (str): File contents.
+
+    Returns:
+        list of MountEntry: One entry per mount, malformed lines are skipped.
+    """
+    entries = []
+    for line in text.splitlines():
+        fields = line.split(" ")
+        try:
+            separator = fields.index("-", 6)
+            entries.append(MountEntry(
+                int(fields[0]), fields[2], _unescape(fields[3]), _unescape(fields[4]), fields[5],
+                fields[separator + 1], _unescape(fields[separator + 2]),
+            ))
+        except (ValueError, IndexError):
+            continue
+    return entries
+
+
+def is_removable_device(entry, sys_root=SYS_ROOT):
+    """
+    Check whether a mount is backed by a removable or USB block device.
+
+    The device is looked up in sysfs by its major:minor number; a partition
+    is removable if its disk is.
+
+    Args:
+        entry (MountEntry): The mount to check.
+        sys_root (str): Mount point of sysfs.
+
+    Returns:
+        bool: True if the device is removable or attached over USB.
+    """
+    device_path = os.path.join(sys_root, "dev", "block", entry.device)
+    if not os.path.exists(device_path):
+        return False
+    device_path = os.path.realpath(device_path)
+    if "/usb" in device_path:
+        return True
+    for path in (device_path, os.path.dirname(device_path)):
+        try:
+            with open(os.path.join(path, "removable")) as f:
+                if f.read().strip() == "1":
+                    return True
+        except OSError:
+            continue
+    return False
+
+
+class MountinfoSource:
+    """
+    Removable mounts read from /proc/self/mountinfo.
+
+    The kernel flags the file with POLLPRI and POLLERR whenever the mount
+    table changes, so it can be waited on instead of being polled.
+
+    Args:
+        path (str): mountinfo file to read.
+        is_removable (callable): Predicate taking a `MountEntry`, defaults to `is_removable_device()`.
+
+    Raises:
+        OSError: If the file cannot be opened.
+    """
+
+    events = select.POLLPRI | select.POLLERR
+    interval = None
+
+    def __init__(self, path=MOUNTINFO_PATH, is_removable=is_removable_device):
+        self.path = path
+        self.is_removable = is_removable
+        self._file = open(path, "r", errors="surrogateescape")
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def removable_mounts(self):
+        """
+        Read the mount table; reading also acknowledges the pending change notification.
+
+        Returns:
+            set of str: Mount points of removable drives.
+        """
+        self._file.seek(0)
+        return {entry.mountpoint for entry in parse_mountinfo(self._file.read()) if self.is_removable(entry)}
+
+    def close(self):
+        self._file.close()
+
+
+class PsutilSource:
+    """
+    Removable drives polled with `psutil.disk_partitions()`, for systems without /proc/self/mountinfo.
+    """
+
+    events = 0
+    interval = POLL_INTERVAL
+
+    def fileno(self):
+        return None
+
+    def removable_mounts(self):
+        import psutil
+        return {p.mountpoint for p in psutil.disk_partitions() if "removable" in p.opts}
+
+    def close(self):
+        pass
+
+
+def default_source():
+    """
+    Returns:
+        MountinfoSource or PsutilSource: Event driven source on Linux, polling elsewhere.
+    """
+    try:
+        return MountinfoSource()
+    except OSError:
+        logging.info("Mount table notifications unavailable, polling drives")
+        return PsutilSource()
+
+
+class MountWatcher:
+    """
+    Report removable drives being mounted and unmounted.
+
+    A background thread waits for changes of the mount table and calls
+    `on_insert(mount_point)` or `on_remove(mount_point)` through `dispatch`,
+    e.g. `lambda f, *args: root.after(0, f, *args)` to run them on the Tk
+    main thread. Drives mounted before `start()` are not reported.
+
+    A source provides `removable_mounts()` returning a set of mount points,
+    `fileno()` returning a descriptor to wait on with `events` (a `select.poll`
+    mask) or None to re-read every `interval` seconds, and `close()`. Tests
+    can pass a fake source that parses canned mountinfo text with
+    `parse_mountinfo()` and signals changes through a non-blocking pipe
+    with `events = select.POLLIN`.
+
+    Args:
+        on_insert (callable): Called with the mount point of a new drive.
+        on_remove (callable): Called with the mount point of a removed drive.
+        source (object or None): Mount source, defaults to `default_source()`.
+        dispatch (callable or None): Runs a callback with its arguments, defaults to calling it directly.
+    """
+
+    def __init__(self, on_insert, on_remove, source=None, dispatch=None):
+        self.on_insert = on_insert
+        self.on_remove = on_remove
+        self.source = source or default_source()
+        self.dispatch = dispatch or (lambda f, *args: f(*args))
+        self.mounts = self.source.removable_mounts()
+        self._thread = None
+        self._stopping = False
+        self._wake_r, self._wake_w = os.pipe()
+
+    def start(self):
+        """
+        Start watching in a daemon thread.
+        """
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the watching thread and close the source.
+        """
+        self._stopping = True
+        os.write(self._wake_w, b"\0")
+        if self._thread is not None:
+            self._thread.join()
+        self.source.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def check(self):
+        """
+        Re-read the removable mounts and report the differences since the last check.
+        """
+        try:
+            current = self.source.removable_mounts()
+        except OSError as e:
+            logging.error(f"Cannot read mounts: {e}")
+            return
+        for mount_point in sorted(self.mounts - current):
+            logging.debug(f"Drive removed: {mount_point}")
+            self.dispatch(self.on_remove, mount_point)
+        for mount_point in sorted(current - self.mounts):
+            logging.debug(f"Drive inserted: {mount_point}")
+            self.dispatch(self.on_insert, mount_point)
+        self.mounts = current
+
+    def run(self):
+        """
+        Wait for mount table changes until `stop()` is called.
+        """
+        poller = select.poll()
+        poller.register(self._wake_r, select.POLLIN)
+        fd = self.source.fileno()
+        if fd is not None:
+            poller.register(fd, self.source.events)
+        timeout = None if self.source.interval is None else int(self.source.interval * 1000)
+        while not self._stopping:
+            try:
+                ready = poller.poll(timeout)
+            except InterruptedError:
+                continue
+            if self._stopping:
+                return
+            if not ready or any(ready_fd == fd for ready_fd, _ in ready):
+                self.check()
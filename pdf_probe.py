@@ -0,0 +1,443 @@
+import os
+import re
+import zlib
+import logging
+
+logging.basicConfig(level=logging.INFO)
+
+TAIL_SIZE = 2048
+OBJECT_READ_SIZES = (8192, 262144)
+MAX_FIELD_DEPTH = 16
+MAX_FIELDS = 10000
+
+_WHITESPACE = b"\x00\t\n\x0c\r "
+_DELIMITERS = b"()<>[]{}/%"
+_NUMBER_RE = re.compile(rb"[+-]?(\d+\.?\d*|\.\d+)")
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+_OBJ_HEADER_RE = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj")
+
+
+class Unclear(Exception):
+    """Raised when the probe cannot answer without a full parse."""
+
+
+class Ref:
+    """Indirect object reference `num gen R`."""
+
+    def __init__(self, num, gen):
+        self.num = num
+        self.gen = gen
+
+
+class Stream:
+    """Stream object: its dictionary and the offset of its raw data."""
+
+    def __init__(self, dictionary, data_offset):
+        self.dictionary = dictionary
+        self.data_offset = data_offset
+
+
+class _Parser:
+    """
+    Minimal PDF object parser working on a bytes buffer.
+
+    Only supports what is needed to read xref data, the catalog and form
+    fields. Strings are skipped, not decoded.
+    """
+
+    def __init__(self, data, pos=0):
+        self.data = data
+        self.pos = pos
+
+    def skip_ws(self):
+        data = self.data
+        while self.pos < len(data):
+            c = data[self.pos]
+            if c in _WHITESPACE:
+                self.pos += 1
+            elif c == 0x25:  # % comment
+                end = data.find(b"\n", self.pos)
+                self.pos = len(data) if end == -1 else end + 1
+            else:
+                break
+
+    def parse(self):
+        self.skip_ws()
+        data = self.data
+        if self.pos >= len(data):
+            raise Unclear("Unexpected end of data")
+        c = data[self.pos:self.pos + 1]
+        if data.startswith(b"<<", self.pos):
+            return self._parse_dict()
+        if c == b"[":
+            self.pos += 1
+            items = []
+            while True:
+                self.skip_ws()
+                if data[self.pos:self.pos + 1] == b"]":
+                    self.pos += 1
+                    return items
+                items.append(self.parse())
+        if c == b"/":
+            return self._parse_name()
+        if c == b"(":
+            self._skip_literal_string()
+            return b""
+        if c == b"<":
+            end = data.find(b">", self.pos)
+            if end == -1:
+                raise Unclear("Unterminated hex string")
+            self.pos = end + 1
+            return b""
+        match = _NUMBER_RE.match(data, self.pos)
+        if match:
+            self.pos = match.end()
+            if b"." in match.group(0):
+                return float(match.group(0))
+            number = int(match.group(0))
+            # look ahead for "gen R"
+            ref = re.match(rb"\s+(\d+)\s+R(?![^\x00\t\n\x0c\r ()<>\[\]{}/%])", data[self.pos:self.pos + 32])
+            if ref:
+                self.pos += ref.end()
+                return Ref(number, int(ref.group(1)))
+            return number
+        for keyword, value in ((b"true", True), (b"false", False), (b"null", None)):
+            if data.startswith(keyword, self.pos):
+                self.pos += len(keyword)
+                return value
+        raise Unclear(f"Unexpected token at {self.pos}")
+
+    def _parse_dict(self):
+        self.pos += 2
+        result = {}
+        while True:
+            self.skip_ws()
+            if self.data.startswith(b">>", self.pos):
+                self.pos += 2
+                return result
+            key = self.parse()
+            if not isinstance(key, str):
+                raise Unclear("Dictionary key is not a name")
+            result[key] = self.parse()
+
+    def _parse_name(self):
+        start = self.pos
+        self.pos += 1
+        data = self.data
+        while self.pos < len(data) and data[self.pos] not in _WHITESPACE and data[self.pos] not in _DELIMITERS:
+            self.pos += 1
+        return data[start:self.pos].decode("latin-1")
+
+    def _skip_literal_string(self):
+        depth = 0
+        data = self.data
+        while self.pos < len(data):
+            c = data[self.pos]
+            if c == 0x5C:  # backslash escapes the next byte
+                self.pos += 2
+                continue
+            if c == 0x28:
+                depth += 1
+            elif c == 0x29:
+                depth -= 1
+                if depth == 0:
+                    self.pos += 1
+                    return
+            self.pos += 1
+        raise Unclear("Unterminated string")
+
+
+def _png_unpredict(data, columns):
+    """
+    Undo PNG predictors (PDF `/Predictor` >= 10) row by row.
+    """
+    row_size = columns + 1
+    if len(data) % row_size:
+        raise Unclear("Bad predictor data")
+    previous = bytearray(columns)
+    out = bytearray()
+    for start in range(0, len(data), row_size):
+        kind = data[start]
+        row = bytearray(data[start + 1:start + row_size])
+        if kind == 2:
+            for i in range(columns):
+                row[i] = (row[i] + previous[i]) & 0xFF
+        elif kind == 1:
+            for i in range(1, columns):
+                row[i] = (row[i] + row[i - 1]) & 0xFF
+        elif kind != 0:
+            raise Unclear(f"Unsupported PNG predictor {kind}")
+        out += row
+        previous = row
+    return bytes(out)
+
+
+class _Document:
+    """
+    Lazily resolved view of a PDF file: only the xref sections and the
+    objects that are actually requested are read.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.size = os.fstat(f.fileno()).st_size
+        self.entries = {}
+        self.table_sections = []
+        self.trailer = {}
+        self.object_streams = {}
+        self._load_xref()
+
+    def _read(self, offset, size):
+        self.f.seek(offset)
+        return self.f.read(size)
+
+    def _load_xref(self):
+        tail = self._read(max(self.size - TAIL_SIZE, 0), TAIL_SIZE)
+        matches = list(_STARTXREF_RE.finditer(tail))
+        if not matches:
+            raise Unclear("No startxref")
+        offset = int(matches[-1].group(1))
+        seen = set()
+        while offset is not None:
+            if offset in seen or len(seen) > 1000:
+                raise Unclear("xref loop")
+            seen.add(offset)
+            chunk = self._read(offset, 64)
+            if chunk.lstrip().startswith(b"xref"):
+                trailer = self._load_table(offset)
+            else:
+                trailer = self._load_stream(offset)
+            for key, value in trailer.items():
+                self.trailer.setdefault(key, value)
+            if "/XRefStm" in trailer:
+                self._load_stream(trailer["/XRefStm"])
+            prev = trailer.get("/Prev")
+            offset = prev if isinstance(prev, int) else None
+        if self.entries and self.table_sections:
+            # mixed or hybrid files need the precedence rules of a full reader
+            raise Unclear("Mixed xref tables and streams")
+
+    def _load_table(self, offset):
+        """
+        Record the subsections of a classic xref table; entries are read on demand.
+        """
+        self.f.seek(offset)
+        line = self.f.readline()
+        if not line.strip().startswith(b"xref"):
+            raise Unclear("Bad xref table")
+        while True:
+            pos = self.f.tell()
+            line = self.f.readline()
+            if not line:
+                raise Unclear("Truncated xref table")
+            parts = line.split()
+            if parts and parts[0].startswith(b"trailer"):
+                self.f.seek(pos)
+                data = self.f.read(4096)
+                start = data.find(b"<<")
+                if start == -1:
+                    raise Unclear("No trailer dictionary")
+                return _Parser(data, start).parse()
+            if len(parts) != 2:
+                raise Unclear("Bad xref subsection header")
+            first, count = int(parts[0]), int(parts[1])
+            entries_offset = self.f.tell()
+            self.table_sections.append((first, count, entries_offset))
+            self.f.seek(entries_offset + 20 * count)
+
+    def _load_stream(self, offset):
+        """
+        Decode a cross-reference stream and merge its entries.
+        """
+        stream = self._read_object_at(offset)
+        if not isinstance(stream, Stream) or stream.dictionary.get("/Type") != "/XRef":
+            raise Unclear("Expected xref stream")
+        d = stream.dictionary
+        widths = d.get("/W")
+        if not isinstance(widths, list) or len(widths) != 3:
+            raise Unclear("Bad /W")
+        data = self._stream_data(stream)
+        index = d.get("/Index", [0, d.get("/Size", 0)])
+        if not isinstance(index, list) or not all(isinstance(v, int) for v in index + widths):
+            raise Unclear("Bad /Index or /W")
+        row = sum(widths)
+        pos = 0
+        for first, count in zip(index[::2], index[1::2]):
+            for num in range(first, first + count):
+                if pos + row > len(data):
+                    raise Unclear("Truncated xref stream")
+                fields = []
+                for width in widths:
+                    fields.append(int.from_bytes(data[pos:pos + width], "big") if width else None)
+                    pos += width
+                kind = 1 if fields[0] is None else fields[0]
+                if num not in self.entries:
+                    self.entries[num] = (kind, fields[1], fields[2])
+        return d
+
+    def _stream_data(self, stream):
+        d = stream.dictionary
+        length = d.get("/Length")
+        if isinstance(length, Ref):
+            length = self.resolve(length)
+        if not isinstance(length, int):
+            raise Unclear("Unknown stream length")
+        data = self._read(stream.data_offset, length)
+        filters = d.get("/Filter")
+        if filters is None:
+            filters = []
+        elif not isinstance(filters, list):
+            filters = [filters]
+        if filters == ["/FlateDecode"]:
+            data = zlib.decompress(data)
+            params = d.get("/DecodeParms") or {}
+            if isinstance(params, list):
+                params = params[0] or {}
+            if not isinstance(params, dict):
+                raise Unclear("Bad /DecodeParms")
+            predictor = params.get("/Predictor", 1)
+            columns = params.get("/Columns", 1)
+            if not isinstance(predictor, int) or not isinstance(columns, int):
+                raise Unclear("Bad predictor parameters")
+            if predictor >= 10:
+                data = _png_unpredict(data, columns)
+            elif predictor != 1:
+                raise Unclear("Unsupported predictor")
+        elif filters:
+            raise Unclear(f"Unsupported filter {filters}")
+        return data
+
+    def _read_object_at(self, offset):
+        for size in OBJECT_READ_SIZES:
+            data = self._read(offset, size)
+            header = _OBJ_HEADER_RE.match(data)
+            if not header:
+                raise Unclear("Bad object header")
+            parser = _Parser(data, header.end())
+            try:
+                value = parser.parse()
+                break
+            except (Unclear, IndexError):
+                if len(data) < size:
+                    raise
+        else:
+            raise Unclear("Object too large")
+        parser.skip_ws()
+        if isinstance(value, dict) and data.startswith(b"stream", parser.pos):
+            pos = parser.pos + len(b"stream")
+            if data.startswith(b"\r\n", pos):
+                pos += 2
+            elif data[pos:pos + 1] == b"\n":
+                pos += 1
+            return Stream(value, offset + pos)
+        return value
+
+    def _entry(self, num):
+        if num in self.entries:
+            return self.entries[num]
+        for first, count, entries_offset in self.table_sections:
+            if first <= num < first + count:
+                line = self._read(entries_offset + 20 * (num - first), 20)
+                parts = line.split()
+                if len(parts) < 3:
+                    raise Unclear("Bad xref entry")
+                kind = 1 if parts[2] == b"n" else 0
+                return kind, int(parts[0]), int(parts[1])
+        return None
+
+    def resolve(self, value, depth=0):
+        if not isinstance(value, Ref):
+            return value
+        if depth > 8:
+            raise Unclear("Reference chain too long")
+        entry = self._entry(value.num)
+        if entry is None or entry[0] == 0:
+            return None
+        kind, a, b = entry
+        if kind == 1:
+            obj = self._read_object_at(a)
+        elif kind == 2:
+            obj = self._read_compressed(a, b)
+        else:
+            raise Unclear("Unknown xref entry type")
+        return self.resolve(obj, depth + 1)
+
+    def _read_compressed(self, stream_num, index):
+        if stream_num not in self.object_streams:
+            stream = self.resolve(Ref(stream_num, 0))
+            if not isinstance(stream, Stream):
+                raise Unclear("Bad object stream")
+            data = self._stream_data(stream)
+            first = stream.dictionary.get("/First")
+            count = stream.dictionary.get("/N")
+            if not isinstance(first, int) or not isinstance(count, int):
+                raise Unclear("Bad object stream header")
+            header = data[:first].split()
+            if len(header) < 2 * count:
+                raise Unclear("Bad object stream header")
+            offsets = [first + int(header[2 * i + 1]) for i in range(count)]
+            self.object_streams[stream_num] = (data, offsets)
+        data, offsets = self.object_streams[stream_num]
+        if index >= len(offsets):
+            raise Unclear("Object stream index out of range")
+        return _Parser(data, offsets[index]).parse()
+
+
+def _has_signed_field(doc, fields, inherited_type, depth, budget):
+    """
+    Walk the field tree looking for a signature field with a value.
+    """
+    if depth > MAX_FIELD_DEPTH:
+        raise Unclear("Field tree too deep")
+    for field_ref in fields:
+        budget[0] -= 1
+        if budget[0] < 0:
+            raise Unclear("Too many fields")
+        field = doc.resolve(field_ref)
+        if not isinstance(field, dict):
+            continue
+        field_type = field.get("/FT", inherited_type)
+        kids = doc.resolve(field.get("/Kids"))
+        if field_type == "/Sig" and field.get("/V") is not None:
+            return True
+        if isinstance(kids, list) and _has_signed_field(doc, kids, field_type, depth + 1, budget):
+            return True
+    return False
+
+
+def probe_is_pdf_signed(pdf_file_path):
+    """
+    Quickly check if a PDF contains a filled signature field.
+
+    Reads only the file tail, the cross-reference data, the catalog and the
+    AcroForm `/Fields` tree instead of parsing the whole document.
+
+    Args:
+        pdf_file_path (str): Path to the PDF file.
+
+    Returns:
+        bool or None: True if a `/Sig` field with a value exists, False if there
+        is none, None if the structure is not understood (e.g. encrypted or
+        damaged files) and a full parse is needed.
+    """
+    try:
+        with open(pdf_file_path, "rb") as f:
+            doc = _Document(f)
+            if "/Encrypt" in doc.trailer:
+                return None
+            root = doc.resolve(doc.trailer.get("/Root"))
+            if not isinstance(root, dict):
+                return None
+            acro_form = doc.resolve(root.get("/AcroForm"))
+            if acro_form is None:
+                return False
+            if not isinstance(acro_form, dict):
+                return None
+            fields = doc.resolve(acro_form.get("/Fields"))
+            if not isinstance(fields, list):
+                return False if fields is None else None
+            return _has_signed_field(doc, fields, None, 0, [MAX_FIELDS])
+    except Exception as e:
+        # damaged files fail in many ways; any of them means a full parse is needed
+        logging.debug(f"Signature probe unclear for {pdf_file_path}: {e}")
+        return None
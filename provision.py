@@ -0,0 +1,220 @@
+import os
+import sys
+import csv
+import json
+import time
+import logging
+import argparse
+import functionality
+from batch import run_pool, write_jsonl
+
+logging.basicConfig(level=logging.INFO)
+
+MIN_PIN_LENGTH = 4
+
+
+def resolve_pin(source):
+    """
+    Read a PIN from a non-interactive source.
+
+    Args:
+        source (str): `env:NAME` reads environment variable NAME, `file:PATH`
+            reads the first line of PATH, `fd:N` reads the first line of the
+            inherited file descriptor N, `literal:PIN` uses PIN as is.
+
+    Returns:
+        str: The PIN.
+
+    Raises:
+        ValueError: If the source is unknown, missing or the PIN is too short.
+    """
+    kind, _, value = source.partition(":")
+    if kind == "env":
+        pin = os.environ.get(value)
+        if pin is None:
+            raise ValueError(f"Environment variable {value} is not set")
+    elif kind == "file":
+        with open(value, "r") as f:
+            pin = f.readline()
+    elif kind == "fd":
+        with os.fdopen(int(value), "r", closefd=False) as f:
+            pin = f.readline()
+    elif kind == "literal":
+        pin = value
+    else:
+        raise ValueError(f"Unknown PIN source: {kind}")
+    pin = pin.strip()
+    if len(pin) < MIN_PIN_LENGTH:
+        raise ValueError("PIN is too short")
+    return pin
+
+
+def read_manifest(path):
+    """
+    Read provisioning entries from a CSV or JSONL manifest.
+
+    Both formats have the fields `user`, `pin` (a PIN source, see
+    `resolve_pin()`), `output_dir` and optionally `algorithm`. CSV files need a header row; files
+    ending with `.jsonl` or `.json` are read as JSON lines.
+
+    Args:
+        path (str): Path to the manifest.
+
+    Yields:
+        dict: One entry per user.
+    """
+    with open(path, "r", newline="") as f:
+        if path.endswith((".jsonl", ".json")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def _key_paths(user, output_dir):
+    """
+    Paths of the private and public key files of a user.
+    """
+    private_key_path = os.path.join(output_dir, f"{user}.pem")
+    return private_key_path, os.path.splitext(private_key_path)[0] + "_pub.pem"
+
+
+def _result(user, output_dir, error=None):
+    """
+    Build an unsuccessful result, filled in by `_provision_one()` on success.
+    """
+    private_key_path, public_key_path = _key_paths(user, output_dir)
+    return {
+        "user": user,
+        "private_key": private_key_path,
+        "public_key": public_key_path,
+        "fingerprint": None,
+        "ok": False,
+        "error": error,
+        "elapsed": 0.0,
+    }
+
+
+def _provision_one(job):
+    """
+    Generate, encrypt and save the keys of one user inside a worker process.
+
+    Args:
+        job (tuple): (user, pin, output_dir, algorithm, overwrite, error), jobs with an
+            error set are reported as failed without generating anything.
+
+    Returns:
+        dict: Result with user, key paths, public key fingerprint, ok, error and elapsed seconds.
+    """
+    user, pin, output_dir, algorithm, overwrite, error = job
+    result = _result(user, output_dir, error)
+    if error:
+        return result
+    start = time.perf_counter()
+    try:
+        if not overwrite and os.path.exists(result["private_key"]):
+            raise FileExistsError(f"{result['private_key']} already exists")
+        os.makedirs(output_dir or ".", exist_ok=True)
+        key = functionality.generate_key(algorithm)
+        encrypted_data = functionality.encrypt_private_key(key, functionality.derive_aes_key(pin))
+        functionality.save_encrypted_private_key(encrypted_data, result["private_key"])
+        functionality.save_public_key(key.public_key(), result["public_key"])
+        result["fingerprint"] = functionality.public_key_fingerprint(key.public_key())
+        result["ok"] = True
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["elapsed"] = time.perf_counter() - start
+    return result
+
+
+def _jobs(entries, algorithm, overwrite):
+    """
+    Turn manifest entries into worker jobs, resolving PINs in the parent process.
+    """
+    for entry in entries:
+        user = str(entry.get("user") or "").strip()
+        output_dir = entry.get("output_dir") or ""
+        pin, error = None, None
+        if not user or os.path.basename(user) != user or user in (".", ".."):
+            error = f"Invalid user name: {user!r}"
+        else:
+            try:
+                pin = resolve_pin(entry.get("pin") or "")
+            except (OSError, ValueError) as e:
+                error = f"{type(e).__name__}: {e}"
+        yield user, pin, output_dir, entry.get("algorithm") or algorithm, overwrite, error
+
+
+def provision(entries, jobs=None, overwrite=False, algorithm=functionality.KEY_ALGORITHM_RSA):
+    """
+    Create encrypted key pairs for many users on a process pool.
+
+    Args:
+        entries (iterable of dict): Manifest entries, see `read_manifest()`.
+        jobs (int or None): Number of worker processes, defaults to the CPU count.
+        overwrite (bool): Replace existing key files.
+        algorithm (str): Key algorithm for entries without an `algorithm` field,
+            see `functionality.generate_key()`.
+
+    Yields:
+        dict: Result for every entry as soon as it is done, see `_provision_one()`.
+    """
+    return run_pool(
+        _provision_one,
+        _jobs(entries, algorithm, overwrite),
+        failed=lambda job, error: _result(job[0], job[2], error),
+        jobs=jobs,
+    )
+
+
+def main(argv=None):
+    """
+    Command line entry point for bulk key provisioning.
+
+    Progress is printed to stderr, the fingerprint manifest is written as JSON
+    lines to `--output` (stdout by default) as soon as each user is done.
+
+    Returns:
+        int: 0 if every user was provisioned, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Create encrypted key pairs for many users.")
+    parser.add_argument("manifest", help="CSV or JSONL file with user, pin and output_dir fields")
+    parser.add_argument("-o", "--output", default="-", help="Fingerprint manifest output, '-' for stdout")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--overwrite", action="store_true", help="Replace existing key files")
+    parser.add_argument(
+        "--algorithm",
+        choices=sorted(functionality.KEY_GENERATORS),
+        default=functionality.KEY_ALGORITHM_RSA,
+        help="Key algorithm for entries without an algorithm field",
+    )
+    args = parser.parse_args(argv)
+
+    done = 0
+    failed = 0
+
+    def progress(results):
+        nonlocal done, failed
+        for result in results:
+            done += 1
+            if not result["ok"]:
+                failed += 1
+            status = "ok" if result["ok"] else f"FAILED ({result['error']})"
+            print(f"[{done}] {result['user']}: {status}", file=sys.stderr, flush=True)
+            yield result
+
+    results = progress(provision(
+        read_manifest(args.manifest), jobs=args.jobs, overwrite=args.overwrite, algorithm=args.algorithm
+    ))
+    if args.output == "-":
+        write_jsonl(results, sys.stdout)
+    else:
+        with open(args.output, "w") as out:
+            write_jsonl(results, out)
+    print(f"{done - failed}/{done} users provisioned", file=sys.stderr)
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,532 @@
+import os
+import sys
+import json
+import stat
+import time
+import queue
+import signal
+import socket
+import logging
+import argparse
+import itertools
+import threading
+import socketserver
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from cryptography import x509
+from cryptography.hazmat.primitives import serialization
+import functionality
+from batch import serialize_key
+from provision import resolve_pin
+
+logging.basicConfig(level=logging.INFO)
+
+DEFAULT_SOCKET_PATH = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR") or "/tmp", f"bsk_signing_{os.getuid()}.sock"
+)
+RECV_SIZE = 64 * 1024
+MAX_FDS_PER_MESSAGE = 16
+MAX_LINE_LENGTH = 64 * 1024
+
+OP_PING = "ping"
+OP_SIGN = "sign"
+OP_VERIFY = "verify"
+
+_worker_key = None
+_worker_session = None
+_worker_public_key = None
+_worker_validation_context = None
+
+
+def _init_worker(key_der, cert_pem, public_key_der, trust_cert_paths):
+    """
+    Load the key, signing session, public key and validation context once per worker process.
+
+    Args:
+        key_der (bytes): Unencrypted PKCS8 DER encoding of the private key.
+        cert_pem (bytes): PEM encoding of the signing certificate.
+        public_key_der (bytes): DER encoding of the public key verify requests are checked against.
+        trust_cert_paths (tuple of str): Extra certificates to trust, see `functionality.create_validation_context()`.
+    """
+    global _worker_key, _worker_session, _worker_public_key, _worker_validation_context
+    _worker_key = serialization.load_der_private_key(key_der, password=None)
+    _worker_session = functionality.SigningSession(x509.load_pem_x509_certificate(cert_pem), _worker_key)
+    _worker_public_key = functionality.import_public_key(public_key_der)
+    _worker_validation_context = functionality.create_validation_context(trust_cert_paths)
+
+
+def _sign_request(pdf_file_path):
+    """
+    Sign one document in place inside a worker process.
+
+    Returns:
+        dict: `ok`, `error` and `elapsed` seconds.
+    """
+    start = time.perf_counter()
+    try:
+        ok = functionality.sign_pdf_full(pdf_file_path, _worker_key, session=_worker_session, raise_errors=True)
+        error = None
+    except Exception as e:
+        ok, error = False, f"{type(e).__name__}: {e}"
+    return {"ok": ok, "error": error, "elapsed": time.perf_counter() - start}
+
+
+def _verify_request(pdf_file_path, tier):
+    """
+    Verify one document against the daemon's key inside a worker process.
+
+    Returns:
+        dict: `ok` (the document is verified), `error`, `report` and `elapsed` seconds.
+    """
+    start = time.perf_counter()
+    report = functionality.verify_pdf_report(
+        pdf_file_path, _worker_public_key, tier=tier, validation_context=_worker_validation_context
+    )
+    return {
+        "ok": report["verified"],
+        "error": report["error"],
+        "report": report,
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+class SigningDaemon:
+    """
+    Local signing service holding one unlocked key.
+
+    Clients connect to a Unix domain socket and send JSON lines of the form
+    `{"id": ..., "op": "sign" | "verify" | "ping", "path": ...}`. Instead of a
+    path a request may set `"fd": true` and pass an open file descriptor with
+    the same `sendmsg()` call (`SCM_RIGHTS`); workers then reopen the file
+    through `/proc/<pid>/fd/<n>`, so the client does not need to share a path
+    with the daemon. Verify requests accept an optional `tier`, see
+    `functionality.verify_pdf_report()`.
+
+    Requests are pipelined: a client may send many requests without waiting,
+    responses are written as JSON lines in completion order and carry the
+    request's `id`. At most `queue_size` requests are in flight over all
+    connections; when the queue is full the daemon stops reading from the
+    socket, so clients block on their own sends instead of piling up work.
+    Responses are written by a thread per connection, and a connection with
+    `queue_size` requests in flight or responses unread is not read from
+    either, so a client that does not read its responses only stalls itself.
+
+    The key is decrypted once by the caller and loaded in every worker
+    process of the pool, which is restarted if a worker dies.
+
+    Args:
+        key (rsa.RSAPrivateKey, ec.EllipticCurvePrivateKey or ed25519.Ed25519PrivateKey): Unlocked signing key.
+        socket_path (str): Path of the Unix socket, created with mode 0600.
+        jobs (int or None): Number of worker processes, defaults to the CPU count.
+        queue_size (int or None): Maximum number of requests in flight, defaults to `4 * jobs`.
+        cert_path (str or None): Certificate cache file, see `functionality.get_signing_cert()`.
+        trust_cert_paths (iterable of str): Extra certificates to trust when verifying.
+
+    Attributes:
+        socket_path (str): Path of the Unix socket.
+        jobs (int): Number of worker processes.
+        queue_size (int): Maximum number of requests in flight.
+    """
+
+    def __init__(self, key, socket_path=DEFAULT_SOCKET_PATH, jobs=None, queue_size=None, cert_path=None,
+                 trust_cert_paths=()):
+        self.socket_path = socket_path
+        self.jobs = jobs or os.cpu_count() or 1
+        self.queue_size = queue_size or 4 * self.jobs
+        cert = functionality.get_signing_cert(key, cert_path)
+        self._initargs = (
+            serialize_key(key),
+            cert.public_bytes(serialization.Encoding.PEM),
+            key.public_key().public_bytes(
+                encoding=serialization.Encoding.DER,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            ),
+            tuple(trust_cert_paths),
+        )
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._executor_lock = threading.Lock()
+        self._executor = self._new_executor()
+        self._server = None
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker, initargs=self._initargs)
+
+    def restart_executor(self, broken):
+        """
+        Replace the worker pool after a crash, unless another thread already did.
+        """
+        with self._executor_lock:
+            if self._executor is broken:
+                logging.error("Worker process died, restarting pool")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+
+    def submit(self, func, *args):
+        """
+        Run `func(*args)` on the worker pool, restarting the pool if it is broken.
+
+        Returns:
+            tuple: (future, executor it was submitted to).
+        """
+        executor = self._executor
+        try:
+            return executor.submit(func, *args), executor
+        except BrokenProcessPool:
+            self.restart_executor(executor)
+            executor = self._executor
+            return executor.submit(func, *args), executor
+
+    def acquire_slot(self):
+        """Wait for room in the request queue."""
+        self._slots.acquire()
+
+    def release_slot(self):
+        """Free a place in the request queue."""
+        self._slots.release()
+
+    def _bind(self):
+        """
+        Create the listening socket, replacing a stale socket file.
+        """
+        try:
+            if stat.S_ISSOCK(os.stat(self.socket_path).st_mode):
+                os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+        old_umask = os.umask(0o177)
+        try:
+            server = _Server(self.socket_path, _ConnectionHandler)
+        finally:
+            os.umask(old_umask)
+        server.signing_daemon = self
+        return server
+
+    def serve_forever(self):
+        """
+        Listen on the socket until `shutdown()` is called.
+
+        Side Effects:
+            - Creates and finally removes the socket file.
+            - Stops the worker pool on return.
+        """
+        self._server = self._bind()
+        logging.info(f"Signing daemon listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def shutdown(self):
+        """
+        Stop `serve_forever()`; must be called from another thread.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    signing_daemon = None
+
+
+class _ConnectionHandler(socketserver.BaseRequestHandler):
+    """
+    Read pipelined requests from one client and write responses as they complete.
+
+    Responses are queued by the worker pool's done-callbacks and written by
+    a writer thread, so a slow client never blocks the pool's management thread.
+    """
+
+    def setup(self):
+        self._state = threading.Condition()
+        self._in_flight = 0
+        self._unsent = 0
+        self._fds = deque()
+        self._responses = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_responses, daemon=True)
+        self._writer.start()
+
+    def handle(self):
+        buffer = b""
+        try:
+            while True:
+                data, fds, _, _ = socket.recv_fds(self.request, RECV_SIZE, MAX_FDS_PER_MESSAGE)
+                self._fds.extend(fds)
+                if not data:
+                    break
+                buffer += data
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        self._dispatch(line)
+                if len(buffer) > MAX_LINE_LENGTH:
+                    self._send({"id": None, "ok": False, "error": "Request too long"})
+                    break
+        except OSError as e:
+            logging.debug(f"Client connection failed: {e}")
+        finally:
+            with self._state:
+                self._state.wait_for(lambda: self._in_flight == 0)
+            self._responses.put(None)
+            self._writer.join()
+            for fd in self._fds:
+                os.close(fd)
+
+    def _write_responses(self):
+        """
+        Write queued responses until the `None` sentinel; responses to a closed connection are dropped.
+        """
+        connected = True
+        while True:
+            data = self._responses.get()
+            if data is None:
+                return
+            if connected:
+                try:
+                    self.request.sendall(data)
+                except OSError as e:
+                    logging.debug(f"Cannot send response: {e}")
+                    connected = False
+            with self._state:
+                self._unsent -= 1
+                self._state.notify_all()
+
+    def _send(self, response):
+        """
+        Queue a response for the writer thread; never blocks.
+        """
+        data = json.dumps(response).encode() + b"\n"
+        with self._state:
+            self._unsent += 1
+        self._responses.put(data)
+
+    def _dispatch(self, line):
+        """
+        Parse one request and submit it to the worker pool.
+        """
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+        except ValueError as e:
+            self._send({"id": None, "ok": False, "error": f"Invalid request: {e}"})
+            return
+        request_id = request.get("id")
+        op = request.get("op")
+
+        fd = None
+        if request.get("fd"):
+            if not self._fds:
+                self._send({"id": request_id, "ok": False, "error": "No file descriptor received"})
+                return
+            fd = self._fds.popleft()
+            path = f"/proc/{os.getpid()}/fd/{fd}"
+        else:
+            path = request.get("path")
+
+        if op == OP_PING:
+            self._finish(request_id, fd, {"ok": True, "error": None, "pid": os.getpid()})
+            return
+        if op not in (OP_SIGN, OP_VERIFY):
+            self._finish(request_id, fd, {"ok": False, "error": f"Unknown operation: {op}"})
+            return
+        if not isinstance(path, str):
+            self._finish(request_id, fd, {"ok": False, "error": "Missing path or file descriptor"})
+            return
+        tier = request.get("tier", functionality.VERIFY_TIER_FULL)
+        if op == OP_VERIFY and tier not in functionality.VERIFY_TIERS:
+            self._finish(request_id, fd, {"ok": False, "error": f"Unknown verification tier: {tier}"})
+            return
+
+        daemon = self.server.signing_daemon
+        with self._state:
+            # stop reading from a client that does not read its responses
+            self._state.wait_for(lambda: self._in_flight + self._unsent < daemon.queue_size)
+            self._in_flight += 1
+        daemon.acquire_slot()
+        try:
+            if op == OP_SIGN:
+                future, executor = daemon.submit(_sign_request, path)
+            else:
+                future, executor = daemon.submit(_verify_request, path, tier)
+        except Exception as e:
+            logging.error(f"Cannot submit request: {e}")
+            daemon.release_slot()
+            self._finish(request_id, fd, {"ok": False, "error": f"{type(e).__name__}: {e}"})
+            self._request_done()
+            return
+        future.add_done_callback(lambda f: self._completed(request_id, fd, f, executor))
+
+    def _completed(self, request_id, fd, future, executor):
+        """
+        Queue the response of a finished request and free its queue slot.
+
+        Runs on the worker pool's management thread, so it must not block.
+        """
+        daemon = self.server.signing_daemon
+        try:
+            result = future.result()
+        except BrokenProcessPool:
+            daemon.restart_executor(executor)
+            result = {"ok": False, "error": "Worker process crashed"}
+        except Exception as e:
+            result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        daemon.release_slot()
+        self._finish(request_id, fd, result)
+        self._request_done()
+
+    def _request_done(self):
+        with self._state:
+            self._in_flight -= 1
+            self._state.notify_all()
+
+    def _finish(self, request_id, fd, result):
+        if fd is not None:
+            os.close(fd)
+        self._send({"id": request_id, **result})
+
+
+class SigningClient:
+    """
+    Client of a `SigningDaemon`.
+
+    `send()` and `receive()` allow pipelining many requests over one
+    connection; `sign()`, `verify()` and `ping()` send a single request and
+    wait for its response.
+
+    Args:
+        socket_path (str): Path of the daemon's Unix socket.
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(socket_path)
+        self._reader = self._sock.makefile("rb")
+        self._ids = itertools.count(1)
+        self._responses = {}
+
+    def close(self):
+        """Close the connection."""
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def send(self, op, path=None, fd=None, **options):
+        """
+        Send a request without waiting for the response.
+
+        Args:
+            op (str): `OP_SIGN`, `OP_VERIFY` or `OP_PING`.
+            path (str or None): Path of the PDF, as seen by the daemon.
+            fd (int or None): Open file descriptor of the PDF, passed instead of `path`;
+                sign requests need it opened for reading and writing.
+            **options: Extra request fields, e.g. `tier` for verify requests.
+
+        Returns:
+            int: Request id to match the response.
+        """
+        request_id = next(self._ids)
+        request = {"id": request_id, "op": op, **options}
+        if fd is not None:
+            request["fd"] = True
+            socket.send_fds(self._sock, [json.dumps(request).encode() + b"\n"], [fd])
+        else:
+            request["path"] = path
+            self._sock.sendall(json.dumps(request).encode() + b"\n")
+        return request_id
+
+    def receive(self, request_id=None):
+        """
+        Wait for a response.
+
+        Args:
+            request_id (int or None): Response to wait for; None returns the next one to arrive.
+
+        Returns:
+            dict: Response with `id`, `ok`, `error` and operation specific keys.
+
+        Raises:
+            ConnectionError: If the daemon closed the connection.
+        """
+        if request_id is None and self._responses:
+            return self._responses.pop(next(iter(self._responses)))
+        if request_id in self._responses:
+            return self._responses.pop(request_id)
+        while True:
+            line = self._reader.readline()
+            if not line:
+                raise ConnectionError("Signing daemon closed the connection")
+            response = json.loads(line)
+            if request_id is None or response.get("id") == request_id:
+                return response
+            self._responses[response.get("id")] = response
+
+    def sign(self, path=None, fd=None):
+        """Sign a document in place and return the response."""
+        return self.receive(self.send(OP_SIGN, path, fd))
+
+    def verify(self, path=None, fd=None, tier=functionality.VERIFY_TIER_FULL):
+        """Verify a document against the daemon's key and return the response."""
+        return self.receive(self.send(OP_VERIFY, path, fd, tier=tier))
+
+    def ping(self):
+        """Check that the daemon is alive."""
+        return self.receive(self.send(OP_PING))
+
+
+def main(argv=None):
+    """
+    Command line entry point: unlock a key and serve signing requests until interrupted.
+
+    Returns:
+        int: 0 on a clean shutdown, 1 if the key could not be unlocked.
+    """
+    parser = argparse.ArgumentParser(description="Serve signing requests over a Unix socket.")
+    parser.add_argument("private_key", help="Path to the encrypted private key")
+    parser.add_argument("--pin", required=True, help="PIN source: env:NAME, file:PATH or literal:PIN")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Unix socket path")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--queue", type=int, default=None, help="Maximum number of requests in flight")
+    parser.add_argument(
+        "--trust", action="append", default=[], metavar="CERT",
+        help="Signing certificate to trust when verifying; may be repeated",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        pin = resolve_pin(args.pin)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read PIN: {e}", file=sys.stderr)
+        return 1
+    key = functionality.load_and_decrypt_private_key(args.private_key, pin)
+    if key is None:
+        print("Cannot unlock the private key", file=sys.stderr)
+        return 1
+
+    daemon = SigningDaemon(
+        key, args.socket, jobs=args.jobs, queue_size=args.queue,
+        cert_path=functionality.cert_path_for_key(args.private_key), trust_cert_paths=args.trust,
+    )
+    del key
+    # serve_forever() must be stopped from another thread
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=daemon.shutdown).start())
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
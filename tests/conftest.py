@@ -0,0 +1,34 @@
+import os
+import sys
+import pytest
+
+# the application modules live in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import functionality
+from pyhanko.pdf_utils import generic
+from pyhanko.pdf_utils.writer import PdfFileWriter
+
+
+@pytest.fixture(scope="session")
+def key():
+    return functionality.generate_key(functionality.KEY_ALGORITHM_ED25519)
+
+
+@pytest.fixture
+def unsigned_pdf(tmp_path):
+    w = PdfFileWriter()
+    w.insert_page(generic.DictionaryObject({
+        generic.NameObject("/Type"): generic.NameObject("/Page"),
+        generic.NameObject("/MediaBox"): generic.ArrayObject([generic.NumberObject(v) for v in (0, 0, 595, 842)]),
+    }))
+    path = tmp_path / "unsigned.pdf"
+    with open(path, "wb") as f:
+        w.write(f)
+    return str(path)
+
+
+@pytest.fixture
+def signed_pdf(unsigned_pdf, key):
+    assert functionality.sign_pdf_full(unsigned_pdf, key)
+    return unsigned_pdf
@@ -0,0 +1,21 @@
+import shutil
+import functionality
+import batch
+
+
+def test_sign_many_reports_why_each_document_failed(tmp_path, key, unsigned_pdf):
+    already_signed = str(tmp_path / "signed.pdf")
+    shutil.copy(unsigned_pdf, already_signed)
+    assert functionality.sign_pdf_full(already_signed, key)
+    garbage = str(tmp_path / "garbage.pdf")
+    with open(garbage, "wb") as f:
+        f.write(b"not a pdf at all\n" * 64)
+    missing = str(tmp_path / "missing.pdf")
+
+    results = {r.path: r for r in batch.sign_many([unsigned_pdf, already_signed, garbage, missing], key, jobs=2)}
+
+    assert results[unsigned_pdf].ok and results[unsigned_pdf].error is None
+    assert results[already_signed].error == "ValueError: PDF is signed"
+    assert results[missing].error.startswith("FileNotFoundError:")
+    assert not results[garbage].ok
+    assert len({results[path].error for path in (already_signed, garbage, missing)}) == 3
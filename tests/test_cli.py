@@ -0,0 +1,31 @@
+import os
+import functionality
+import cli
+
+
+def test_sign_reports_missing_key_without_traceback(tmp_path, unsigned_pdf, capsys):
+    status = cli.main(["sign", str(tmp_path / "missing.pem"), "--pin", "literal:1234", "-i", unsigned_pdf])
+    assert status == 1
+    assert "Cannot unlock the private key" in capsys.readouterr().err
+
+
+def test_sign_writes_no_certificate_unless_asked(tmp_path, unsigned_pdf):
+    key_path = str(tmp_path / "key.pem")
+    functionality.create_keys("1234", key_path, algorithm=functionality.KEY_ALGORITHM_ED25519)
+    before = set(os.listdir(tmp_path))
+    signed_path = str(tmp_path / "out.pdf")
+
+    assert cli.main(["sign", key_path, "--pin", "literal:1234", "-i", unsigned_pdf, "-o", signed_path]) == 0
+    assert set(os.listdir(tmp_path)) == before | {"out.pdf"}
+    assert functionality.verify_is_pdf_signed(signed_path)
+
+
+
+def test_sign_caches_certificate_on_request(tmp_path, unsigned_pdf):
+    key_path = str(tmp_path / "key.pem")
+    functionality.create_keys("1234", key_path, algorithm=functionality.KEY_ALGORITHM_ED25519)
+    signed_path = str(tmp_path / "out.pdf")
+
+    assert cli.main(["sign", key_path, "--pin", "literal:1234", "-i", unsigned_pdf, "-o", signed_path,
+                     "--cache-cert"]) == 0
+    assert os.path.exists(functionality.cert_path_for_key(key_path))
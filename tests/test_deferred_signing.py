@@ -0,0 +1,21 @@
+import shutil
+import functionality
+from deferred_signing import sign_deferred
+
+
+def test_sign_deferred_signs_on_spawned_workers(tmp_path, key, unsigned_pdf):
+    paths = []
+    for index in range(3):
+        path = str(tmp_path / f"doc{index}.pdf")
+        shutil.copy(unsigned_pdf, path)
+        paths.append(path)
+    already_signed = paths[-1]
+    assert functionality.sign_pdf_full(already_signed, key)
+
+    results = {r.path: r for r in sign_deferred(paths, key, jobs=1, batch_size=2)}
+
+    for path in paths[:-1]:
+        assert results[path].ok, results[path].error
+        assert functionality.verify_pdf(path, key.public_key())
+    assert not results[already_signed].ok
+    assert results[already_signed].error == "ValueError: PDF is signed"
@@ -0,0 +1,42 @@
+import os
+import time
+import shutil
+import sqlite3
+import threading
+import functionality
+from hot_folder import HotFolder, LEDGER_FILE_NAME, STATUS_DONE, STATUS_FAILED
+
+
+def test_hot_folder_records_why_a_file_failed(tmp_path, key, unsigned_pdf):
+    inbox, output, failed = (str(tmp_path / name) for name in ("inbox", "output", "failed"))
+    os.makedirs(inbox)
+    shutil.copy(unsigned_pdf, os.path.join(inbox, "good.pdf"))
+    shutil.copy(unsigned_pdf, os.path.join(inbox, "signed.pdf"))
+    assert functionality.sign_pdf_full(os.path.join(inbox, "signed.pdf"), key)
+    with open(os.path.join(inbox, "garbage.pdf"), "wb") as f:
+        f.write(b"not a pdf at all\n" * 64)
+    # old enough to be signed without waiting for the settle time
+    for name in os.listdir(inbox):
+        os.utime(os.path.join(inbox, name), (time.time() - 60, time.time() - 60))
+
+    folder = HotFolder([inbox], output, failed, key, jobs=1, settle=0.1)
+    thread = threading.Thread(target=folder.run, daemon=True)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 30
+        while os.listdir(inbox):
+            assert time.monotonic() < deadline, "files were not processed"
+            time.sleep(0.05)
+    finally:
+        folder.stop()
+        thread.join(timeout=30)
+        folder.close()
+
+    with sqlite3.connect(os.path.join(output, LEDGER_FILE_NAME)) as db:
+        rows = {os.path.basename(path): (status, error) for path, status, error in
+                db.execute("SELECT path, status, error FROM files")}
+    assert rows["good.pdf"] == (STATUS_DONE, None)
+    assert rows["signed.pdf"] == (STATUS_FAILED, "ValueError: PDF is signed")
+    assert rows["garbage.pdf"][0] == STATUS_FAILED
+    assert rows["garbage.pdf"][1].startswith("PdfReadError:")
+    assert sorted(os.listdir(failed)) == ["garbage.pdf", "signed.pdf"]
@@ -0,0 +1,95 @@
+import os
+import queue
+import select
+from mount_watch import MountWatcher, parse_mountinfo
+
+ROOT = "22 1 8:1 / / rw,relatime shared:1 - ext4 /dev/sda1 rw\n"
+STICK = "36 22 8:17 / /media/user/KEY\\040STICK rw,nosuid,nodev shared:7 - vfat /dev/sdb1 rw\n"
+OTHER = "37 22 8:33 / /media/user/OTHER rw,nosuid - exfat /dev/sdc1 rw\n"
+
+
+class FakeMountinfoSource:
+    """
+    Mount source serving canned mountinfo text, changes are signalled through a pipe.
+    """
+
+    events = select.POLLIN
+    interval = None
+
+    def __init__(self, text):
+        self.text = text
+        self._r, self._w = os.pipe()
+        os.set_blocking(self._r, False)
+
+    def fileno(self):
+        return self._r
+
+    def update(self, text):
+        self.text = text
+        os.write(self._w, b"\0")
+
+    def removable_mounts(self):
+        try:
+            os.read(self._r, 4096)
+        except BlockingIOError:
+            pass
+        return {entry.mountpoint for entry in parse_mountinfo(self.text) if entry.device != "8:1"}
+
+    def close(self):
+        os.close(self._r)
+        os.close(self._w)
+
+
+def test_parse_mountinfo_unescapes_and_skips_optional_fields():
+    entries = parse_mountinfo(ROOT + STICK + "garbage line\n")
+    assert [e.mountpoint for e in entries] == ["/", "/media/user/KEY STICK"]
+    assert entries[1].device == "8:17"
+    assert entries[1].fstype == "vfat"
+    assert entries[1].source == "/dev/sdb1"
+
+
+def test_check_reports_insertions_and_removals():
+    events = []
+    source = FakeMountinfoSource(ROOT + STICK)
+    watcher = MountWatcher(
+        lambda path: events.append(("insert", path)), lambda path: events.append(("remove", path)), source=source
+    )
+    assert watcher.mounts == {"/media/user/KEY STICK"}
+
+    source.text = ROOT + STICK + OTHER
+    watcher.check()
+    assert events == [("insert", "/media/user/OTHER")]
+
+    events.clear()
+    source.text = ROOT + OTHER
+    watcher.check()
+    assert events == [("remove", "/media/user/KEY STICK")]
+
+    events.clear()
+    watcher.check()
+    assert events == []
+    source.close()
+
+
+def test_watcher_thread_dispatches_changes():
+    events = queue.Queue()
+    dispatched = []
+
+    def dispatch(callback, *args):
+        dispatched.append(callback)
+        callback(*args)
+
+    source = FakeMountinfoSource(ROOT)
+    watcher = MountWatcher(
+        lambda path: events.put(("insert", path)), lambda path: events.put(("remove", path)),
+        source=source, dispatch=dispatch,
+    )
+    watcher.start()
+    try:
+        source.update(ROOT + STICK)
+        assert events.get(timeout=5) == ("insert", "/media/user/KEY STICK")
+        source.update(ROOT)
+        assert events.get(timeout=5) == ("remove", "/media/user/KEY STICK")
+    finally:
+        watcher.stop()
+    assert dispatched == [watcher.on_insert, watcher.on_remove]
@@ -0,0 +1,104 @@
+import zlib
+import pytest
+import functionality
+from pdf_probe import probe_is_pdf_signed
+
+CATALOG = b"<< /Type /Catalog /Pages 2 0 R >>"
+PAGES = b"<< /Type /Pages /Kids [] /Count 0 >>"
+
+
+def build_pdf(objects, xref_dict=b"", compressed=None):
+    """
+    Write a PDF whose objects are indexed by an uncompressed cross-reference stream.
+
+    Args:
+        objects (list of bytes): Bodies of objects 1..n.
+        xref_dict (bytes): Extra entries of the xref stream dictionary.
+        compressed (dict or None): Object number -> (object stream number, index)
+            for objects stored in an object stream.
+
+    Returns:
+        bytes: The document.
+    """
+    compressed = compressed or {}
+    out = bytearray(b"%PDF-1.5\n")
+    offsets = {}
+    for num, body in enumerate(objects, start=1):
+        offsets[num] = len(out)
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+    xref_num = len(objects) + 1
+    offsets[xref_num] = len(out)
+    rows = b"\x00\x00\x00\x00\x00\xff\xff"
+    for num in range(1, xref_num + 1):
+        if num in compressed:
+            stream_num, index = compressed[num]
+            rows += b"\x02" + stream_num.to_bytes(4, "big") + index.to_bytes(2, "big")
+        else:
+            rows += b"\x01" + offsets[num].to_bytes(4, "big") + b"\x00\x00"
+    out += (
+        b"%d 0 obj\n<< /Type /XRef /Size %d /W [1 4 2] /Root 1 0 R /Length %d "
+        % (xref_num, xref_num + 1, len(rows)) + xref_dict + b" >>\nstream\n" + rows + b"\nendstream\nendobj\n"
+    )
+    out += b"startxref\n%d\n%%%%EOF\n" % offsets[xref_num]
+    return bytes(out)
+
+
+def write(tmp_path, data, name="doc.pdf"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_unsigned_document_is_probed_without_full_parse(tmp_path):
+    path = write(tmp_path, build_pdf([CATALOG, PAGES]))
+    assert probe_is_pdf_signed(path) is False
+
+
+def test_signed_field_is_found(tmp_path):
+    catalog = b"<< /Type /Catalog /Pages 2 0 R /AcroForm << /Fields [3 0 R] >> >>"
+    field = b"<< /FT /Sig /T (Signature1) /V 4 0 R >>"
+    path = write(tmp_path, build_pdf([catalog, PAGES, field, b"<< /Type /Sig >>"]))
+    assert probe_is_pdf_signed(path) is True
+
+
+@pytest.mark.parametrize("old, new", [
+    (b"/W [1 4 2]", b"/W [1 4 2] /Index [/a 1]"),
+    (b"/W [1 4 2]", b"/W [1 4 2] /Index 5"),
+    (b"/W [1 4 2]", b"/W [1 4 /x]"),
+])
+def test_malformed_xref_stream_is_unclear(tmp_path, old, new):
+    path = write(tmp_path, build_pdf([CATALOG, PAGES]).replace(old, new, 1))
+    assert probe_is_pdf_signed(path) is None
+
+
+def test_indirect_predictor_is_unclear(tmp_path):
+    body = zlib.compress(b"1 0 2 0 " + CATALOG)
+    stream = (
+        b"<< /Type /ObjStm /N 1 /First 4 /Filter /FlateDecode /DecodeParms << /Predictor 5 0 R >> /Length %d >>\n"
+        b"stream\n" % len(body) + body + b"\nendstream"
+    )
+    path = write(tmp_path, build_pdf([b"null", PAGES, stream, b"12"], compressed={1: (3, 0)}))
+    assert probe_is_pdf_signed(path) is None
+
+
+def test_object_stream_without_first_is_unclear(tmp_path):
+    body = b"1 0 " + CATALOG
+    stream = b"<< /Type /ObjStm /N 1 /Length %d >>\nstream\n" % len(body) + body + b"\nendstream"
+    path = write(tmp_path, build_pdf([b"null", PAGES, stream], compressed={1: (3, 0)}))
+    assert probe_is_pdf_signed(path) is None
+
+
+def test_callers_fall_back_to_full_parse(tmp_path, key):
+    path = write(tmp_path, build_pdf([CATALOG, PAGES], b"/Index [/a 1]"))
+    assert functionality.verify_is_pdf_signed(path) is False
+    assert functionality.sign_pdf_full(path, key) is False
+
+
+def test_probe_failure_is_inconclusive(tmp_path, monkeypatch):
+    def broken_probe(pdf_file_path):
+        raise TypeError("unexpected structure")
+
+    monkeypatch.setattr(functionality, "probe_is_pdf_signed", broken_probe)
+    path = write(tmp_path, build_pdf([CATALOG, PAGES]))
+    assert functionality._probe_signed(path) is None
+    assert functionality.verify_is_pdf_signed(path) is False
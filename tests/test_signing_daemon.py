@@ -0,0 +1,73 @@
+import os
+import json
+import time
+import socket
+import threading
+import pytest
+import functionality
+from signing_daemon import SigningDaemon, SigningClient, OP_VERIFY
+
+
+@pytest.fixture
+def daemon(tmp_path, key):
+    socket_path = str(tmp_path / "daemon.sock")
+    daemon = SigningDaemon(key, socket_path, jobs=1, queue_size=2, cert_path=str(tmp_path / "cert.pem"))
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not os.path.exists(socket_path):
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.01)
+    yield daemon
+    daemon.shutdown()
+    thread.join(timeout=30)
+
+
+def connect(daemon):
+    client = SigningClient(daemon.socket_path)
+    client._sock.settimeout(10)
+    return client
+
+
+def test_client_not_reading_responses_does_not_stall_others(daemon, signed_pdf):
+    request = json.dumps({
+        "id": 1, "op": OP_VERIFY, "path": signed_pdf, "tier": functionality.VERIFY_TIER_INTEGRITY,
+    }).encode() + b"\n"
+    stalled = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stalled.connect(daemon.socket_path)
+    stalled.setblocking(False)
+    # pipeline requests until the daemon stops reading, never reading a response
+    deadline = time.monotonic() + 3
+    while time.monotonic() < deadline:
+        try:
+            stalled.send(request * 50)
+        except BlockingIOError:
+            time.sleep(0.05)
+    try:
+        with connect(daemon) as client:
+            response = client.verify(signed_pdf, tier=functionality.VERIFY_TIER_INTEGRITY)
+        assert response["ok"]
+    finally:
+        stalled.close()
+
+
+def test_failed_submit_releases_queue_slot(daemon, signed_pdf, monkeypatch):
+    def broken_submit(func, *args):
+        raise RuntimeError("cannot schedule new futures after shutdown")
+
+    monkeypatch.setattr(daemon, "submit", broken_submit)
+    with connect(daemon) as client:
+        response = client.verify(signed_pdf)
+    assert not response["ok"]
+    assert "cannot schedule" in response["error"]
+    assert daemon._slots.acquire(blocking=False) and daemon._slots.acquire(blocking=False)
+    daemon.release_slot()
+    daemon.release_slot()
+
+
+def test_sign_error_names_the_reason(daemon, signed_pdf, tmp_path):
+    with connect(daemon) as client:
+        already_signed = client.sign(signed_pdf)
+        missing = client.sign(str(tmp_path / "missing.pdf"))
+    assert not already_signed["ok"] and already_signed["error"] == "ValueError: PDF is signed"
+    assert not missing["ok"] and missing["error"].startswith("FileNotFoundError:")
@@ -0,0 +1,92 @@
+import os
+import pytest
+import functionality
+from pyhanko.pdf_utils import generic
+from pyhanko.pdf_utils.incremental_writer import IncrementalPdfFileWriter
+from verify_cache import VerificationCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with VerificationCache(str(tmp_path / "cache.sqlite3")) as cache:
+        yield cache
+
+
+def change_page_after_signing(pdf_file_path):
+    """
+    Append an incremental update changing the page, which only the full tier notices.
+    """
+    with open(pdf_file_path, "rb+") as f:
+        w = IncrementalPdfFileWriter(f)
+        page_ref = w.root["/Pages"]["/Kids"][0]
+        page = page_ref.get_object()
+        page[generic.NameObject("/MediaBox")] = generic.ArrayObject(
+            [generic.NumberObject(v) for v in (0, 0, 100, 100)]
+        )
+        w.update_container(page)
+        w.write_in_place()
+
+
+def verify(path, key, cache, tier=functionality.VERIFY_TIER_FULL):
+    return functionality.verify_pdf_report(path, key.public_key(), cache=cache, tier=tier)
+
+
+def test_verdict_is_cached_per_content_and_key(signed_pdf, key, cache):
+    first = verify(signed_pdf, key, cache)
+    assert first["verified"] and not first["cached"]
+    second = verify(signed_pdf, key, cache)
+    assert second["verified"] and second["cached"]
+
+    other_key = functionality.generate_key(functionality.KEY_ALGORITHM_ED25519)
+    other = verify(signed_pdf, other_key, cache)
+    assert not other["cached"] and not other["verified"]
+
+
+def test_tiers_are_cached_separately(signed_pdf, key, cache):
+    change_page_after_signing(signed_pdf)
+
+    full = verify(signed_pdf, key, cache)
+    assert not full["verified"] and full["tier"] == functionality.VERIFY_TIER_FULL
+    integrity = verify(signed_pdf, key, cache, functionality.VERIFY_TIER_INTEGRITY)
+    assert not integrity["cached"]
+    assert integrity["verified"] and integrity["tier"] == functionality.VERIFY_TIER_INTEGRITY
+
+    cached_full = verify(signed_pdf, key, cache)
+    cached_integrity = verify(signed_pdf, key, cache, functionality.VERIFY_TIER_INTEGRITY)
+    assert cached_full["cached"] and not cached_full["verified"]
+    assert cached_integrity["cached"] and cached_integrity["verified"]
+
+
+def test_changed_file_invalidates_verdict(signed_pdf, key, cache):
+    assert verify(signed_pdf, key, cache)["verified"]
+    st = os.stat(signed_pdf)
+    change_page_after_signing(signed_pdf)
+    # a change within the same mtime tick is still noticed by the size
+    os.utime(signed_pdf, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    report = verify(signed_pdf, key, cache)
+    assert not report["cached"]
+    assert not report["verified"]
+
+
+def test_rewritten_file_with_same_size_and_mtime_is_rehashed_after_replace(signed_pdf, key, cache, tmp_path):
+    assert verify(signed_pdf, key, cache)["verified"]
+    with open(signed_pdf, "rb") as f:
+        data = bytearray(f.read())
+    st = os.stat(signed_pdf)
+    # flip one signed byte in a new file replacing the old one: same size and mtime, new inode
+    data[20] ^= 0x01
+    replacement = tmp_path / "replacement.pdf"
+    replacement.write_bytes(bytes(data))
+    os.utime(replacement, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(replacement, signed_pdf)
+
+    report = verify(signed_pdf, key, cache)
+    assert not report["cached"]
+    assert not report["verified"]
+
+
+def test_expired_verdict_is_recomputed(signed_pdf, key, tmp_path):
+    with VerificationCache(str(tmp_path / "expired.sqlite3"), ttl=-1) as cache:
+        assert not verify(signed_pdf, key, cache)["cached"]
+        assert not verify(signed_pdf, key, cache)["cached"]
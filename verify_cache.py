@@ -0,0 +1,289 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+from hashlib import sha256
+
+logging.basicConfig(level=logging.INFO)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "bsk_verify_cache.sqlite3")
+DEFAULT_MAX_ENTRIES = 100000
+DEFAULT_TTL = 24 * 60 * 60
+HASH_CHUNK_SIZE = 1024 * 1024
+# evict every N writes instead of on each one
+EVICT_EVERY = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS verdicts (
+    content_hash TEXT NOT NULL,
+    key_fingerprint TEXT NOT NULL,
+    report TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (content_hash, key_fingerprint)
+);
+CREATE INDEX IF NOT EXISTS verdicts_last_used ON verdicts (last_used);
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT NOT NULL,
+    key_fingerprint TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    revisions INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    checked REAL NOT NULL,
+    PRIMARY KEY (path, key_fingerprint)
+);
+CREATE TABLE IF NOT EXISTS revisions (
+    path TEXT NOT NULL,
+    key_fingerprint TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    byte_range TEXT NOT NULL,
+    digest TEXT,
+    report TEXT NOT NULL,
+    PRIMARY KEY (path, key_fingerprint, revision, byte_range)
+);
+"""
+
+
+def hash_file(path):
+    """
+    Compute the SHA-256 of a file's content.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        str: Hex encoded digest.
+    """
+    digest = sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class VerificationCache:
+    """
+    On-disk cache of verification reports.
+
+    Verdicts are keyed by the SHA-256 of the document content and the
+    fingerprint of the trusted key. The content hash of a path is itself
+    cached together with the file's size, mtime and inode, so an unchanged
+    file is looked up with one `stat` call and no hashing. Entries expire
+    after `ttl` seconds and the least recently used ones are evicted above
+    `max_entries`.
+
+    Args:
+        path (str): SQLite database file, created if missing.
+        max_entries (int): Maximum number of cached verdicts.
+        ttl (float): Lifetime of a verdict in seconds.
+
+    Attributes:
+        path (str): SQLite database file.
+        max_entries (int): Maximum number of cached verdicts.
+        ttl (float): Lifetime of a verdict in seconds.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._writes = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def content_hash(self, pdf_file_path):
+        """
+        Return the content hash of a file, re-hashing only if the file changed.
+
+        Args:
+            pdf_file_path (str): Path to the file.
+
+        Returns:
+            str: Hex encoded SHA-256 of the file content.
+        """
+        path = os.path.abspath(pdf_file_path)
+        st = os.stat(path)
+        row = self._db.execute(
+            "SELECT content_hash FROM files WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+            (path, st.st_size, st.st_mtime_ns, st.st_ino),
+        ).fetchone()
+        if row:
+            return row[0]
+        content_hash = hash_file(path)
+        self._db.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, inode, content_hash) VALUES (?, ?, ?, ?, ?)",
+            (path, st.st_size, st.st_mtime_ns, st.st_ino, content_hash),
+        )
+        return content_hash
+
+    def get(self, pdf_file_path, key_fingerprint):
+        """
+        Look up a cached verification report.
+
+        Args:
+            pdf_file_path (str): Path to the verified file.
+            key_fingerprint (str): Fingerprint of the trusted public key.
+
+        Returns:
+            dict or None: Cached report with `path` set to `pdf_file_path`, None on a miss.
+        """
+        content_hash = self.content_hash(pdf_file_path)
+        row = self._db.execute(
+            "SELECT report, created FROM verdicts WHERE content_hash = ? AND key_fingerprint = ?",
+            (content_hash, key_fingerprint),
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if row[1] + self.ttl < now:
+            self._db.execute(
+                "DELETE FROM verdicts WHERE content_hash = ? AND key_fingerprint = ?",
+                (content_hash, key_fingerprint),
+            )
+            return None
+        self._db.execute(
+            "UPDATE verdicts SET last_used = ? WHERE content_hash = ? AND key_fingerprint = ?",
+            (now, content_hash, key_fingerprint),
+        )
+        report = json.loads(row[0])
+        report["path"] = pdf_file_path
+        return report
+
+    def put(self, pdf_file_path, key_fingerprint, report):
+        """
+        Store a verification report.
+
+        Args:
+            pdf_file_path (str): Path to the verified file.
+            key_fingerprint (str): Fingerprint of the trusted public key.
+            report (dict): JSON serializable report.
+        """
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO verdicts (content_hash, key_fingerprint, report, created, last_used) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (self.content_hash(pdf_file_path), key_fingerprint, json.dumps(report), now, now),
+        )
+        self._writes += 1
+        if self._writes % EVICT_EVERY == 0:
+            self.evict()
+
+    def get_revisions(self, pdf_file_path, key_fingerprint):
+        """
+        Look up the per-revision results of the last incremental verification of a file.
+
+        Args:
+            pdf_file_path (str): Path to the verified file.
+            key_fingerprint (str): Fingerprint of the trusted public key.
+
+        Returns:
+            dict or None: State with keys `length`, `revisions` and `digest` (SHA-256 of the
+            first `length` bytes) of the file when it was checked, and `signatures`, the list
+            of per-signature results ordered by revision. None if the file was not checked
+            or the state expired.
+        """
+        path = os.path.abspath(pdf_file_path)
+        row = self._db.execute(
+            "SELECT length, revisions, digest, checked FROM documents WHERE path = ? AND key_fingerprint = ?",
+            (path, key_fingerprint),
+        ).fetchone()
+        if row is None or row[3] + self.ttl < time.time():
+            return None
+        signatures = [
+            json.loads(report) for (report,) in self._db.execute(
+                "SELECT report FROM revisions WHERE path = ? AND key_fingerprint = ? ORDER BY revision",
+                (path, key_fingerprint),
+            )
+        ]
+        return {"length": row[0], "revisions": row[1], "digest": row[2], "signatures": signatures}
+
+    def put_revisions(self, pdf_file_path, key_fingerprint, length, revisions, digest, signatures):
+        """
+        Replace the per-revision results of a file.
+
+        Args:
+            pdf_file_path (str): Path to the verified file.
+            key_fingerprint (str): Fingerprint of the trusted public key.
+            length (int): File size when it was checked.
+            revisions (int): Number of revisions when it was checked.
+            digest (str): Hex SHA-256 of the first `length` bytes.
+            signatures (list of dict): JSON serializable per-signature results with at least
+                `revision`, `byte_range` and `digest` keys.
+        """
+        path = os.path.abspath(pdf_file_path)
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.execute(
+                "DELETE FROM revisions WHERE path = ? AND key_fingerprint = ?", (path, key_fingerprint)
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO revisions (path, key_fingerprint, revision, byte_range, digest, report) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (path, key_fingerprint, signature["revision"], json.dumps(signature["byte_range"]),
+                     signature["digest"], json.dumps(signature))
+                    for signature in signatures
+                ],
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO documents (path, key_fingerprint, length, revisions, digest, checked) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, key_fingerprint, length, revisions, digest, time.time()),
+            )
+
+    def evict(self):
+        """
+        Drop expired verdicts and the least recently used ones above `max_entries`.
+
+        Returns:
+            int: Number of removed verdicts.
+        """
+        removed = self._db.execute(
+            "DELETE FROM verdicts WHERE created < ?", (time.time() - self.ttl,)
+        ).rowcount
+        removed += self._db.execute(
+            "DELETE FROM verdicts WHERE rowid IN ("
+            "SELECT rowid FROM verdicts ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        self._db.execute("DELETE FROM files WHERE content_hash NOT IN (SELECT content_hash FROM verdicts)")
+        self._db.execute("DELETE FROM documents WHERE checked < ?", (time.time() - self.ttl,))
+        self._db.execute(
+            "DELETE FROM revisions WHERE NOT EXISTS (SELECT 1 FROM documents WHERE "
+            "documents.path = revisions.path AND documents.key_fingerprint = revisions.key_fingerprint)"
+        )
+        logging.debug(f"Evicted {removed} cached verdicts")
+        return removed
+
+    def clear(self):
+        """
+        Remove every cached verdict, file hash and per-revision result.
+        """
+        self._db.execute("DELETE FROM verdicts")
+        self._db.execute("DELETE FROM files")
+        self._db.execute("DELETE FROM documents")
+        self._db.execute("DELETE FROM revisions")